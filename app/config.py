@@ -1,4 +1,5 @@
-﻿from functools import lru_cache
+﻿from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
@@ -24,6 +25,32 @@ class Settings(BaseSettings):
     default_admin_email: str = Field(default="admin@garage.local")
     default_admin_password: str = Field(default="change-me")
     uploads_dir: Path = Field(default=Path.cwd() / "uploads", alias="UPLOADS_DIR")
+    summary_source: Literal["snapshot", "live"] = Field(default="snapshot", alias="SUMMARY_SOURCE")
+    summary_parallel: bool = Field(default=False, alias="SUMMARY_PARALLEL")
+    summary_max_connections: int = Field(default=3, ge=1, alias="SUMMARY_MAX_CONNECTIONS")
+    summary_cache_ttl: float = Field(default=30.0, ge=0, alias="SUMMARY_CACHE_TTL")
+    list_total_mode: Literal["exact", "estimated", "cached", "none"] = Field(default="exact", alias="LIST_TOTAL_MODE")
+    list_count_cache_ttl: float = Field(default=60.0, ge=0, alias="LIST_COUNT_CACHE_TTL")
+    export_chunk_size: int = Field(default=1000, ge=1, alias="EXPORT_CHUNK_SIZE")
+    analytics_batch_size: int = Field(default=10000, ge=1, alias="ANALYTICS_BATCH_SIZE")
+    summary_stream_interval: float = Field(default=2.0, gt=0, alias="SUMMARY_STREAM_INTERVAL")
+    summary_stream_keepalive: float = Field(default=15.0, gt=0, alias="SUMMARY_STREAM_KEEPALIVE")
+    summary_series_max_points: int = Field(default=1000, ge=1, alias="SUMMARY_SERIES_MAX_POINTS")
+    billing_backfill_max_days: int = Field(default=366, ge=1, alias="BILLING_BACKFILL_MAX_DAYS")
+    billing_schedule: str = Field(default="0 8 * * *", alias="BILLING_SCHEDULE")
+    summary_snapshot_schedule: str = Field(default="5 8 * * *", alias="SUMMARY_SNAPSHOT_SCHEDULE")
+    billing_forecast_max_weeks: int = Field(default=104, ge=1, alias="BILLING_FORECAST_MAX_WEEKS")
+    billing_partition_size: int = Field(default=300, ge=1, alias="BILLING_PARTITION_SIZE")
+    billing_workers: int = Field(default=4, ge=1, alias="BILLING_WORKERS")
+    billing_partition_lease_seconds: float = Field(default=300.0, gt=0, alias="BILLING_PARTITION_LEASE_SECONDS")
+    late_fee_grace_days: int = Field(default=2, ge=0, alias="LATE_FEE_GRACE_DAYS")
+    late_fee_fixed: Decimal = Field(default=Decimal("0"), ge=0, alias="LATE_FEE_FIXED")
+    late_fee_daily_pct: Decimal = Field(default=Decimal("0"), ge=0, alias="LATE_FEE_DAILY_PCT")
+    late_fee_max_days: int = Field(default=30, ge=1, alias="LATE_FEE_MAX_DAYS")
+    late_fee_schedule: str = Field(default="0 7 * * *", alias="LATE_FEE_SCHEDULE")
+    id_block_size: int = Field(default=50, ge=1, alias="ID_BLOCK_SIZE")
+    scheduler_lease_seconds: float = Field(default=600.0, gt=0, alias="SCHEDULER_LEASE_SECONDS")
+    scheduler_poll_seconds: float = Field(default=30.0, gt=0, alias="SCHEDULER_POLL_SECONDS")
 
     model_config = {
         "env_file": ".env",
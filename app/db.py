@@ -39,6 +39,10 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    # Para respostas em streaming, que abrem sessoes depois que a request termina.
+    return AsyncSessionLocal
+
 async def init_db() -> None:
     # Alembic gerencia migraes; safeguard p/ testes/ad-hoc.
     async with _engine.begin() as conn:
@@ -54,5 +58,5 @@ async def dispose_engine() -> None:
 
 __all__ = [
     "Base", "AsyncSession", "AsyncSessionLocal",
-    "get_db", "init_db", "warm_db", "dispose_engine",
+    "get_db", "get_session_factory", "init_db", "warm_db", "dispose_engine",
 ]
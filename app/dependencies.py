@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from fastapi import Depends, Query
 
-from .schemas.common import PaginationParams
+from .config import settings
+from .schemas.common import ExportParams, PaginationParams, TotalMode
 
 
 async def get_pagination_params(
@@ -10,6 +11,29 @@ async def get_pagination_params(
     page_size: int = Query(25, ge=1, le=200),
     order_by: str | None = Query(None),
     order_dir: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None, description="Keyset cursor; pass an empty value for the first page"),
+    total: TotalMode | None = Query(None, description="exact, estimated, cached or none (no count)"),
+    fields: str | None = Query(None, description="Comma-separated columns to return, e.g. id,plate,status"),
 ) -> PaginationParams:
-    return PaginationParams(page=page, page_size=page_size, order_by=order_by, order_dir=order_dir)
+    return PaginationParams(
+        page=page,
+        page_size=page_size,
+        order_by=order_by,
+        order_dir=order_dir,
+        cursor=cursor,
+        total_mode=total or settings.list_total_mode,
+        fields=_split_fields(fields),
+    )
+
+
+async def get_export_params(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    fields: str | None = Query(None, description="Comma-separated columns to export; all columns by default"),
+) -> ExportParams:
+    return ExportParams(format=format, fields=_split_fields(fields))
+
+
+def _split_fields(fields: str | None) -> list[str] | None:
+    names = [field.strip() for field in fields.split(",") if field.strip()] if fields else []
+    return names or None
 
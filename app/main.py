@@ -1,14 +1,16 @@
 ﻿from __future__ import annotations
 
 import asyncio
-from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, RedirectResponse
 from sqlalchemy.exc import DBAPIError
 
 from .config import settings
 from .db import AsyncSessionLocal, dispose_engine, warm_db
+from .repositories.base import InvalidCursorError, InvalidFieldsError
 from .repositories.user import UserRepository
 from .routers import (
+    analytics,
     auth,
     billing,
     cash,
@@ -19,6 +21,8 @@ from .routers import (
     partners,
     rent_payments,
     rentals,
+    reports,
+    search,
     summary,
     vehicles,
     vendors,
@@ -46,6 +50,15 @@ app.include_router(cash.router)
 app.include_router(summary.router)
 app.include_router(billing.router)
 app.include_router(documents.router)
+app.include_router(reports.router)
+app.include_router(search.router)
+app.include_router(analytics.router)
+
+
+@app.exception_handler(InvalidCursorError)
+@app.exception_handler(InvalidFieldsError)
+async def invalid_list_params_handler(request: Request, exc: ValueError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
 
 
 @app.on_event("startup")
@@ -9,6 +9,13 @@ from .partner import Partner
 from .cash import CashTxn
 from .user import User
 from .document import Document
+from .summary_counter import SummaryCounter
+from .summary_daily import SummaryDailySnapshot
+from .job_run import JobRun, JobRunStatus
+from .job_lock import JobLock
+from .billing_partition import BillingPartition, BillingPartitionStatus
+from .id_counter import IdCounter
+from .search_entry import SearchEntry
 
 __all__ = [
     "Vehicle",
@@ -22,4 +29,13 @@ __all__ = [
     "CashTxn",
     "User",
     "Document",
+    "SummaryCounter",
+    "SummaryDailySnapshot",
+    "JobRun",
+    "JobRunStatus",
+    "JobLock",
+    "BillingPartition",
+    "BillingPartitionStatus",
+    "IdCounter",
+    "SearchEntry",
 ]
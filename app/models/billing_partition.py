@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import DateTime, Enum as SQLEnum, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+from .common import TimestampMixin
+
+
+class BillingPartitionStatus(str, Enum):
+    PENDING = "pending"
+    DONE = "done"
+
+
+class BillingPartition(TimestampMixin, Base):
+    """A slice of the rentals billed by one run, committed on its own.
+
+    The slice covers rental ids greater than ``rental_id_after`` up to and including
+    ``rental_id_upto``; a missing bound is open, so rentals created after planning still
+    fall into the first or last partition. Workers claim pending partitions by writing
+    ``owner`` and ``lease_until``; an expired lease can be claimed again.
+    """
+
+    __tablename__ = "billing_partitions"
+
+    run_key: Mapped[str] = mapped_column(String(40), primary_key=True)
+    partition_no: Mapped[int] = mapped_column(Integer, primary_key=True)
+    rental_id_after: Mapped[Optional[str]] = mapped_column(String(12), nullable=True)
+    rental_id_upto: Mapped[Optional[str]] = mapped_column(String(12), nullable=True)
+    status: Mapped[BillingPartitionStatus] = mapped_column(
+        SQLEnum(BillingPartitionStatus, name="billing_partition_status"),
+        nullable=False,
+        default=BillingPartitionStatus.PENDING,
+    )
+    owner: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    lease_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    rows_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+__all__ = ["BillingPartition", "BillingPartitionStatus"]
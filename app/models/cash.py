@@ -5,7 +5,7 @@ from decimal import Decimal
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, Date, Enum as SQLEnum, ForeignKey, Numeric, String, UniqueConstraint
+from sqlalchemy import CheckConstraint, Date, Enum as SQLEnum, ForeignKey, Index, Numeric, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db import Base
@@ -51,6 +51,7 @@ class CashTxn(TimestampMixin, Base):
         CheckConstraint("amount >= 0", name="ck_cash_amount_positive"),
         UniqueConstraint("related_expense_id", name="uq_cash_expense_link"),
         UniqueConstraint("related_capital_id", name="uq_cash_capital_link"),
+        Index("ix_cash_txn_created_id", "created_at", "id"),
     )
 
 
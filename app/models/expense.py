@@ -44,6 +44,7 @@ class Expense(TimestampMixin, Base):
 
     __table_args__ = (
         Index("ix_expense_vehicle_date", "vehicle_id", "date"),
+        Index("ix_expense_created_id", "created_at", "id"),
         CheckConstraint("amount >= 0", name="ck_expense_amount_positive"),
     )
 
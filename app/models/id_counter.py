@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+
+
+class IdCounter(Base):
+    """Next unallocated number of an id prefix (``PAY`` -> ``PAY-0042``).
+
+    Allocators reserve blocks by advancing ``next_value``; see
+    ``app.services.id_allocator``.
+    """
+
+    __tablename__ = "id_counters"
+
+    prefix: Mapped[str] = mapped_column(String(8), primary_key=True)
+    next_value: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+__all__ = ["IdCounter"]
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+
+
+class JobLock(Base):
+    """Lease held in the database so only one scheduler instance runs jobs.
+
+    The holder renews ``locked_until`` while it is alive; once the lease expires any other
+    instance may take it over.
+    """
+
+    __tablename__ = "job_locks"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(100), nullable=False)
+    locked_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+__all__ = ["JobLock"]
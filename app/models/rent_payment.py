@@ -5,7 +5,7 @@ from decimal import Decimal
 from math import ceil
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, Date, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy import CheckConstraint, Computed, Date, ForeignKey, Index, Integer, Numeric, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db import Base
@@ -25,6 +25,10 @@ class RentPayment(TimestampMixin, Base):
     paid_amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False, default=0)
     payment_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     late_fee: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False, default=0)
+    # Stored by the database so open receivables can be summed from an index.
+    outstanding_amount: Mapped[Decimal] = mapped_column(
+        Numeric(11, 2), Computed("due_amount + late_fee - paid_amount", persisted=True)
+    )
     method: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
@@ -32,19 +36,25 @@ class RentPayment(TimestampMixin, Base):
 
     __table_args__ = (
         Index("ix_rent_payment_period", "period_start", "period_end"),
+        Index("ix_rent_payment_outstanding", "outstanding_amount"),
+        Index("ix_rent_payment_created_id", "created_at", "id"),
+        UniqueConstraint("rental_id", "period_start", "period_end", name="uq_rent_payment_period"),
         CheckConstraint("weeks > 0", name="ck_rentpayment_weeks_positive"),
         CheckConstraint("due_amount >= 0", name="ck_rentpayment_due_positive"),
         CheckConstraint("paid_amount >= 0", name="ck_rentpayment_paid_positive"),
         CheckConstraint("late_fee >= 0", name="ck_rentpayment_late_fee_positive"),
     )
 
+    @staticmethod
+    def period_totals(period_start: date, period_end: date, weekly_rate: Decimal) -> tuple[int, Decimal]:
+        """Billed weeks and due amount for a period, as used by ``recompute_totals``."""
+        delta_days = (period_end - period_start).days + 1
+        weeks = max(1, ceil(delta_days / 7))
+        rate = quantize_decimal(weekly_rate) or Decimal("0")
+        return weeks, quantize_decimal(rate * Decimal(weeks)) or Decimal("0")
+
     def recompute_totals(self) -> None:
-        delta_days = (self.period_end - self.period_start).days + 1
-        computed_weeks = max(1, ceil(delta_days / 7))
-        self.weeks = computed_weeks
-        weekly_rate = quantize_decimal(self.weekly_rate) or Decimal("0")
-        due = weekly_rate * Decimal(self.weeks)
-        self.due_amount = quantize_decimal(due) or Decimal("0")
+        self.weeks, self.due_amount = self.period_totals(self.period_start, self.period_end, self.weekly_rate)
         paid = quantize_decimal(self.paid_amount) or Decimal("0")
         late_fee = quantize_decimal(self.late_fee) or Decimal("0")
         self.paid_amount = paid
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from sqlalchemy import DDL, Index, String, Text, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+
+# SQLite: an external-content FTS5 table with the trigram tokenizer indexes every
+# substring of three or more characters; triggers keep it in step with search_index.
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE search_index_fts USING fts5("
+    "search_key, content='search_index', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER search_index_ai AFTER INSERT ON search_index BEGIN "
+    "INSERT INTO search_index_fts(rowid, search_key) VALUES (new.rowid, new.search_key); END",
+    "CREATE TRIGGER search_index_ad AFTER DELETE ON search_index BEGIN "
+    "INSERT INTO search_index_fts(search_index_fts, rowid, search_key) "
+    "VALUES ('delete', old.rowid, old.search_key); END",
+    "CREATE TRIGGER search_index_au AFTER UPDATE ON search_index BEGIN "
+    "INSERT INTO search_index_fts(search_index_fts, rowid, search_key) "
+    "VALUES ('delete', old.rowid, old.search_key); "
+    "INSERT INTO search_index_fts(rowid, search_key) VALUES (new.rowid, new.search_key); END",
+)
+
+
+class SearchEntry(Base):
+    """Normalized search key of a vehicle, driver, vendor or partner.
+
+    ``search_key`` holds accent-free lowercase words plus identifiers (plate, VIN,
+    RENAVAM, CPF, id) with separators removed, so ``abc-1d23`` and ``ABC1D23`` find the
+    same car. It is served by FULLTEXT (ngram, built without stopwords) on MySQL, a
+    trigram GIN index on Postgres and ``search_index_fts`` on SQLite; see
+    ``app.services.search``.
+    """
+
+    __tablename__ = "search_index"
+
+    entity_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    entity_id: Mapped[str] = mapped_column(String(12), primary_key=True)
+    label: Mapped[str] = mapped_column(String(200), nullable=False)
+    search_key: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_search_index_fulltext", "search_key", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"
+        ).ddl_if(dialect="mysql"),
+        Index(
+            "ix_search_index_trgm",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+event.listen(
+    SearchEntry.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+# InnoDB fixes the stopword list when the FULLTEXT index is built, and the ngram parser
+# drops every token containing a stopword ("a", "de", "to"...), hiding plates and names.
+event.listen(
+    SearchEntry.__table__,
+    "before_create",
+    DDL("SET SESSION innodb_ft_enable_stopword = OFF").execute_if(dialect="mysql"),
+)
+for _statement in SQLITE_FTS_DDL:
+    event.listen(SearchEntry.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    SearchEntry.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS search_index_fts").execute_if(dialect="sqlite"),
+)
+
+
+__all__ = ["SQLITE_FTS_DDL", "SearchEntry"]
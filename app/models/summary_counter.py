@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+from .common import TimestampMixin
+
+
+class SummaryCounter(TimestampMixin, Base):
+    """Pre-aggregated dashboard counter kept current by the repositories.
+
+    ``bucket`` is an empty string for all-time counters or ``YYYY-MM`` for monthly ones;
+    ``dimension`` holds the breakdown key (vehicle status, expense category, partner).
+    """
+
+    __tablename__ = "summary_counters"
+
+    metric: Mapped[str] = mapped_column(String(40), primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(7), primary_key=True, default="")
+    dimension: Mapped[str] = mapped_column(String(100), primary_key=True, default="")
+    value: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+
+
+__all__ = ["SummaryCounter"]
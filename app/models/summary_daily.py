@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from sqlalchemy import JSON, Date
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+from .common import TimestampMixin
+
+
+class SummaryDailySnapshot(TimestampMixin, Base):
+    """Dashboard frozen at the end of ``day``, written by the nightly snapshot job.
+
+    ``payload`` is the serialized ``SummaryResponse``; rows are not updated by later
+    back-dated writes.
+    """
+
+    __tablename__ = "summary_daily_snapshots"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+
+__all__ = ["SummaryDailySnapshot"]
@@ -5,11 +5,13 @@ from decimal import Decimal
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, Date, Enum as SQLEnum, ForeignKey, Index, Numeric, String
+from sqlalchemy import CheckConstraint, ColumnElement, Date, Enum as SQLEnum, ForeignKey, Index, Numeric, String, func, select
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db import Base
 from .common import TimestampMixin, quantize_decimal
+from .expense import Expense
 
 
 class VehicleStatus(str, Enum):
@@ -68,7 +70,9 @@ class Vehicle(TimestampMixin, Base):
             return VehicleStatus.RENTED
         return VehicleStatus.STOCK
 
-    @property
+    # The financial figures below are hybrids: on an instance they use the loaded
+    # expenses, on the class they render SQL so aggregates never hydrate vehicles.
+    @hybrid_property
     def total_expenses(self) -> Decimal:
         expenses = self.__dict__.get("expenses")
         if not expenses:
@@ -76,31 +80,59 @@ class Vehicle(TimestampMixin, Base):
         total = sum((expense.amount or Decimal("0")) for expense in expenses)
         return quantize_decimal(total) or Decimal("0")
 
-    @property
+    @total_expenses.inplace.expression
+    @classmethod
+    def _total_expenses_expression(cls) -> ColumnElement[Decimal]:
+        return (
+            select(func.coalesce(func.sum(Expense.amount), 0))
+            .where(Expense.vehicle_id == cls.id)
+            .correlate_except(Expense)
+            .scalar_subquery()
+        )
+
+    @hybrid_property
     def total_cost(self) -> Decimal:
         return quantize_decimal((self.acquisition_price or Decimal("0")) + self.total_expenses)
 
-    @property
+    @total_cost.inplace.expression
+    @classmethod
+    def _total_cost_expression(cls) -> ColumnElement[Decimal]:
+        return cls.acquisition_price + cls.total_expenses
+
+    @hybrid_property
     def sale_net(self) -> Optional[Decimal]:
         if self.sale_price is None:
             return None
         fees = self.sale_fees or Decimal("0")
         return quantize_decimal(self.sale_price - fees)
 
-    @property
+    @sale_net.inplace.expression
+    @classmethod
+    def _sale_net_expression(cls) -> ColumnElement[Optional[Decimal]]:
+        return cls.sale_price - func.coalesce(cls.sale_fees, 0)
+
+    @hybrid_property
     def profit(self) -> Optional[Decimal]:
         sale_net = self.sale_net
         if sale_net is None:
             return None
         return quantize_decimal(sale_net - (self.total_cost or Decimal("0")))
 
+    @profit.inplace.expression
+    @classmethod
+    def _profit_expression(cls) -> ColumnElement[Optional[Decimal]]:
+        return cls.sale_net - cls.total_cost
+
+    @staticmethod
+    def return_on_cost(profit: Optional[Decimal], total_cost: Optional[Decimal]) -> Optional[Decimal]:
+        """ROI as shown everywhere in the API: ``profit / total_cost`` rounded to 2 places."""
+        if profit is None or not total_cost:
+            return None
+        return quantize_decimal(Decimal(profit) / Decimal(total_cost))
+
     @property
     def roi(self) -> Optional[Decimal]:
-        total_cost = self.total_cost or Decimal("0")
-        profit = self.profit
-        if profit is None or total_cost == 0:
-            return None
-        return quantize_decimal(profit / total_cost)
+        return self.return_on_cost(self.profit, self.total_cost)
 
     def sync_status(self) -> None:
         self.status = self.compute_status()
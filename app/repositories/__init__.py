@@ -9,6 +9,8 @@ from .partner import PartnerRepository
 from .cash import CashRepository
 from .user import UserRepository
 from .document import DocumentRepository
+from .summary_snapshot import SummarySnapshotRepository
+from .summary_daily import SummaryDailyRepository
 
 __all__ = [
     "VehicleRepository",
@@ -22,5 +24,7 @@ __all__ = [
     "CashRepository",
     "UserRepository",
     "DocumentRepository",
+    "SummarySnapshotRepository",
+    "SummaryDailyRepository",
 ]
 
@@ -1,16 +1,78 @@
 ﻿from __future__ import annotations
 
-from typing import Any, Generic, Optional, Sequence, Type, TypeVar
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Generic, Optional, Sequence, Type, TypeVar
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import DateTime, Select, String, and_, func, literal, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute
 
 from ..schemas.common import PaginatedResult, PaginationParams
+from ..services.id_allocator import id_allocator
+from ..services.list_totals import count_cache, count_cache_key, estimate_rows
+from ..services import search as _search  # noqa: F401  # registers the search index write hooks
 
 ModelT = TypeVar("ModelT")
 
 
+class InvalidCursorError(ValueError):
+    """A pagination cursor that is malformed or was issued for another ordering."""
+
+
+class InvalidFieldsError(ValueError):
+    """A ``fields`` selection naming something that is not a column of the listed model."""
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _projected_row(fields: Sequence[str], values: Sequence[Any]) -> dict[str, Any]:
+    # Decimals as strings, as the read schemas render them.
+    return {field: str(value) if isinstance(value, Decimal) else value for field, value in zip(fields, values)}
+
+
+def _column_value(column: InstrumentedAttribute[Any], raw: Any) -> Any:
+    python_type = column.type.python_type
+    if issubclass(python_type, Enum):
+        return python_type[raw]
+    if issubclass(python_type, (date, datetime)):
+        return python_type.fromisoformat(raw)
+    if issubclass(python_type, Decimal):
+        return Decimal(raw)
+    return raw
+
+
+def encode_cursor(order_by: str, order_dir: str, value: Any, obj_id: Any) -> str:
+    payload = json.dumps([order_by, order_dir, _cursor_value(value), obj_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, column: InstrumentedAttribute[Any], order_dir: str) -> tuple[Any, Any]:
+    """The ``(order value, id)`` of the last row seen; validated against the current order."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        order_by, cursor_dir, raw_value, obj_id = json.loads(payload)
+        if order_by != column.key or cursor_dir != order_dir:
+            raise InvalidCursorError("Cursor does not match order_by/order_dir")
+        return _column_value(column, raw_value), obj_id
+    except InvalidCursorError:
+        raise
+    except (binascii.Error, KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
 class BaseRepository(Generic[ModelT]):
     model: Type[ModelT]
 
@@ -26,30 +88,171 @@ class BaseRepository(Generic[ModelT]):
         filters: Sequence[Any] | None = None,
         options: Sequence[Any] | None = None,
     ) -> PaginatedResult[ModelT]:
-        query: Select[Any] = select(self.model)
-        if options:
-            for opt in options:
+        """One page of ``model`` rows matching ``filters``.
+
+        With ``params.fields`` only those columns (plus ``id``) are selected and items are
+        plain dicts built from Core rows: ``options`` such as relationship loaders are
+        skipped and nothing enters the identity map.
+        """
+        fields = self.select_fields(params.fields) if params.fields else None
+        if fields:
+            query: Select[Any] = select(*(getattr(self.model, field) for field in fields))
+        else:
+            query = select(self.model)
+            for opt in options or ():
                 query = query.options(opt)
         if filters:
             for flt in filters:
                 query = query.where(flt)
-        total_query = select(func.count()).select_from(query.subquery())
-        total = (await self.session.execute(total_query)).scalar_one()
 
         order_by_attr = self.default_order_attr(params)
         if params.order_by:
             custom_attr = getattr(self.model, params.order_by, None)
             if isinstance(custom_attr, InstrumentedAttribute):
                 order_by_attr = custom_attr
+        if params.cursor is not None:
+            items, next_cursor, has_more = await self._page_after_cursor(query, params, order_by_attr, fields)
+            total = await self._total(params, filters or ())
+            return PaginatedResult(
+                total=total,
+                items=items,
+                page=params.page,
+                page_size=params.page_size,
+                next_cursor=next_cursor,
+                has_more=has_more,
+            )
         if params.order_dir == "desc":
             query = query.order_by(order_by_attr.desc())
         else:
             query = query.order_by(order_by_attr.asc())
 
         offset = (params.page - 1) * params.page_size
-        query = query.offset(offset).limit(params.page_size)
-        items = (await self.session.execute(query)).scalars().all()
-        return PaginatedResult(total=total, items=items, page=params.page, page_size=params.page_size)
+        query = query.offset(offset).limit(params.page_size + 1)
+        result = await self.session.execute(query)
+        rows = [_projected_row(fields, row) for row in result] if fields else result.scalars().all()
+        items, has_more = rows[: params.page_size], len(rows) > params.page_size
+        if params.total_mode != "none" and not has_more and (items or offset == 0):
+            # The last page already tells how many rows match; no count needed.
+            total: Optional[int] = offset + len(items)
+        else:
+            total = await self._total(params, filters or ())
+        return PaginatedResult(
+            total=total, items=items, page=params.page, page_size=params.page_size, has_more=has_more
+        )
+
+    async def _total(self, params: PaginationParams, filters: Sequence[Any]) -> Optional[int]:
+        """Rows matching ``filters``, computed as ``params.total_mode`` asks.
+
+        ``exact`` counts; ``estimated`` asks the planner (counting where the dialect has no
+        statistics); ``cached`` reuses a count for the same filters until a commit writes
+        to the table or the entry expires; ``none`` skips the count.
+        """
+        if params.total_mode == "none":
+            return None
+        count_query = select(func.count()).select_from(self.model).where(*filters)
+        if params.total_mode == "estimated":
+            estimate = await estimate_rows(self.session, select(self.model.id).where(*filters))
+            if estimate is not None:
+                return estimate
+        if params.total_mode != "cached":
+            return (await self.session.execute(count_query)).scalar_one()
+        table = self.model.__table__.name
+        key = count_cache_key(count_query, self.session.get_bind().dialect)
+        total = count_cache.get(table, key)
+        if total is None:
+            generation = count_cache.generation(table)
+            total = (await self.session.execute(count_query)).scalar_one()
+            count_cache.store(table, key, total, generation)
+        return total
+
+    @classmethod
+    def select_fields(cls, requested: Sequence[str] | None = None) -> list[str]:
+        """``requested`` column names in order, deduplicated and led by ``id``; all columns if None."""
+        columns = list(cls.model.__mapper__.column_attrs.keys())
+        if requested is None:
+            return list(dict.fromkeys(["id", *columns]))
+        unknown = [field for field in requested if field not in columns]
+        if unknown:
+            raise InvalidFieldsError(f"Unknown fields for {cls.model.__tablename__}: {', '.join(unknown)}")
+        return list(dict.fromkeys(["id", *requested]))
+
+    async def stream_rows(
+        self,
+        fields: Sequence[str],
+        filters: Sequence[Any] = (),
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Every row matching ``filters`` as ``fields`` dicts, ``chunk_size`` rows at a time.
+
+        Rows come from a server-side cursor in the default list order, so memory stays
+        bounded by one chunk whatever the table size and no count or offset is run.
+        """
+        order_by_attr = self.default_order_attr(PaginationParams())
+        query = (
+            select(*(getattr(self.model, field) for field in fields))
+            .where(*filters)
+            .order_by(order_by_attr.asc(), self.model.id.asc())
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.partitions(chunk_size):
+            yield [_projected_row(fields, row) for row in partition]
+
+    async def _page_after_cursor(
+        self,
+        query: Select[Any],
+        params: PaginationParams,
+        order_by_attr: InstrumentedAttribute[Any],
+        fields: Optional[Sequence[str]] = None,
+    ) -> tuple[list[Any], Optional[str], bool]:
+        """Keyset page: rows strictly after the cursor's ``(order value, id)``.
+
+        The seek predicate is spelled out as ``col > v OR (col = v AND id > i)`` so an index
+        on ``(col, id)`` or ``col`` serves it on every dialect; ``id`` breaks ties between
+        equal order values. One extra row is fetched to know whether a next page exists.
+        """
+        id_attr = self.model.id
+        if order_by_attr.expression.nullable:
+            raise InvalidCursorError(f"Cannot page by nullable column '{order_by_attr.key}' with a cursor")
+        descending = params.order_dir == "desc"
+        if params.cursor:
+            value, last_id = decode_cursor(params.cursor, order_by_attr, params.order_dir)
+            value = self._seek_value(order_by_attr, value)
+            if descending:
+                seek = or_(order_by_attr < value, and_(order_by_attr == value, id_attr < last_id))
+            else:
+                seek = or_(order_by_attr > value, and_(order_by_attr == value, id_attr > last_id))
+            query = query.where(seek)
+        if descending:
+            query = query.order_by(order_by_attr.desc(), id_attr.desc())
+        else:
+            query = query.order_by(order_by_attr.asc(), id_attr.asc())
+        # The order value is selected alongside the entity rather than read from it, so a
+        # server-side default that was never loaded cannot trigger a lazy load.
+        rows = (await self.session.execute(query.add_columns(order_by_attr).limit(params.page_size + 1))).all()
+        if fields:
+            items = [_projected_row(fields, row[:-1]) for row in rows[: params.page_size]]
+        else:
+            items = [row[0] for row in rows[: params.page_size]]
+        next_cursor = None
+        has_more = len(rows) > params.page_size
+        if has_more:
+            last = items[-1]
+            last_id = last["id"] if fields else last.id
+            next_cursor = encode_cursor(order_by_attr.key, params.order_dir, rows[params.page_size - 1][-1], last_id)
+        return items, next_cursor, has_more
+
+    def _seek_value(self, column: InstrumentedAttribute[Any], value: Any) -> Any:
+        # SQLite keeps datetimes as text; server defaults (CURRENT_TIMESTAMP) are stored
+        # without the microseconds SQLAlchemy adds when binding, so compare in that format.
+        if (
+            isinstance(column.type, DateTime)
+            and isinstance(value, datetime)
+            and not value.microsecond
+            and self.session.get_bind().dialect.name == "sqlite"
+        ):
+            return literal(value.strftime("%Y-%m-%d %H:%M:%S"), String())
+        return value
 
     @classmethod
     def default_order_attr(cls, params: PaginationParams) -> InstrumentedAttribute[Any]:
@@ -64,15 +267,8 @@ class BaseRepository(Generic[ModelT]):
         await self.session.delete(obj)
 
     async def generate_id(self, prefix: str) -> str:
-        like_pattern = f"{prefix}-%"
-        result = await self.session.execute(
-            select(self.model.id).where(self.model.id.like(like_pattern)).order_by(self.model.id.desc()).limit(1)
-        )
-        last_id = result.scalar_one_or_none()
-        if not last_id:
-            return f"{prefix}-0001"
-        try:
-            number = int(str(last_id).split("-")[1])
-        except (IndexError, ValueError):
-            number = 0
-        return f"{prefix}-{number + 1:04d}"
+        return (await self.generate_ids(prefix, 1))[0]
+
+    async def generate_ids(self, prefix: str, count: int) -> list[str]:
+        """Reserve ``count`` new ids for ``prefix`` from the shared hi-lo allocator."""
+        return await id_allocator.allocate(self.session, self.model, prefix, count)
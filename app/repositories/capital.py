@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy import and_
 
@@ -10,19 +10,19 @@ from ..models.capital import CapitalEntry, CapitalType
 from .cash import CashRepository
 from ..schemas.common import PaginationParams, PaginatedResult
 from .base import BaseRepository
+from .summary_snapshot import SummarySnapshotRepository
 
 
 class CapitalRepository(BaseRepository[CapitalEntry]):
     model = CapitalEntry
 
-    async def list_capital(
-        self,
-        params: PaginationParams,
+    @staticmethod
+    def list_filters(
         partner: Optional[str] = None,
         type: Optional[CapitalType] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-    ) -> PaginatedResult[CapitalEntry]:
+    ) -> list[Any]:
         filters = []
         if partner:
             filters.append(CapitalEntry.partner.ilike(f"%{partner}%"))
@@ -35,6 +35,17 @@ class CapitalRepository(BaseRepository[CapitalEntry]):
             period_filters.append(CapitalEntry.date <= end_date)
         if period_filters:
             filters.append(and_(*period_filters))
+        return filters
+
+    async def list_capital(
+        self,
+        params: PaginationParams,
+        partner: Optional[str] = None,
+        type: Optional[CapitalType] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> PaginatedResult[CapitalEntry]:
+        filters = self.list_filters(partner=partner, type=type, start_date=start_date, end_date=end_date)
         return await super().list(params, filters=filters)
 
     async def create_capital(self, data: dict) -> CapitalEntry:
@@ -42,21 +53,29 @@ class CapitalRepository(BaseRepository[CapitalEntry]):
         payload["id"] = payload.get("id") or await self.generate_id("CAP")
         entry = CapitalEntry(**payload)
         await self.create(entry)
+        snapshot = SummarySnapshotRepository(self.session)
+        await snapshot.record(None, snapshot.capital_contribution(entry))
         await self._sync_cash_for_capital(entry)
         return entry
 
     async def update_capital(self, entry: CapitalEntry, data: dict) -> CapitalEntry:
+        snapshot = SummarySnapshotRepository(self.session)
+        before = snapshot.capital_contribution(entry)
         for key, value in data.items():
             if value is not None and hasattr(entry, key):
                 setattr(entry, key, value)
         await self.session.flush()
+        await snapshot.record(before, snapshot.capital_contribution(entry))
         await self._sync_cash_for_capital(entry)
         return entry
 
     async def delete_capital_entry(self, entry: CapitalEntry) -> None:
+        snapshot = SummarySnapshotRepository(self.session)
+        before = snapshot.capital_contribution(entry)
         await self._remove_cash_for_capital(entry.id)
         await super().delete(entry)
         await self.session.flush()
+        await snapshot.record(before, None)
 
     async def _sync_cash_for_capital(self, entry: CapitalEntry) -> None:
         cash_repo = CashRepository(self.session)
@@ -1,26 +1,26 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy import and_, select
 
 from ..models.cash import CashTxn, CashTxnType
 from ..schemas.common import PaginationParams, PaginatedResult
 from .base import BaseRepository
+from .summary_snapshot import SummarySnapshotRepository
 
 
 class CashRepository(BaseRepository[CashTxn]):
     model = CashTxn
 
-    async def list_txns(
-        self,
-        params: PaginationParams,
+    @staticmethod
+    def list_filters(
         type: Optional[CashTxnType] = None,
         category: Optional[str] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-    ) -> PaginatedResult[CashTxn]:
+    ) -> list[Any]:
         filters = []
         if type:
             filters.append(CashTxn.type == type)
@@ -33,6 +33,17 @@ class CashRepository(BaseRepository[CashTxn]):
             period_filters.append(CashTxn.date <= end_date)
         if period_filters:
             filters.append(and_(*period_filters))
+        return filters
+
+    async def list_txns(
+        self,
+        params: PaginationParams,
+        type: Optional[CashTxnType] = None,
+        category: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> PaginatedResult[CashTxn]:
+        filters = self.list_filters(type=type, category=category, start_date=start_date, end_date=end_date)
         return await super().list(params, filters=filters)
 
     async def create_txn(self, data: dict) -> CashTxn:
@@ -40,15 +51,27 @@ class CashRepository(BaseRepository[CashTxn]):
         payload["id"] = payload.get("id") or await self.generate_id("CSH")
         txn = CashTxn(**payload)
         await self.create(txn)
+        snapshot = SummarySnapshotRepository(self.session)
+        await snapshot.record(None, snapshot.cash_contribution(txn))
         return txn
 
     async def update_txn(self, txn: CashTxn, data: dict) -> CashTxn:
+        snapshot = SummarySnapshotRepository(self.session)
+        before = snapshot.cash_contribution(txn)
         for key, value in data.items():
             if hasattr(txn, key):
                 setattr(txn, key, value)
         await self.session.flush()
+        await snapshot.record(before, snapshot.cash_contribution(txn))
         return txn
 
+    async def delete(self, txn: CashTxn) -> None:
+        snapshot = SummarySnapshotRepository(self.session)
+        before = snapshot.cash_contribution(txn)
+        await super().delete(txn)
+        await self.session.flush()
+        await snapshot.record(before, None)
+
     async def get_by_related_expense(self, expense_id: str) -> Optional[CashTxn]:
         stmt = select(CashTxn).where(CashTxn.related_expense_id == expense_id)
         result = await self.session.execute(stmt)
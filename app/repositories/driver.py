@@ -1,28 +1,39 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy import select
 
 from ..models.driver import Driver, DriverStatus
+from ..models.rent_payment import RentPayment
+from ..models.rental import Rental
 from ..schemas.common import PaginationParams, PaginatedResult
 from .base import BaseRepository
+from .summary_snapshot import SummarySnapshotRepository
 
 
 class DriverRepository(BaseRepository[Driver]):
     model = Driver
 
-    async def list_drivers(
-        self,
-        params: PaginationParams,
+    @staticmethod
+    def list_filters(
         status: Optional[DriverStatus] = None,
         name: Optional[str] = None,
-    ) -> PaginatedResult[Driver]:
+    ) -> list[Any]:
         filters = []
         if status:
             filters.append(Driver.status == status)
         if name:
             filters.append(Driver.name.ilike(f"%{name}%"))
+        return filters
+
+    async def list_drivers(
+        self,
+        params: PaginationParams,
+        status: Optional[DriverStatus] = None,
+        name: Optional[str] = None,
+    ) -> PaginatedResult[Driver]:
+        filters = self.list_filters(status=status, name=name)
         return await super().list(params, filters=filters)
 
     async def get_by_cpf(self, cpf: str) -> Optional[Driver]:
@@ -43,3 +54,16 @@ class DriverRepository(BaseRepository[Driver]):
         await self.session.flush()
         return driver
 
+    async def delete(self, driver: Driver) -> None:
+        # Rentals and their payments are removed by cascade.
+        snapshot = SummarySnapshotRepository(self.session)
+        payments = (
+            await self.session.execute(
+                select(RentPayment).join(Rental).where(Rental.driver_id == driver.id)
+            )
+        ).scalars().all()
+        before = await snapshot.contributions(payments)
+        await super().delete(driver)
+        await self.session.flush()
+        await snapshot.record(before, None)
+
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy import and_, select
 from sqlalchemy.orm import selectinload
@@ -12,19 +12,19 @@ from ..models.vehicle import Vehicle
 from .cash import CashRepository
 from ..schemas.common import PaginationParams, PaginatedResult
 from .base import BaseRepository
+from .summary_snapshot import Contribution, SummarySnapshotRepository
 
 
 class ExpenseRepository(BaseRepository[Expense]):
     model = Expense
 
-    async def list_expenses(
-        self,
-        params: PaginationParams,
+    @staticmethod
+    def list_filters(
         vehicle_id: Optional[str] = None,
         category: Optional[ExpenseCategory] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-    ) -> PaginatedResult[Expense]:
+    ) -> list[Any]:
         filters = []
         if vehicle_id:
             filters.append(Expense.vehicle_id == vehicle_id)
@@ -37,32 +37,59 @@ class ExpenseRepository(BaseRepository[Expense]):
             period_filters.append(Expense.date <= end_date)
         if period_filters:
             filters.append(and_(*period_filters))
+        return filters
+
+    async def list_expenses(
+        self,
+        params: PaginationParams,
+        vehicle_id: Optional[str] = None,
+        category: Optional[ExpenseCategory] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> PaginatedResult[Expense]:
+        filters = self.list_filters(vehicle_id=vehicle_id, category=category, start_date=start_date, end_date=end_date)
         return await super().list(params, filters=filters, options=[selectinload(Expense.vehicle)])
 
     async def create_expense(self, data: dict) -> Expense:
         payload = data.copy()
         payload["id"] = payload.get("id") or await self.generate_id("EXP")
         expense = Expense(**payload)
+        snapshot = SummarySnapshotRepository(self.session)
+        vehicles_before = await self._vehicle_contributions([expense.vehicle_id])
         await self.create(expense)
-        await self._touch_vehicle(expense.vehicle_id)
+        await snapshot.record(None, snapshot.expense_contribution(expense))
+        await self._touch_vehicle(expense.vehicle_id, vehicles_before)
         await self._sync_cash_for_expense(expense)
         return expense
 
     async def update_expense(self, expense: Expense, data: dict) -> Expense:
+        snapshot = SummarySnapshotRepository(self.session)
+        previous_vehicle_id = expense.vehicle_id
+        new_vehicle_id = data.get("vehicle_id") or previous_vehicle_id
+        vehicles_before = await self._vehicle_contributions([previous_vehicle_id, new_vehicle_id])
+        before = snapshot.expense_contribution(expense)
         for key, value in data.items():
             if value is not None and hasattr(expense, key):
                 setattr(expense, key, value)
         await self.session.flush()
-        await self._touch_vehicle(expense.vehicle_id)
+        await snapshot.record(before, snapshot.expense_contribution(expense))
+        if previous_vehicle_id != expense.vehicle_id:
+            await self._touch_vehicle(previous_vehicle_id, vehicles_before)
+        await self._touch_vehicle(expense.vehicle_id, vehicles_before)
         await self._sync_cash_for_expense(expense)
         return expense
 
 
 
     async def delete_expense(self, expense: Expense) -> None:
+        snapshot = SummarySnapshotRepository(self.session)
+        vehicles_before = await self._vehicle_contributions([expense.vehicle_id])
+        before = snapshot.expense_contribution(expense)
         await self._remove_cash_for_expense(expense.id)
         await super().delete(expense)
         await self.session.flush()
+        await snapshot.record(before, None)
+        await self._touch_vehicle(expense.vehicle_id, vehicles_before)
 
     async def _sync_cash_for_expense(self, expense: Expense) -> None:
         cash_repo = CashRepository(self.session)
@@ -88,9 +115,23 @@ class ExpenseRepository(BaseRepository[Expense]):
         if existing:
             await cash_repo.delete(existing)
 
-    async def _touch_vehicle(self, vehicle_id: str) -> None:
+    async def _vehicle_contributions(self, vehicle_ids: list[str]) -> dict[str, Contribution]:
+        snapshot = SummarySnapshotRepository(self.session)
+        contributions: dict[str, Contribution] = {}
+        for vehicle_id in vehicle_ids:
+            if vehicle_id in contributions:
+                continue
+            vehicle = await self.session.get(Vehicle, vehicle_id)
+            if vehicle:
+                contributions[vehicle_id] = await snapshot.vehicle_contribution(vehicle)
+        return contributions
+
+    async def _touch_vehicle(self, vehicle_id: str, before: dict[str, Contribution]) -> None:
         vehicle = await self.session.get(Vehicle, vehicle_id)
         if vehicle:
             vehicle.sync_status()
             await self.session.flush()
+            # Realized profit of a sold vehicle depends on its expenses.
+            snapshot = SummarySnapshotRepository(self.session)
+            await snapshot.record(before.get(vehicle_id), await snapshot.vehicle_contribution(vehicle))
 
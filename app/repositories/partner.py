@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Optional
 
 from ..models.partner import Partner
 from ..schemas.common import PaginationParams, PaginatedResult
@@ -10,14 +10,21 @@ from .base import BaseRepository
 class PartnerRepository(BaseRepository[Partner]):
     model = Partner
 
+    @staticmethod
+    def list_filters(
+        name: Optional[str] = None,
+    ) -> list[Any]:
+        filters = []
+        if name:
+            filters.append(Partner.name.ilike(f"%{name}%"))
+        return filters
+
     async def list_partners(
         self,
         params: PaginationParams,
         name: Optional[str] = None,
     ) -> PaginatedResult[Partner]:
-        filters = []
-        if name:
-            filters.append(Partner.name.ilike(f"%{name}%"))
+        filters = self.list_filters(name=name)
         return await super().list(params, filters=filters)
 
     async def create_partner(self, data: dict) -> Partner:
@@ -1,31 +1,41 @@
 from __future__ import annotations
 
-from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional, Sequence
 
-from sqlalchemy import and_, select
+from sqlalchemy import ColumnElement, Numeric, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.orm import selectinload
 
+from ..models.common import quantize_decimal
 from ..models.rent_payment import RentPayment
 from ..schemas.common import PaginationParams, PaginatedResult
 from .base import BaseRepository
+from .summary_snapshot import SummarySnapshotRepository, month_bucket
 
 
 class RentPaymentRepository(BaseRepository[RentPayment]):
     model = RentPayment
 
-    async def list_payments(
-        self,
-        params: PaginationParams,
+    @staticmethod
+    def list_filters(
         rental_id: Optional[str] = None,
         open_only: bool = False,
-    ) -> PaginatedResult[RentPayment]:
+    ) -> list[Any]:
         filters = []
         if rental_id:
             filters.append(RentPayment.rental_id == rental_id)
         if open_only:
-            filters.append(RentPayment.paid_amount < RentPayment.due_amount + RentPayment.late_fee)
+            filters.append(RentPayment.outstanding_amount > 0)
+        return filters
+
+    async def list_payments(
+        self,
+        params: PaginationParams,
+        rental_id: Optional[str] = None,
+        open_only: bool = False,
+    ) -> PaginatedResult[RentPayment]:
+        filters = self.list_filters(rental_id=rental_id, open_only=open_only)
         return await super().list(
             params,
             filters=filters,
@@ -42,24 +52,161 @@ class RentPaymentRepository(BaseRepository[RentPayment]):
         payment = RentPayment(**payload)
         payment.recompute_totals()
         await self.create(payment)
+        snapshot = SummarySnapshotRepository(self.session)
+        await snapshot.record(None, snapshot.rent_payment_contribution(payment))
         return payment
 
+    async def period_exists(
+        self,
+        rental_id: str,
+        period_start: Any,
+        period_end: Any,
+        exclude_id: Optional[str] = None,
+    ) -> bool:
+        """Whether another payment already holds ``uq_rent_payment_period`` for this period."""
+        stmt = select(RentPayment.id).where(
+            RentPayment.rental_id == rental_id,
+            RentPayment.period_start == period_start,
+            RentPayment.period_end == period_end,
+        )
+        if exclude_id is not None:
+            stmt = stmt.where(RentPayment.id != exclude_id)
+        return (await self.session.execute(stmt.limit(1))).first() is not None
+
+    async def bulk_create_payments(self, charges: Sequence[dict[str, Any]]) -> list[str]:
+        """Insert new charges with one statement and return the ids actually created.
+
+        Each charge needs ``rental_id``, ``period_start``, ``period_end`` and ``weekly_rate``;
+        weeks and due amount are derived as in ``RentPayment.recompute_totals``. Charges for
+        a period that already has a payment are skipped by ``uq_rent_payment_period``, so
+        concurrent runs never duplicate a charge.
+        """
+        if not charges:
+            return []
+        ids = await self.generate_ids("PAY", len(charges))
+        rows: list[dict[str, Any]] = []
+        for payment_id, charge in zip(ids, charges):
+            weeks, due_amount = RentPayment.period_totals(
+                charge["period_start"], charge["period_end"], charge["weekly_rate"]
+            )
+            rows.append(
+                {
+                    "id": payment_id,
+                    "rental_id": charge["rental_id"],
+                    "period_start": charge["period_start"],
+                    "period_end": charge["period_end"],
+                    "weekly_rate": charge["weekly_rate"],
+                    "weeks": weeks,
+                    "due_amount": due_amount,
+                    "paid_amount": Decimal("0"),
+                    "late_fee": Decimal("0"),
+                }
+            )
+        created = await self._insert_new_periods(rows)
+        rows = [row for row in rows if row["id"] in created]
+        snapshot = SummarySnapshotRepository(self.session)
+        # Transient instances only feed the counter deltas; they are never added to the session.
+        await snapshot.record(None, await snapshot.contributions(RentPayment(**row) for row in rows))
+        return [row["id"] for row in rows]
+
+    async def _insert_new_periods(self, rows: list[dict[str, Any]]) -> set[str]:
+        """Dialect-native insert that ignores rows whose period is already billed."""
+        dialect = self.session.get_bind().dialect.name
+        period_key = [RentPayment.rental_id, RentPayment.period_start, RentPayment.period_end]
+        if dialect in {"sqlite", "postgresql"}:
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            stmt = (
+                dialect_insert(RentPayment)
+                .on_conflict_do_nothing(index_elements=period_key)
+                .returning(RentPayment.id)
+            )
+            return set((await self.session.execute(stmt, rows)).scalars())
+        if dialect == "mysql":
+            # A no-op ON DUPLICATE KEY UPDATE rather than INSERT IGNORE, which would also
+            # swallow foreign key and check violations. MySQL has no RETURNING, so the
+            # inserted rows are read back by id and period.
+            stmt = mysql.insert(RentPayment)
+            stmt = stmt.on_duplicate_key_update(rental_id=RentPayment.rental_id)
+            await self.session.execute(stmt, rows)
+            written = await self.session.execute(
+                select(RentPayment.id).where(
+                    tuple_(RentPayment.id, *period_key).in_(
+                        [(row["id"], row["rental_id"], row["period_start"], row["period_end"]) for row in rows]
+                    )
+                )
+            )
+            return set(written.scalars())
+        await self.session.execute(insert(RentPayment), rows)
+        return {row["id"] for row in rows}
+
+    async def accrue_late_fees(
+        self,
+        period_condition: ColumnElement[bool],
+        fixed_fee: Decimal,
+        unpaid_rate: Decimal,
+    ) -> int:
+        """Raise ``late_fee`` to ``fixed_fee + unpaid * unpaid_rate`` with one ``UPDATE``.
+
+        Applies to payments matching ``period_condition`` that still have unpaid rent; fees
+        already at or above the computed value (including ones set by hand) are left alone,
+        so running it again the same day changes nothing. Returns the payments updated.
+
+        The matching rows are read ``FOR UPDATE`` and only those ids are updated, so a
+        payment committed concurrently can neither change a fee between the two statements
+        nor be raised without its counter delta.
+        """
+        unpaid = RentPayment.due_amount - RentPayment.paid_amount
+        fee = literal(fixed_fee, Numeric(10, 2)) + func.round(unpaid * literal(unpaid_rate, Numeric(12, 6)), 2)
+        conditions = [period_condition, unpaid > 0, RentPayment.late_fee < fee]
+        increases = (
+            await self.session.execute(
+                select(RentPayment.id, RentPayment.period_start, fee - RentPayment.late_fee)
+                .where(*conditions)
+                .with_for_update()
+            )
+        ).all()
+        if not increases:
+            return 0
+        updated = 0
+        ids = [payment_id for payment_id, _, _ in increases]
+        for index in range(0, len(ids), 1000):
+            result = await self.session.execute(
+                update(RentPayment)
+                .where(RentPayment.id.in_(ids[index : index + 1000]), *conditions)
+                .values(late_fee=fee)
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+        snapshot = SummarySnapshotRepository(self.session)
+        if updated != len(increases):
+            # A row changed between the statements (no row locks on this dialect).
+            await snapshot.rebuild()
+            return updated
+        # Unpaid rent means the payment was already open, so only the amounts move.
+        deltas: dict[tuple[str, str, str], Decimal] = {}
+        for _, period_start, increase in increases:
+            increase = quantize_decimal(Decimal(str(increase)))
+            rent_due = ("rent_due", month_bucket(period_start), "")
+            deltas[rent_due] = deltas.get(rent_due, Decimal("0")) + increase
+            deltas[("rent_outstanding", "", "")] = deltas.get(("rent_outstanding", "", ""), Decimal("0")) + increase
+        await snapshot.record(None, deltas)
+        return updated
+
     async def update_payment(self, payment: RentPayment, data: dict) -> RentPayment:
+        snapshot = SummarySnapshotRepository(self.session)
+        before = snapshot.rent_payment_contribution(payment)
         for key, value in data.items():
             if value is not None and hasattr(payment, key):
                 setattr(payment, key, value)
         payment.recompute_totals()
         await self.session.flush()
+        await snapshot.record(before, snapshot.rent_payment_contribution(payment))
         return payment
 
-    async def exists_for_period(self, rental_id: str, period_start: date, period_end: date) -> bool:
-        stmt = select(RentPayment.id).where(
-            and_(
-                RentPayment.rental_id == rental_id,
-                RentPayment.period_start == period_start,
-                RentPayment.period_end == period_end,
-            )
-        )
-        result = await self.session.execute(stmt)
-        return result.scalar_one_or_none() is not None
+    async def delete(self, payment: RentPayment) -> None:
+        snapshot = SummarySnapshotRepository(self.session)
+        before = snapshot.rent_payment_contribution(payment)
+        await super().delete(payment)
+        await self.session.flush()
+        await snapshot.record(before, None)
 
@@ -1,27 +1,28 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from ..models.rent_payment import RentPayment
 from ..models.rental import Rental, RentalStatus
 from ..models.vehicle import Vehicle
 from ..schemas.common import PaginationParams, PaginatedResult
 from ..schemas.rental import RentalClose
 from .base import BaseRepository
+from .summary_snapshot import SummarySnapshotRepository
 
 
 class RentalRepository(BaseRepository[Rental]):
     model = Rental
 
-    async def list_rentals(
-        self,
-        params: PaginationParams,
+    @staticmethod
+    def list_filters(
         status: Optional[RentalStatus] = None,
         driver_id: Optional[str] = None,
         vehicle_id: Optional[str] = None,
-    ) -> PaginatedResult[Rental]:
+    ) -> list[Any]:
         filters = []
         if status:
             filters.append(Rental.status == status)
@@ -29,6 +30,16 @@ class RentalRepository(BaseRepository[Rental]):
             filters.append(Rental.driver_id == driver_id)
         if vehicle_id:
             filters.append(Rental.vehicle_id == vehicle_id)
+        return filters
+
+    async def list_rentals(
+        self,
+        params: PaginationParams,
+        status: Optional[RentalStatus] = None,
+        driver_id: Optional[str] = None,
+        vehicle_id: Optional[str] = None,
+    ) -> PaginatedResult[Rental]:
+        filters = self.list_filters(status=status, driver_id=driver_id, vehicle_id=vehicle_id)
         return await super().list(
             params,
             filters=filters,
@@ -67,14 +78,23 @@ class RentalRepository(BaseRepository[Rental]):
 
     async def delete_rental(self, rental: Rental) -> None:
         vehicle_id = rental.vehicle_id
+        snapshot = SummarySnapshotRepository(self.session)
+        payments = (
+            await self.session.execute(select(RentPayment).where(RentPayment.rental_id == rental.id))
+        ).scalars().all()
+        before = await snapshot.contributions(payments)
         await self.session.delete(rental)
         await self.session.flush()
+        await snapshot.record(before, None)
         await self._sync_vehicle(vehicle_id, None)
 
     async def _sync_vehicle(self, vehicle_id: str, driver_id: Optional[str]) -> None:
         vehicle = await self.session.get(Vehicle, vehicle_id)
         if vehicle:
+            snapshot = SummarySnapshotRepository(self.session)
+            before = await snapshot.vehicle_contribution(vehicle)
             vehicle.current_driver_id = driver_id
             vehicle.sync_status()
             await self.session.flush()
+            await snapshot.record(before, await snapshot.vehicle_contribution(vehicle))
 
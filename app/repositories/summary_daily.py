@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Optional
+
+from ..models.summary_daily import SummaryDailySnapshot
+from ..services.summary_cache import mark_summary_changed
+from .base import BaseRepository
+
+
+class SummaryDailyRepository(BaseRepository[SummaryDailySnapshot]):
+    model = SummaryDailySnapshot
+
+    async def get_payload(self, day: date) -> Optional[dict[str, Any]]:
+        snapshot = await self.get(day)
+        return snapshot.payload if snapshot else None
+
+    async def save(self, day: date, payload: dict[str, Any]) -> SummaryDailySnapshot:
+        mark_summary_changed(self.session)
+        snapshot = await self.get(day)
+        if snapshot is None:
+            return await self.create(SummaryDailySnapshot(day=day, payload=payload))
+        snapshot.payload = payload
+        await self.session.flush()
+        return snapshot
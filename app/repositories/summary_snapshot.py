@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import Insert, delete, func, insert, or_, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from ..models.capital import CapitalEntry, CapitalType
+from ..models.cash import CashTxn, CashTxnType
+from ..models.common import quantize_decimal
+from ..models.expense import Expense
+from ..models.rent_payment import RentPayment
+from ..models.summary_counter import SummaryCounter
+from ..models.vehicle import Vehicle, VehicleStatus
+from ..services.summary_cache import mark_summary_changed
+from .base import BaseRepository
+
+CounterKey = tuple[str, str, str]
+Contribution = dict[CounterKey, Decimal]
+
+SNAPSHOT_MARKER: CounterKey = ("snapshot", "", "built")
+
+
+def month_bucket(reference: date) -> str:
+    return f"{reference.year:04d}-{reference.month:02d}"
+
+
+def _increment_counter(dialect: str, key: CounterKey, delta: Decimal) -> Optional[Insert]:
+    """Atomic create-or-add of one counter; ``None`` where the dialect has no upsert."""
+    metric, bucket, dimension = key
+    row = {"metric": metric, "bucket": bucket, "dimension": dimension, "value": delta}
+    changes = {"value": SummaryCounter.value + delta, "updated_at": func.now()}
+    if dialect == "mysql":
+        return mysql.insert(SummaryCounter).values(row).on_duplicate_key_update(**changes)
+    if dialect in {"sqlite", "postgresql"}:
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        return (
+            dialect_insert(SummaryCounter)
+            .values(row)
+            .on_conflict_do_update(
+                index_elements=[SummaryCounter.metric, SummaryCounter.bucket, SummaryCounter.dimension],
+                set_=changes,
+            )
+        )
+    return None
+
+
+def _add(contribution: Contribution, metric: str, value: Any, bucket: str = "", dimension: str = "") -> None:
+    key = (metric, bucket, dimension)
+    contribution[key] = contribution.get(key, Decimal("0")) + Decimal(value or 0)
+
+
+def _label(value: Any) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+class SummarySnapshotRepository(BaseRepository[SummaryCounter]):
+    """Maintains the ``summary_counters`` table incrementally.
+
+    Each tracked entity contributes a set of counter deltas; writers capture the
+    contribution before and after a change and :meth:`record` applies the difference.
+    """
+
+    model = SummaryCounter
+
+    async def contribution(self, obj: Any) -> Contribution:
+        if isinstance(obj, Vehicle):
+            return await self.vehicle_contribution(obj)
+        if isinstance(obj, Expense):
+            return self.expense_contribution(obj)
+        if isinstance(obj, RentPayment):
+            return self.rent_payment_contribution(obj)
+        if isinstance(obj, CashTxn):
+            return self.cash_contribution(obj)
+        if isinstance(obj, CapitalEntry):
+            return self.capital_contribution(obj)
+        return {}
+
+    async def vehicle_contribution(self, vehicle: Vehicle) -> Contribution:
+        contribution: Contribution = {}
+        if vehicle.status is None:
+            return contribution
+        _add(contribution, "vehicles_status", 1, dimension=_label(vehicle.status))
+        if vehicle.status == VehicleStatus.SOLD and vehicle.sale_date:
+            bucket = month_bucket(vehicle.sale_date)
+            _add(contribution, "vehicles_sold", 1, bucket=bucket)
+            if vehicle.sale_price is not None and vehicle.id:
+                expenses_total = await self.session.scalar(
+                    select(Vehicle.total_expenses).where(Vehicle.id == vehicle.id)
+                )
+                sale_net = Decimal(vehicle.sale_price) - Decimal(vehicle.sale_fees or 0)
+                cost = Decimal(vehicle.acquisition_price or 0) + Decimal(expenses_total or 0)
+                _add(contribution, "sales_profit", sale_net - cost, bucket=bucket)
+        return contribution
+
+    @staticmethod
+    def expense_contribution(expense: Expense) -> Contribution:
+        contribution: Contribution = {}
+        if expense.date and expense.category:
+            _add(contribution, "expenses", expense.amount, bucket=month_bucket(expense.date), dimension=_label(expense.category))
+        return contribution
+
+    @staticmethod
+    def rent_payment_contribution(payment: RentPayment) -> Contribution:
+        contribution: Contribution = {}
+        due = Decimal(payment.due_amount or 0)
+        late_fee = Decimal(payment.late_fee or 0)
+        paid = Decimal(payment.paid_amount or 0)
+        if payment.period_start:
+            _add(contribution, "rent_due", due + late_fee, bucket=month_bucket(payment.period_start))
+        if payment.payment_date:
+            _add(contribution, "rent_collected", paid, bucket=month_bucket(payment.payment_date))
+        balance = due + late_fee - paid
+        if balance > 0:
+            _add(contribution, "rent_outstanding", balance)
+            _add(contribution, "rent_open", 1)
+        return contribution
+
+    @staticmethod
+    def cash_contribution(txn: CashTxn) -> Contribution:
+        contribution: Contribution = {}
+        metric = "cash_inflow" if txn.type == CashTxnType.INFLOW else "cash_outflow"
+        _add(contribution, metric, txn.amount)
+        return contribution
+
+    @staticmethod
+    def capital_contribution(entry: CapitalEntry) -> Contribution:
+        contribution: Contribution = {}
+        metric = "capital_contribution" if entry.type == CapitalType.CONTRIBUTION else "capital_withdrawal"
+        _add(contribution, metric, entry.amount, dimension=entry.partner or "")
+        return contribution
+
+    async def contributions(self, objects: Iterable[Any]) -> Contribution:
+        total: Contribution = {}
+        for obj in objects:
+            for key, value in (await self.contribution(obj)).items():
+                total[key] = total.get(key, Decimal("0")) + value
+        return total
+
+    async def record(self, before: Optional[Contribution], after: Optional[Contribution]) -> None:
+        before = before or {}
+        after = after or {}
+        for key in set(before) | set(after):
+            delta = after.get(key, Decimal("0")) - before.get(key, Decimal("0"))
+            if delta:
+                await self._increment(key, delta)
+                mark_summary_changed(self.session)
+
+    async def _increment(self, key: CounterKey, delta: Decimal) -> None:
+        # A single upsert: UPDATE-then-INSERT lets two transactions creating the same new
+        # key (each month's first write) both insert and deadlock or collide.
+        upsert = _increment_counter(self.session.get_bind().dialect.name, key, delta)
+        if upsert is not None:
+            await self.session.execute(upsert)
+            return
+        metric, bucket, dimension = key
+        result = await self.session.execute(
+            update(SummaryCounter)
+            .where(
+                SummaryCounter.metric == metric,
+                SummaryCounter.bucket == bucket,
+                SummaryCounter.dimension == dimension,
+            )
+            .values(value=SummaryCounter.value + delta)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            await self.session.execute(
+                insert(SummaryCounter).values(metric=metric, bucket=bucket, dimension=dimension, value=delta)
+            )
+
+    async def is_built(self) -> bool:
+        metric, bucket, dimension = SNAPSHOT_MARKER
+        stmt = select(SummaryCounter.metric).where(
+            SummaryCounter.metric == metric,
+            SummaryCounter.bucket == bucket,
+            SummaryCounter.dimension == dimension,
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none() is not None
+
+    async def read(self, since_bucket: str) -> Sequence[Any]:
+        stmt = select(
+            SummaryCounter.metric,
+            SummaryCounter.bucket,
+            SummaryCounter.dimension,
+            SummaryCounter.value,
+        ).where(or_(SummaryCounter.bucket == "", SummaryCounter.bucket >= since_bucket))
+        return (await self.session.execute(stmt)).all()
+
+    async def rebuild(self) -> int:
+        counters: defaultdict[CounterKey, Decimal] = defaultdict(lambda: Decimal("0"))
+
+        for status, count in await self.session.execute(
+            select(Vehicle.status, func.count()).group_by(Vehicle.status)
+        ):
+            counters[("vehicles_status", "", _label(status))] += Decimal(count or 0)
+
+        sold_rows = await self.session.execute(
+            select(Vehicle.sale_date, func.count(), func.sum(Vehicle.profit))
+            .where(Vehicle.status == VehicleStatus.SOLD, Vehicle.sale_date.is_not(None))
+            .group_by(Vehicle.sale_date)
+        )
+        for sale_date, count, profit in sold_rows:
+            bucket = month_bucket(sale_date)
+            counters[("vehicles_sold", bucket, "")] += Decimal(count or 0)
+            counters[("sales_profit", bucket, "")] += Decimal(profit or 0)
+
+        for expense_date, category, amount in await self.session.execute(
+            select(Expense.date, Expense.category, func.sum(Expense.amount)).group_by(Expense.date, Expense.category)
+        ):
+            counters[("expenses", month_bucket(expense_date), _label(category))] += Decimal(amount or 0)
+
+        for period_start, amount in await self.session.execute(
+            select(RentPayment.period_start, func.sum(RentPayment.due_amount + RentPayment.late_fee)).group_by(
+                RentPayment.period_start
+            )
+        ):
+            counters[("rent_due", month_bucket(period_start), "")] += Decimal(amount or 0)
+
+        for payment_date, amount in await self.session.execute(
+            select(RentPayment.payment_date, func.sum(RentPayment.paid_amount))
+            .where(RentPayment.payment_date.is_not(None))
+            .group_by(RentPayment.payment_date)
+        ):
+            counters[("rent_collected", month_bucket(payment_date), "")] += Decimal(amount or 0)
+
+        outstanding, open_count = (
+            await self.session.execute(
+                select(func.coalesce(func.sum(RentPayment.outstanding_amount), 0), func.count()).where(
+                    RentPayment.outstanding_amount > 0
+                )
+            )
+        ).one()
+        counters[("rent_outstanding", "", "")] += Decimal(outstanding or 0)
+        counters[("rent_open", "", "")] += Decimal(open_count or 0)
+
+        for txn_type, amount in await self.session.execute(
+            select(CashTxn.type, func.sum(CashTxn.amount)).group_by(CashTxn.type)
+        ):
+            metric = "cash_inflow" if txn_type == CashTxnType.INFLOW else "cash_outflow"
+            counters[(metric, "", "")] += Decimal(amount or 0)
+
+        for partner, entry_type, amount in await self.session.execute(
+            select(CapitalEntry.partner, CapitalEntry.type, func.sum(CapitalEntry.amount)).group_by(
+                CapitalEntry.partner, CapitalEntry.type
+            )
+        ):
+            metric = "capital_contribution" if entry_type == CapitalType.CONTRIBUTION else "capital_withdrawal"
+            counters[(metric, "", partner)] += Decimal(amount or 0)
+
+        counters[SNAPSHOT_MARKER] = Decimal("1")
+
+        await self.session.execute(delete(SummaryCounter).execution_options(synchronize_session=False))
+        rows = [
+            {
+                "metric": metric,
+                "bucket": bucket,
+                "dimension": dimension,
+                "value": quantize_decimal(value),
+            }
+            for (metric, bucket, dimension), value in counters.items()
+        ]
+        await self.session.execute(insert(SummaryCounter), rows)
+        mark_summary_changed(self.session)
+        return len(rows)
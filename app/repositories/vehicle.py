@@ -1,24 +1,94 @@
 ﻿from __future__ import annotations
 
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import ColumnElement, Select, func, or_, select
 from sqlalchemy.orm import selectinload
 
+from ..models.common import quantize_decimal
+from ..models.expense import Expense
+from ..models.rent_payment import RentPayment
 from ..models.rental import Rental
 from ..models.vehicle import Vehicle, VehicleStatus
 from ..schemas.common import PaginationParams, PaginatedResult
 from ..schemas.vehicle import VehicleSell
-from .base import BaseRepository
+from .base import BaseRepository, InvalidCursorError, InvalidFieldsError
+from .summary_snapshot import SummarySnapshotRepository
+
+
+def _profitability_statement() -> Select:
+    """Per-vehicle financials as one statement over pre-aggregated expenses and payments."""
+    expense_totals = (
+        select(Expense.vehicle_id, func.sum(Expense.amount).label("total"))
+        .group_by(Expense.vehicle_id)
+        .subquery("expense_totals")
+    )
+    rent_totals = (
+        select(
+            Rental.vehicle_id,
+            func.sum(RentPayment.due_amount).label("due"),
+            func.sum(RentPayment.paid_amount).label("paid"),
+            func.sum(RentPayment.late_fee).label("late_fee"),
+        )
+        .join(RentPayment, RentPayment.rental_id == Rental.id)
+        .group_by(Rental.vehicle_id)
+        .subquery("rent_totals")
+    )
+    total_expenses = func.coalesce(expense_totals.c.total, 0)
+    rent_collected = func.coalesce(rent_totals.c.paid, 0)
+    late_fees = func.coalesce(rent_totals.c.late_fee, 0)
+    sale_net = Vehicle.sale_price - func.coalesce(Vehicle.sale_fees, 0)
+    total_cost = Vehicle.acquisition_price + total_expenses
+    total_income = rent_collected + late_fees + func.coalesce(sale_net, 0)
+    profit = total_income - total_cost
+    return (
+        select(
+            Vehicle.id,
+            Vehicle.plate,
+            Vehicle.make,
+            Vehicle.model,
+            Vehicle.status,
+            Vehicle.acquisition_price,
+            total_expenses.label("total_expenses"),
+            total_cost.label("total_cost"),
+            func.coalesce(rent_totals.c.due, 0).label("rent_due"),
+            rent_collected.label("rent_collected"),
+            late_fees.label("late_fees"),
+            sale_net.label("sale_net"),
+            total_income.label("total_income"),
+            profit.label("profit"),
+            (profit / func.nullif(total_cost, 0)).label("roi"),
+        )
+        .outerjoin(expense_totals, expense_totals.c.vehicle_id == Vehicle.id)
+        .outerjoin(rent_totals, rent_totals.c.vehicle_id == Vehicle.id)
+    )
+
+
+PROFITABILITY_SORT_FIELDS = (
+    "id",
+    "plate",
+    "make",
+    "model",
+    "status",
+    "acquisition_price",
+    "total_expenses",
+    "total_cost",
+    "rent_due",
+    "rent_collected",
+    "late_fees",
+    "sale_net",
+    "total_income",
+    "profit",
+    "roi",
+)
 
 
 class VehicleRepository(BaseRepository[Vehicle]):
     model = Vehicle
 
-    async def list_vehicles(
-        self,
-        params: PaginationParams,
+    @staticmethod
+    def list_filters(
         status: Optional[VehicleStatus] = None,
         make: Optional[str] = None,
         model: Optional[str] = None,
@@ -27,7 +97,7 @@ class VehicleRepository(BaseRepository[Vehicle]):
         in_stock: Optional[bool] = None,
         rented: Optional[bool] = None,
         sold: Optional[bool] = None,
-    ) -> PaginatedResult[Vehicle]:
+    ) -> list[Any]:
         filters = []
         if status:
             filters.append(Vehicle.status == status)
@@ -48,15 +118,116 @@ class VehicleRepository(BaseRepository[Vehicle]):
             status_filters.append(Vehicle.status == VehicleStatus.SOLD)
         if status_filters:
             filters.append(or_(*status_filters))
+        return filters
+
+    async def list_vehicles(
+        self,
+        params: PaginationParams,
+        status: Optional[VehicleStatus] = None,
+        make: Optional[str] = None,
+        model: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        in_stock: Optional[bool] = None,
+        rented: Optional[bool] = None,
+        sold: Optional[bool] = None,
+    ) -> PaginatedResult[Vehicle]:
+        filters = self.list_filters(
+            status=status,
+            make=make,
+            model=model,
+            year_from=year_from,
+            year_to=year_to,
+            in_stock=in_stock,
+            rented=rented,
+            sold=sold,
+        )
         result = await super().list(
             params,
             filters=filters,
             options=[selectinload(Vehicle.expenses)],
         )
-        for vehicle in result.items:
-            vehicle.sync_status()
+        if not params.fields:
+            for vehicle in result.items:
+                vehicle.sync_status()
         return result
 
+    async def profitability_report(
+        self,
+        params: PaginationParams,
+        status: Optional[VehicleStatus] = None,
+        make: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> PaginatedResult[dict]:
+        """Fleet profitability page in a single round trip.
+
+        The total comes from a ``COUNT(*) OVER ()`` window on the same statement, so every
+        ``total`` mode but ``none`` (which drops the window) reports it exactly; only a page
+        past the end needs a separate count. ``fields`` projects the rows like other lists.
+        ROI is derived from the rounded profit and cost with ``Vehicle.return_on_cost``,
+        exactly as on ``/vehicles/{id}/financial``; the SQL ratio only orders the rows.
+        Keyset cursors are not supported.
+        """
+        if params.cursor is not None:
+            raise InvalidCursorError("Cursor pagination is not supported by the profitability report")
+        fields = None
+        if params.fields is not None:
+            unknown = [field for field in params.fields if field not in PROFITABILITY_SORT_FIELDS]
+            if unknown:
+                raise InvalidFieldsError(f"Unknown fields for fleet-profitability: {', '.join(unknown)}")
+            fields = list(dict.fromkeys(["id", *params.fields]))
+        count_total = params.total_mode != "none"
+        base = _profitability_statement()
+        if status:
+            base = base.where(Vehicle.status == status)
+        if make:
+            base = base.where(Vehicle.make.ilike(f"%{make}%"))
+        if model:
+            base = base.where(Vehicle.model.ilike(f"%{model}%"))
+        if count_total:
+            base = base.add_columns(func.count().over().label("full_count"))
+        report = base.subquery("report")
+
+        order_name = params.order_by if params.order_by in PROFITABILITY_SORT_FIELDS else "profit"
+        order_column: ColumnElement = report.c[order_name]
+        order = order_column.desc() if params.order_dir == "desc" else order_column.asc()
+        stmt = (
+            select(report)
+            .order_by(order, report.c.id.asc())
+            .offset((params.page - 1) * params.page_size)
+            .limit(params.page_size if count_total else params.page_size + 1)
+        )
+        rows = (await self.session.execute(stmt)).mappings().all()
+        total: Optional[int] = None
+        if not count_total:
+            has_more = len(rows) > params.page_size
+            rows = rows[: params.page_size]
+        elif rows:
+            total = int(rows[0]["full_count"])
+        else:
+            total = (await self.session.execute(select(func.count()).select_from(base.subquery()))).scalar_one()
+        items = []
+        for row in rows:
+            item = {
+                key: quantize_decimal(value) if isinstance(value, (Decimal, float, int)) else value
+                for key, value in row.items()
+                if key != "full_count"
+            }
+            item["roi"] = Vehicle.return_on_cost(item["profit"], item["total_cost"])
+            if fields:
+                # Projected rows render decimals as strings, like the other lists.
+                item = {field: str(item[field]) if isinstance(item[field], Decimal) else item[field] for field in fields}
+            items.append(item)
+        if total is not None:
+            has_more = (params.page - 1) * params.page_size + len(items) < total
+        return PaginatedResult(
+            total=total,
+            items=items,
+            page=params.page,
+            page_size=params.page_size,
+            has_more=has_more,
+        )
+
     async def get(self, vehicle_id: str) -> Optional[Vehicle]:
         stmt = (
             select(Vehicle)
@@ -126,23 +297,47 @@ class VehicleRepository(BaseRepository[Vehicle]):
         vehicle = Vehicle(**payload)
         vehicle.sync_status()
         await self.create(vehicle)
+        snapshot = SummarySnapshotRepository(self.session)
+        await snapshot.record(None, await snapshot.contribution(vehicle))
         return vehicle
 
     async def update_vehicle(self, vehicle: Vehicle, data: dict) -> Vehicle:
+        snapshot = SummarySnapshotRepository(self.session)
+        before = await snapshot.contribution(vehicle)
         sanitized = self._sanitize_payload(data)
         for key, value in sanitized.items():
             if hasattr(vehicle, key) and value is not None:
                 setattr(vehicle, key, value)
         vehicle.sync_status()
         await self.session.flush()
+        await snapshot.record(before, await snapshot.contribution(vehicle))
         return vehicle
 
     async def sell_vehicle(self, vehicle: Vehicle, payload: VehicleSell) -> Vehicle:
+        snapshot = SummarySnapshotRepository(self.session)
+        before = await snapshot.contribution(vehicle)
         vehicle.sale_date = payload.sale_date
         vehicle.sale_price = Decimal(payload.sale_price)
         vehicle.sale_fees = Decimal(payload.sale_fees)
         vehicle.current_driver_id = None
         vehicle.sync_status()
         await self.session.flush()
+        await snapshot.record(before, await snapshot.contribution(vehicle))
         return vehicle
 
+    async def delete(self, vehicle: Vehicle) -> None:
+        # Expenses, rentals and their payments are removed by cascade.
+        snapshot = SummarySnapshotRepository(self.session)
+        payments = (
+            await self.session.execute(
+                select(RentPayment).join(Rental).where(Rental.vehicle_id == vehicle.id)
+            )
+        ).scalars().all()
+        expenses = (
+            await self.session.execute(select(Expense).where(Expense.vehicle_id == vehicle.id))
+        ).scalars().all()
+        before = await snapshot.contributions([vehicle, *expenses, *payments])
+        await super().delete(vehicle)
+        await self.session.flush()
+        await snapshot.record(before, None)
+
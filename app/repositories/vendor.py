@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy import select
 
@@ -12,17 +12,25 @@ from .base import BaseRepository
 class VendorRepository(BaseRepository[Vendor]):
     model = Vendor
 
-    async def list_vendors(
-        self,
-        params: PaginationParams,
+    @staticmethod
+    def list_filters(
         type: Optional[VendorType] = None,
         name: Optional[str] = None,
-    ) -> PaginatedResult[Vendor]:
+    ) -> list[Any]:
         filters = []
         if type:
             filters.append(Vendor.type == type)
         if name:
             filters.append(Vendor.name.ilike(f"%{name}%"))
+        return filters
+
+    async def list_vendors(
+        self,
+        params: PaginationParams,
+        type: Optional[VendorType] = None,
+        name: Optional[str] = None,
+    ) -> PaginatedResult[Vendor]:
+        filters = self.list_filters(type=type, name=name)
         return await super().list(params, filters=filters)
 
     async def create_vendor(self, data: dict) -> Vendor:
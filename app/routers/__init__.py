@@ -1,6 +1,7 @@
-﻿from . import auth, vehicles, drivers, vendors, partners, expenses, rentals, rent_payments, capital, cash, summary, billing, documents
+﻿from . import analytics, auth, vehicles, drivers, vendors, partners, expenses, rentals, rent_payments, capital, cash, summary, billing, documents, reports, search
 
 __all__ = [
+    "analytics",
     "auth",
     "vehicles",
     "drivers",
@@ -14,4 +15,6 @@ __all__ = [
     "summary",
     "billing",
     "documents",
+    "reports",
+    "search",
 ]
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config import settings
+from ..db import get_session_factory
+from ..services.analytics_export import (
+    ANALYTICS_EXTENSIONS,
+    ANALYTICS_MEDIA_TYPES,
+    AnalyticsExportUnavailable,
+    AnalyticsFormat,
+    AnalyticsTableName,
+    analytics_chunks,
+    require_pyarrow,
+)
+from ..services.security import get_current_active_user
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/export")
+async def export_analytics(
+    table: AnalyticsTableName,
+    format: AnalyticsFormat = Query(default="parquet"),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    try:
+        require_pyarrow()
+    except AnalyticsExportUnavailable as exc:
+        raise HTTPException(status_code=501, detail=str(exc)) from exc
+    return StreamingResponse(
+        analytics_chunks(session_factory, table, format, start_date, end_date, settings.analytics_batch_size),
+        media_type=ANALYTICS_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{ANALYTICS_EXTENSIONS[format]}"'},
+    )
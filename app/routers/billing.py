@@ -1,23 +1,64 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import settings
 from ..db import get_db
+from ..schemas.billing import BillingForecastResponse
 from ..services.billing import generate_weekly_charges
-from ..services.security import get_current_admin
+from ..services.billing_forecast import forecast_charges
+from ..services.late_fees import apply_late_fees
+from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix="/billing", tags=["billing"])
 
 
 @router.post("/run", response_model=dict)
 async def run_billing(
+    since: Optional[date] = Query(default=None, alias="from"),
+    until: Optional[date] = Query(default=None, alias="to"),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_admin),
 ) -> dict:
-    created = await generate_weekly_charges(session, today=date.today())
+    today = date.today()
+    if since is None and until is not None:
+        raise HTTPException(status_code=400, detail="'to' requires 'from'")
+    if since is not None:
+        until = until or today
+        if since > until:
+            raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+        if until > today:
+            raise HTTPException(status_code=400, detail="Cannot bill future days")
+        if (until - since).days + 1 > settings.billing_backfill_max_days:
+            raise HTTPException(status_code=400, detail="Backfill range too long")
+    created = await generate_weekly_charges(session, today=today, since=since, until=until)
     await session.commit()
     return {"generated": list(created)}
 
+
+@router.post("/late-fees", response_model=dict)
+async def run_late_fees(
+    session: AsyncSession = Depends(get_db),
+    _: None = Depends(get_current_admin),
+) -> dict:
+    updated = await apply_late_fees(session)
+    await session.commit()
+    return {"updated": updated}
+
+
+@router.get("/forecast", response_model=BillingForecastResponse)
+async def billing_forecast(
+    weeks: int = Query(default=4, ge=1),
+    start_date: Optional[date] = Query(default=None),
+    session: AsyncSession = Depends(get_db),
+    _: None = Depends(get_current_active_user),
+) -> BillingForecastResponse:
+    if weeks > settings.billing_forecast_max_weeks:
+        raise HTTPException(status_code=400, detail="Forecast horizon too long")
+    payload = await forecast_charges(session, weeks, start=start_date)
+    await session.commit()
+    return payload
@@ -4,20 +4,23 @@ from datetime import date
 from typing import Optional
 
 from fastapi import Response, APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import get_db
-from ..dependencies import get_pagination_params
+from ..db import get_db, get_session_factory
+from ..dependencies import get_export_params, get_pagination_params
 from ..models.capital import CapitalType
 from ..repositories.capital import CapitalRepository
 from ..schemas.capital import CapitalCreate, CapitalRead, CapitalUpdate
-from ..schemas.common import PaginationParams
+from ..schemas.common import ExportParams, Page, PaginationParams
+from ..services.export import export_response
+from ..services.pages import page_response
 from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix="/capital", tags=["capital"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=Page[CapitalRead])
 async def list_capital_entries(
     pagination: PaginationParams = Depends(get_pagination_params),
     partner: Optional[str] = Query(default=None),
@@ -26,7 +29,7 @@ async def list_capital_entries(
     end_date: Optional[date] = Query(default=None),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> dict:
+) -> Response:
     repo = CapitalRepository(session)
     result = await repo.list_capital(
         pagination,
@@ -35,14 +38,23 @@ async def list_capital_entries(
         start_date=start_date,
         end_date=end_date,
     )
-    items = [CapitalRead.model_validate(entry) for entry in result.items]
+    response = page_response(result, pagination, CapitalRead)
     await session.commit()
-    return {
-        "total": result.total,
-        "page": result.page,
-        "page_size": result.page_size,
-        "items": items,
-    }
+    return response
+
+
+@router.get("/export")
+async def export_capital_entries(
+    export: ExportParams = Depends(get_export_params),
+    partner: Optional[str] = Query(default=None),
+    type: Optional[CapitalType] = Query(default=None),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    filters = CapitalRepository.list_filters(partner=partner, type=type, start_date=start_date, end_date=end_date)
+    return export_response(session_factory, CapitalRepository, filters, export.format, export.fields, "capital")
 
 
 @router.post("", response_model=CapitalRead, status_code=status.HTTP_201_CREATED)
@@ -4,20 +4,23 @@ from datetime import date
 from typing import Optional
 
 from fastapi import Response, APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import get_db
-from ..dependencies import get_pagination_params
+from ..db import get_db, get_session_factory
+from ..dependencies import get_export_params, get_pagination_params
 from ..models.cash import CashTxnType
 from ..repositories.cash import CashRepository
 from ..schemas.cash import CashTxnCreate, CashTxnRead, CashTxnUpdate
-from ..schemas.common import PaginationParams
+from ..schemas.common import ExportParams, Page, PaginationParams
+from ..services.export import export_response
+from ..services.pages import page_response
 from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix="/cash", tags=["cash"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=Page[CashTxnRead])
 async def list_cash_txns(
     pagination: PaginationParams = Depends(get_pagination_params),
     type: Optional[CashTxnType] = Query(default=None),
@@ -26,7 +29,7 @@ async def list_cash_txns(
     end_date: Optional[date] = Query(default=None),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> dict:
+) -> Response:
     repo = CashRepository(session)
     result = await repo.list_txns(
         pagination,
@@ -35,14 +38,23 @@ async def list_cash_txns(
         start_date=start_date,
         end_date=end_date,
     )
-    items = [CashTxnRead.model_validate(txn) for txn in result.items]
+    response = page_response(result, pagination, CashTxnRead)
     await session.commit()
-    return {
-        "total": result.total,
-        "page": result.page,
-        "page_size": result.page_size,
-        "items": items,
-    }
+    return response
+
+
+@router.get("/export")
+async def export_cash_txns(
+    export: ExportParams = Depends(get_export_params),
+    type: Optional[CashTxnType] = Query(default=None),
+    category: Optional[str] = Query(default=None),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    filters = CashRepository.list_filters(type=type, category=category, start_date=start_date, end_date=end_date)
+    return export_response(session_factory, CashRepository, filters, export.format, export.fields, "cash")
 
 
 @router.post("", response_model=CashTxnRead, status_code=status.HTTP_201_CREATED)
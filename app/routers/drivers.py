@@ -3,37 +3,47 @@ from __future__ import annotations
 from typing import Optional
 
 from fastapi import Response, APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import get_db
-from ..dependencies import get_pagination_params
+from ..db import get_db, get_session_factory
+from ..dependencies import get_export_params, get_pagination_params
 from ..models.driver import DriverStatus
 from ..repositories.driver import DriverRepository
 from ..schemas.driver import DriverCreate, DriverRead, DriverUpdate
-from ..schemas.common import PaginationParams
+from ..schemas.common import ExportParams, Page, PaginationParams
+from ..services.export import export_response
+from ..services.pages import page_response
 from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix="/drivers", tags=["drivers"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=Page[DriverRead])
 async def list_drivers(
     pagination: PaginationParams = Depends(get_pagination_params),
     status: Optional[DriverStatus] = Query(default=None),
     name: Optional[str] = Query(default=None),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> dict:
+) -> Response:
     repo = DriverRepository(session)
     result = await repo.list_drivers(pagination, status=status, name=name)
-    items = [DriverRead.model_validate(driver) for driver in result.items]
+    response = page_response(result, pagination, DriverRead)
     await session.commit()
-    return {
-        "total": result.total,
-        "page": result.page,
-        "page_size": result.page_size,
-        "items": items,
-    }
+    return response
+
+
+@router.get("/export")
+async def export_drivers(
+    export: ExportParams = Depends(get_export_params),
+    status: Optional[DriverStatus] = Query(default=None),
+    name: Optional[str] = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    filters = DriverRepository.list_filters(status=status, name=name)
+    return export_response(session_factory, DriverRepository, filters, export.format, export.fields, "drivers")
 
 
 @router.post("", response_model=DriverRead, status_code=status.HTTP_201_CREATED)
@@ -4,20 +4,23 @@ from datetime import date
 from typing import Optional
 
 from fastapi import Response, APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import get_db
-from ..dependencies import get_pagination_params
+from ..db import get_db, get_session_factory
+from ..dependencies import get_export_params, get_pagination_params
 from ..models.expense import ExpenseCategory
 from ..repositories.expense import ExpenseRepository
-from ..schemas.common import PaginationParams
+from ..schemas.common import ExportParams, Page, PaginationParams
 from ..schemas.expense import ExpenseCreate, ExpenseRead, ExpenseUpdate
+from ..services.export import export_response
+from ..services.pages import page_response
 from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix="/expenses", tags=["expenses"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=Page[ExpenseRead])
 async def list_expenses(
     pagination: PaginationParams = Depends(get_pagination_params),
     vehicle_id: Optional[str] = Query(default=None),
@@ -26,7 +29,7 @@ async def list_expenses(
     end_date: Optional[date] = Query(default=None),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> dict:
+) -> Response:
     repo = ExpenseRepository(session)
     result = await repo.list_expenses(
         pagination,
@@ -35,14 +38,28 @@ async def list_expenses(
         start_date=start_date,
         end_date=end_date,
     )
-    items = [ExpenseRead.model_validate(expense) for expense in result.items]
+    response = page_response(result, pagination, ExpenseRead)
     await session.commit()
-    return {
-        "total": result.total,
-        "page": result.page,
-        "page_size": result.page_size,
-        "items": items,
-    }
+    return response
+
+
+@router.get("/export")
+async def export_expenses(
+    export: ExportParams = Depends(get_export_params),
+    vehicle_id: Optional[str] = Query(default=None),
+    category: Optional[ExpenseCategory] = Query(default=None),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    filters = ExpenseRepository.list_filters(
+        vehicle_id=vehicle_id,
+        category=category,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return export_response(session_factory, ExpenseRepository, filters, export.format, export.fields, "expenses")
 
 
 @router.post("", response_model=ExpenseRead, status_code=status.HTTP_201_CREATED)
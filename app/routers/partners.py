@@ -3,35 +3,44 @@ from __future__ import annotations
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import get_db
-from ..dependencies import get_pagination_params
+from ..db import get_db, get_session_factory
+from ..dependencies import get_export_params, get_pagination_params
 from ..repositories.partner import PartnerRepository
-from ..schemas.common import PaginationParams
+from ..schemas.common import ExportParams, Page, PaginationParams
 from ..schemas.partner import PartnerCreate, PartnerRead, PartnerUpdate
+from ..services.export import export_response
+from ..services.pages import page_response
 from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix='/partners', tags=['partners'])
 
 
-@router.get('', response_model=dict)
+@router.get('', response_model=Page[PartnerRead])
 async def list_partners(
     pagination: PaginationParams = Depends(get_pagination_params),
     name: Optional[str] = Query(default=None),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> dict:
+) -> Response:
     repo = PartnerRepository(session)
     result = await repo.list_partners(pagination, name=name)
-    items = [PartnerRead.model_validate(item) for item in result.items]
+    response = page_response(result, pagination, PartnerRead)
     await session.commit()
-    return {
-        'total': result.total,
-        'page': result.page,
-        'page_size': result.page_size,
-        'items': items,
-    }
+    return response
+
+
+@router.get('/export')
+async def export_partners(
+    export: ExportParams = Depends(get_export_params),
+    name: Optional[str] = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    filters = PartnerRepository.list_filters(name=name)
+    return export_response(session_factory, PartnerRepository, filters, export.format, export.fields, 'partners')
 
 
 @router.post('', response_model=PartnerRead, status_code=status.HTTP_201_CREATED)
@@ -1,45 +1,72 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import NoReturn, Optional
 
 from fastapi import Response, APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import get_db
-from ..dependencies import get_pagination_params
+from ..db import get_db, get_session_factory
+from ..dependencies import get_export_params, get_pagination_params
 from ..repositories.rent_payment import RentPaymentRepository
 from ..repositories.rental import RentalRepository
-from ..schemas.common import PaginationParams
+from ..schemas.common import ExportParams, Page, PaginationParams
 from ..schemas.rent_payment import (
     RentPaymentCreate,
     RentPaymentGenerate,
     RentPaymentRead,
     RentPaymentUpdate,
 )
+from ..services.export import export_response
+from ..services.pages import page_response
 from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix="/rent-payments", tags=["rent-payments"])
 
 
-@router.get("", response_model=dict)
+async def _raise_integrity_error(
+    repo: RentPaymentRepository,
+    exc: IntegrityError,
+    rental_id: str,
+    period_start: date,
+    period_end: date,
+    exclude_id: Optional[str] = None,
+) -> NoReturn:
+    """Report a duplicate period as such; other constraint failures stay generic."""
+    if await repo.period_exists(rental_id, period_start, period_end, exclude_id=exclude_id):
+        raise HTTPException(status_code=400, detail="Payment for period already exists") from exc
+    raise HTTPException(status_code=400, detail="Invalid rent payment") from exc
+
+
+@router.get("", response_model=Page[RentPaymentRead])
 async def list_rent_payments(
     pagination: PaginationParams = Depends(get_pagination_params),
     rental_id: Optional[str] = Query(default=None),
     open_only: bool = Query(default=False),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> dict:
+) -> Response:
     repo = RentPaymentRepository(session)
     result = await repo.list_payments(pagination, rental_id=rental_id, open_only=open_only)
-    items = [RentPaymentRead.model_validate(payment) for payment in result.items]
+    response = page_response(result, pagination, RentPaymentRead)
     await session.commit()
-    return {
-        "total": result.total,
-        "page": result.page,
-        "page_size": result.page_size,
-        "items": items,
-    }
+    return response
+
+
+@router.get("/export")
+async def export_rent_payments(
+    export: ExportParams = Depends(get_export_params),
+    rental_id: Optional[str] = Query(default=None),
+    open_only: bool = Query(default=False),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    filters = RentPaymentRepository.list_filters(rental_id=rental_id, open_only=open_only)
+    return export_response(
+        session_factory, RentPaymentRepository, filters, export.format, export.fields, "rent-payments"
+    )
 
 
 @router.post("", response_model=RentPaymentRead, status_code=status.HTTP_201_CREATED)
@@ -49,8 +76,14 @@ async def create_rent_payment(
     _: None = Depends(get_current_admin),
 ) -> RentPaymentRead:
     repo = RentPaymentRepository(session)
-    payment = await repo.create_payment(payload.model_dump(exclude_none=True))
-    await session.commit()
+    if not await RentalRepository(session).get(payload.rental_id):
+        raise HTTPException(status_code=404, detail="Rental not found")
+    try:
+        payment = await repo.create_payment(payload.model_dump(exclude_none=True))
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        await _raise_integrity_error(repo, exc, payload.rental_id, payload.period_start, payload.period_end)
     return RentPaymentRead.model_validate(payment)
 
 
@@ -79,8 +112,15 @@ async def update_rent_payment(
     payment = await repo.get(payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Rent payment not found")
-    updated = await repo.update_payment(payment, payload.model_dump(exclude_none=True))
-    await session.commit()
+    rental_id = payment.rental_id
+    period_start = payload.period_start or payment.period_start
+    period_end = payload.period_end or payment.period_end
+    try:
+        updated = await repo.update_payment(payment, payload.model_dump(exclude_none=True))
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        await _raise_integrity_error(repo, exc, rental_id, period_start, period_end, exclude_id=payment_id)
     return RentPaymentRead.model_validate(updated)
 
 
@@ -106,22 +146,23 @@ async def generate_weekly_payment(
     _: None = Depends(get_current_admin),
 ) -> RentPaymentRead:
     repo = RentPaymentRepository(session)
-    if await repo.exists_for_period(payload.rental_id, payload.period_start, payload.period_end):
-        raise HTTPException(status_code=400, detail="Payment for period already exists")
     rental_repo = RentalRepository(session)
     rental = await rental_repo.get(payload.rental_id)
     if not rental:
         raise HTTPException(status_code=404, detail="Rental not found")
-    payment = await repo.create_payment(
-        {
-            "rental_id": payload.rental_id,
-            "period_start": payload.period_start,
-            "period_end": payload.period_end,
-            "weekly_rate": rental.weekly_rate,
-            "paid_amount": 0,
-            "late_fee": 0,
-        }
+    created = await repo.bulk_create_payments(
+        [
+            {
+                "rental_id": payload.rental_id,
+                "period_start": payload.period_start,
+                "period_end": payload.period_end,
+                "weekly_rate": rental.weekly_rate,
+            }
+        ]
     )
+    if not created:
+        raise HTTPException(status_code=400, detail="Payment for period already exists")
+    payment = await repo.get(created[0])
     await session.commit()
     return RentPaymentRead.model_validate(payment)
 
@@ -3,20 +3,23 @@ from __future__ import annotations
 from typing import Optional
 
 from fastapi import Response, APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import get_db
-from ..dependencies import get_pagination_params
+from ..db import get_db, get_session_factory
+from ..dependencies import get_export_params, get_pagination_params
 from ..models.rental import RentalStatus
 from ..repositories.rental import RentalRepository
-from ..schemas.common import PaginationParams
+from ..schemas.common import ExportParams, Page, PaginationParams
 from ..schemas.rental import RentalClose, RentalCreate, RentalRead, RentalUpdate
+from ..services.export import export_response
+from ..services.pages import page_response
 from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix="/rentals", tags=["rentals"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=Page[RentalRead])
 async def list_rentals(
     pagination: PaginationParams = Depends(get_pagination_params),
     status: Optional[RentalStatus] = Query(default=None),
@@ -24,7 +27,7 @@ async def list_rentals(
     vehicle_id: Optional[str] = Query(default=None),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> dict:
+) -> Response:
     repo = RentalRepository(session)
     result = await repo.list_rentals(
         pagination,
@@ -32,14 +35,22 @@ async def list_rentals(
         driver_id=driver_id,
         vehicle_id=vehicle_id,
     )
-    items = [RentalRead.model_validate(rental) for rental in result.items]
+    response = page_response(result, pagination, RentalRead)
     await session.commit()
-    return {
-        "total": result.total,
-        "page": result.page,
-        "page_size": result.page_size,
-        "items": items,
-    }
+    return response
+
+
+@router.get("/export")
+async def export_rentals(
+    export: ExportParams = Depends(get_export_params),
+    status: Optional[RentalStatus] = Query(default=None),
+    driver_id: Optional[str] = Query(default=None),
+    vehicle_id: Optional[str] = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    filters = RentalRepository.list_filters(status=status, driver_id=driver_id, vehicle_id=vehicle_id)
+    return export_response(session_factory, RentalRepository, filters, export.format, export.fields, "rentals")
 
 
 @router.post("", response_model=RentalRead, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import get_db
+from ..dependencies import get_pagination_params
+from ..models.vehicle import VehicleStatus
+from ..repositories.vehicle import VehicleRepository
+from ..schemas.common import Page, PaginationParams
+from ..schemas.report import FleetProfitabilityRow
+from ..services.pages import page_response
+from ..services.security import get_current_active_user
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+@router.get("/fleet-profitability", response_model=Page[FleetProfitabilityRow])
+async def fleet_profitability(
+    pagination: PaginationParams = Depends(get_pagination_params),
+    status: Optional[VehicleStatus] = Query(default=None),
+    make: Optional[str] = Query(default=None),
+    model: Optional[str] = Query(default=None),
+    session: AsyncSession = Depends(get_db),
+    _: None = Depends(get_current_active_user),
+) -> Response:
+    repo = VehicleRepository(session)
+    result = await repo.profitability_report(pagination, status=status, make=make, model=model)
+    response = page_response(result, pagination, FleetProfitabilityRow)
+    await session.commit()
+    return response
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import get_db
+from ..schemas.search import SearchEntityType, SearchHit, SearchResponse
+from ..services.search import search as run_search
+from ..services.security import get_current_active_user
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(min_length=1, max_length=100),
+    types: Optional[list[SearchEntityType]] = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    session: AsyncSession = Depends(get_db),
+    _: None = Depends(get_current_active_user),
+) -> SearchResponse:
+    entries = await run_search(session, q, entity_types=types, limit=limit)
+    await session.commit()
+    return SearchResponse(query=q, items=[SearchHit.model_validate(entry) for entry in entries])
@@ -1,22 +1,77 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import Optional
 
-from ..db import get_db
-from ..schemas.summary import SummaryResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config import settings
+from ..db import get_db, get_session_factory
+from ..schemas.summary import SeriesGranularity, SummaryResponse, SummarySeriesResponse
+from ..services.periods import bucket_count
 from ..services.security import get_current_active_user
-from ..services.summary import get_summary
+from ..services.summary import (
+    default_series_start,
+    get_cached_summary,
+    get_summary_series,
+)
+from ..services.summary_stream import summary_events
 
 router = APIRouter(prefix="/summary", tags=["summary"])
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 @router.get("", response_model=SummaryResponse)
 async def summary(
+    request: Request,
+    as_of: Optional[date] = Query(default=None),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> SummaryResponse:
-    payload = await get_summary(session)
+) -> Response:
+    if as_of is not None and as_of > date.today():
+        raise HTTPException(status_code=400, detail="as_of cannot be in the future")
+    entry = await get_cached_summary(session, as_of=as_of)
     await session.commit()
-    return payload
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@router.get("/stream")
+async def summary_stream(
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    return StreamingResponse(
+        summary_events(session_factory),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
+@router.get("/series", response_model=SummarySeriesResponse)
+async def summary_series(
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    granularity: SeriesGranularity = Query(default=SeriesGranularity.MONTH),
+    session: AsyncSession = Depends(get_db),
+    _: None = Depends(get_current_active_user),
+) -> SummarySeriesResponse:
+    end_date = end_date or date.today()
+    start_date = start_date or default_series_start(end_date)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    if bucket_count(start_date, end_date, granularity) > settings.summary_series_max_points:
+        raise HTTPException(status_code=400, detail="Too many points for the requested range")
+    payload = await get_summary_series(session, start_date, end_date, granularity)
+    await session.commit()
+    return payload
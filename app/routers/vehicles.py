@@ -4,17 +4,20 @@ from typing import Optional
 
 from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import get_db
-from ..dependencies import get_pagination_params
+from ..db import get_db, get_session_factory
+from ..dependencies import get_export_params, get_pagination_params
 from ..models.vehicle import VehicleStatus
 from ..repositories.vehicle import VehicleRepository
-from ..schemas.common import PaginatedResult, PaginationParams
+from ..schemas.common import ExportParams, Page, PaginatedResult, PaginationParams
 from ..schemas.expense import ExpenseRead
 from ..schemas.rent_payment import RentPaymentRead
 from ..schemas.vehicle import VehicleCreate, VehicleFinancialSummary, VehicleRead, VehicleRentalSummary, VehicleSell, VehicleUpdate
+from ..services.export import export_response
+from ..services.pages import page_response
 from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix="/vehicles", tags=["vehicles"])
@@ -25,7 +28,7 @@ def serialize_vehicle(vehicle) -> VehicleRead:
     return VehicleRead.model_validate(vehicle)
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=Page[VehicleRead])
 async def list_vehicles(
     pagination: PaginationParams = Depends(get_pagination_params),
     status: Optional[VehicleStatus] = Query(default=None),
@@ -38,7 +41,7 @@ async def list_vehicles(
     sold: Optional[bool] = Query(default=None),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> dict:
+) -> Response:
     repo = VehicleRepository(session)
     result: PaginatedResult = await repo.list_vehicles(
         pagination,
@@ -51,14 +54,36 @@ async def list_vehicles(
         rented=rented,
         sold=sold,
     )
-    items = [serialize_vehicle(vehicle) for vehicle in result.items]
+    response = page_response(result, pagination, VehicleRead)
     await session.commit()
-    return {
-        "total": result.total,
-        "page": result.page,
-        "page_size": result.page_size,
-        "items": items,
-    }
+    return response
+
+
+@router.get("/export")
+async def export_vehicles(
+    export: ExportParams = Depends(get_export_params),
+    status: Optional[VehicleStatus] = Query(default=None),
+    make: Optional[str] = Query(default=None),
+    model: Optional[str] = Query(default=None),
+    year_from: Optional[int] = Query(default=None),
+    year_to: Optional[int] = Query(default=None),
+    in_stock: Optional[bool] = Query(default=None),
+    rented: Optional[bool] = Query(default=None),
+    sold: Optional[bool] = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    filters = VehicleRepository.list_filters(
+        status=status,
+        make=make,
+        model=model,
+        year_from=year_from,
+        year_to=year_to,
+        in_stock=in_stock,
+        rented=rented,
+        sold=sold,
+    )
+    return export_response(session_factory, VehicleRepository, filters, export.format, export.fields, "vehicles")
 
 
 @router.post("", response_model=VehicleRead, status_code=status.HTTP_201_CREATED)
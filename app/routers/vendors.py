@@ -3,37 +3,47 @@ from __future__ import annotations
 from typing import Optional
 
 from fastapi import Response, APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import get_db
-from ..dependencies import get_pagination_params
+from ..db import get_db, get_session_factory
+from ..dependencies import get_export_params, get_pagination_params
 from ..models.vendor import VendorType
 from ..repositories.vendor import VendorRepository
-from ..schemas.common import PaginationParams
+from ..schemas.common import ExportParams, Page, PaginationParams
 from ..schemas.vendor import VendorCreate, VendorRead, VendorUpdate
+from ..services.export import export_response
+from ..services.pages import page_response
 from ..services.security import get_current_active_user, get_current_admin
 
 router = APIRouter(prefix="/vendors", tags=["vendors"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=Page[VendorRead])
 async def list_vendors(
     pagination: PaginationParams = Depends(get_pagination_params),
     type: Optional[VendorType] = Query(default=None),
     name: Optional[str] = Query(default=None),
     session: AsyncSession = Depends(get_db),
     _: None = Depends(get_current_active_user),
-) -> dict:
+) -> Response:
     repo = VendorRepository(session)
     result = await repo.list_vendors(pagination, type=type, name=name)
-    items = [VendorRead.model_validate(vendor) for vendor in result.items]
+    response = page_response(result, pagination, VendorRead)
     await session.commit()
-    return {
-        "total": result.total,
-        "page": result.page,
-        "page_size": result.page_size,
-        "items": items,
-    }
+    return response
+
+
+@router.get("/export")
+async def export_vendors(
+    export: ExportParams = Depends(get_export_params),
+    type: Optional[VendorType] = Query(default=None),
+    name: Optional[str] = Query(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(get_current_active_user),
+) -> StreamingResponse:
+    filters = VendorRepository.list_filters(type=type, name=name)
+    return export_response(session_factory, VendorRepository, filters, export.format, export.fields, "vendors")
 
 
 @router.post("", response_model=VendorRead, status_code=status.HTTP_201_CREATED)
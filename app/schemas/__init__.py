@@ -13,7 +13,10 @@ from .rent_payment import (
 from .capital import CapitalCreate, CapitalRead, CapitalUpdate
 from .cash import CashTxnCreate, CashTxnRead, CashTxnUpdate
 from .auth import UserCreate, UserRead, UserLogin, Token, TokenData
-from .summary import SummaryResponse
+from .report import FleetProfitabilityRow
+from .billing import BillingForecastResponse
+from .summary import SeriesGranularity, SummaryResponse, SummarySeriesResponse
+from .search import SearchHit, SearchResponse
 from .document import DocumentRead, DocumentList, DocumentDeleteResponse
 from .common import PaginatedResult, PaginationParams
 
@@ -53,7 +56,13 @@ __all__ = [
     "UserLogin",
     "Token",
     "TokenData",
+    "FleetProfitabilityRow",
+    "BillingForecastResponse",
+    "SeriesGranularity",
     "SummaryResponse",
+    "SummarySeriesResponse",
+    "SearchHit",
+    "SearchResponse",
     "DocumentRead",
     "DocumentList",
     "DocumentDeleteResponse",
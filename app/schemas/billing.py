@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from ..models.rental import BillingDay
+
+
+class BillingForecastWeek(BaseModel):
+    week_start: date
+    week_end: date
+    charges: int
+    total: Decimal
+
+
+class BillingForecastRental(BaseModel):
+    rental_id: str
+    driver_id: str
+    vehicle_id: str
+    billing_day: BillingDay
+    weekly_rate: Decimal
+    charges: int
+    total: Decimal
+    first_charge: Optional[date]
+    last_charge: Optional[date]
+
+
+class BillingForecastDriver(BaseModel):
+    driver_id: str
+    charges: int
+    total: Decimal
+
+
+class BillingForecastVehicle(BaseModel):
+    vehicle_id: str
+    charges: int
+    total: Decimal
+
+
+class BillingForecastResponse(BaseModel):
+    start_date: date
+    end_date: date
+    charges: int
+    total: Decimal
+    weeks: List[BillingForecastWeek]
+    rentals: List[BillingForecastRental]
+    drivers: List[BillingForecastDriver]
+    vehicles: List[BillingForecastVehicle]
+
+    model_config = {
+        "json_encoders": {Decimal: lambda v: str(v)},
+    }
@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Generic, Optional, TypeVar
+from functools import lru_cache
+from typing import Any, Generic, Literal, Optional, TypeVar
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, TypeAdapter, field_validator
 
 
 T = TypeVar("T")
 
+TotalMode = Literal["exact", "estimated", "cached", "none"]
+ExportFormat = Literal["csv", "ndjson"]
+
 
 class PaginationParams(BaseModel):
     page: int = 1
     page_size: int = 25
     order_by: Optional[str] = None
     order_dir: str = "asc"
+    # Opaque keyset cursor; any value, even empty, switches listing to cursor mode.
+    cursor: Optional[str] = None
+    # How ``total`` is computed; "none" skips the count and only reports ``has_more``.
+    total_mode: TotalMode = "exact"
+    # Columns to return; items become plain dicts instead of ORM objects.
+    fields: Optional[list[str]] = None
 
     @field_validator("page", "page_size")
     @classmethod
@@ -30,21 +40,40 @@ class PaginationParams(BaseModel):
         return v
 
 
+class ExportParams(BaseModel):
+    format: ExportFormat = "csv"
+    fields: Optional[list[str]] = None
+
+
 class PaginatedResult(BaseModel, Generic[T]):
-    total: int
+    total: Optional[int]
     items: list[T]
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+    has_more: Optional[bool] = None
 
 
-class DecimalModel(BaseModel):
-    @field_validator("*", mode="before")
-    @classmethod
-    def ensure_decimal(cls, v):  # type: ignore[no-untyped-def]
-        if isinstance(v, float):
-            return Decimal(str(v))
-        return v
+class Page(BaseModel, Generic[T]):
+    """Body of a list response; rendered straight to JSON by ``app.services.pages``."""
+
+    total: Optional[int]
+    page: int
+    page_size: int
+    next_cursor: Optional[str] = None
+    has_more: Optional[bool] = None
+    items: list[T]
+
 
+@lru_cache(maxsize=None)
+def list_adapter(model: Any) -> TypeAdapter[list[Any]]:
+    """Cached ``TypeAdapter(list[model])``, so a page is validated in one call."""
+    return TypeAdapter(list[model])
+
+
+class DecimalModel(BaseModel):
+    # Floats need no validator: pydantic turns them into Decimals through their shortest
+    # repr (0.1 -> Decimal("0.1")), as Decimal(str(v)) would.
     model_config = {
         "json_encoders": {Decimal: lambda v: str(v)},
         "from_attributes": True,
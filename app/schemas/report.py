@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+from ..models.vehicle import VehicleStatus
+
+
+class FleetProfitabilityRow(BaseModel):
+    id: str
+    plate: str
+    make: str
+    model: str
+    status: VehicleStatus
+    acquisition_price: Decimal
+    total_expenses: Decimal
+    total_cost: Decimal
+    rent_due: Decimal
+    rent_collected: Decimal
+    late_fees: Decimal
+    sale_net: Optional[Decimal]
+    total_income: Decimal
+    profit: Decimal
+    roi: Optional[Decimal]
+
+    model_config = {
+        "from_attributes": True,
+        "json_encoders": {Decimal: lambda v: str(v)},
+    }
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+SearchEntityType = Literal["vehicle", "driver", "vendor", "partner"]
+
+
+class SearchHit(BaseModel):
+    entity_type: SearchEntityType
+    entity_id: str
+    label: str
+
+    model_config = {"from_attributes": True}
+
+
+class SearchResponse(BaseModel):
+    query: str
+    items: list[SearchHit]
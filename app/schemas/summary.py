@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+from datetime import date
 from decimal import Decimal
+from enum import Enum
 from typing import List
 
 from pydantic import BaseModel
 
 
+class SeriesGranularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    QUARTER = "quarter"
+
+
 class SummaryVehicleStatus(BaseModel):
     status: str
     count: int
@@ -49,3 +58,23 @@ class SummaryResponse(BaseModel):
     model_config = {
         "json_encoders": {Decimal: lambda v: str(v)},
     }
+
+
+class SummarySeriesPoint(BaseModel):
+    label: str
+    start: date
+    end: date
+    rent_due: Decimal
+    rent_collected: Decimal
+    expenses: Decimal
+
+
+class SummarySeriesResponse(BaseModel):
+    granularity: SeriesGranularity
+    start_date: date
+    end_date: date
+    points: List[SummarySeriesPoint]
+
+    model_config = {
+        "json_encoders": {Decimal: lambda v: str(v)},
+    }
@@ -0,0 +1,158 @@
+"""Benchmark the serialization of a list page.
+
+Loads one 200-row page per resource from an in-memory SQLite database and times only
+turning it into a JSON body, two ways:
+
+* legacy: ``Read.model_validate`` per item (with the former ``"*"`` float validator of
+  ``DecimalModel``), a plain ``dict`` and FastAPI's ``jsonable_encoder`` + ``json.dumps``;
+* page_response: one cached ``TypeAdapter`` call and ``Page.model_dump_json``.
+
+    python -m app.scripts.bench_list --rows 200 --repeat 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import create_model, field_validator
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ..db import Base
+from ..models.cash import CashTxn, CashTxnType
+from ..models.expense import Expense, ExpenseCategory
+from ..models.vehicle import Vehicle, VehicleStatus
+from ..repositories.cash import CashRepository
+from ..repositories.expense import ExpenseRepository
+from ..repositories.vehicle import VehicleRepository
+from ..schemas.cash import CashTxnRead
+from ..schemas.common import PaginatedResult, PaginationParams
+from ..schemas.expense import ExpenseRead
+from ..schemas.vehicle import VehicleRead
+from ..services.pages import page_response
+
+
+async def _seed(session: AsyncSession, rows: int) -> None:
+    rng = random.Random(42)
+    start = date(2024, 1, 1)
+    vehicles, expenses, cash = [], [], []
+    for index in range(rows):
+        vehicle_id = f"CAR-{index:06d}"
+        vehicles.append(
+            {
+                "id": vehicle_id,
+                "plate": f"BEN{index:06d}",
+                "renavam": f"R{index:010d}",
+                "vin": f"V{index:016d}",
+                "model_year": 2020,
+                "manufacture_year": 2019,
+                "make": rng.choice(["Fiat", "VW", "Toyota", "Hyundai"]),
+                "model": "Bench",
+                "acquisition_date": start,
+                "acquisition_price": Decimal(rng.randint(20000, 80000)),
+                "status": VehicleStatus.STOCK,
+            }
+        )
+        for expense_index in range(3):
+            expenses.append(
+                {
+                    "id": f"EXP-{index:06d}{expense_index}",
+                    "vehicle_id": vehicle_id,
+                    "date": start + timedelta(days=expense_index),
+                    "category": rng.choice(list(ExpenseCategory)),
+                    "description": "Bench",
+                    "amount": Decimal(rng.randint(50, 3000)),
+                }
+            )
+        cash.append(
+            {
+                "id": f"CSH-{index:06d}",
+                "date": start + timedelta(days=index % 365),
+                "type": rng.choice(list(CashTxnType)),
+                "category": "Bench",
+                "amount": Decimal(rng.randint(10, 5000)) / 100,
+            }
+        )
+    await session.execute(insert(Vehicle), vehicles)
+    await session.execute(insert(Expense), expenses)
+    await session.execute(insert(CashTxn), cash)
+    await session.commit()
+
+
+def _legacy_float_validator(cls: Any, value: Any) -> Any:
+    if isinstance(value, float):
+        return Decimal(str(value))
+    return value
+
+
+@lru_cache(maxsize=None)
+def _legacy_model(read_model: Any) -> Any:
+    return create_model(
+        f"Legacy{read_model.__name__}",
+        __base__=read_model,
+        __validators__={"ensure_decimal": field_validator("*", mode="before")(_legacy_float_validator)},
+    )
+
+
+def _legacy_body(result: PaginatedResult[Any], read_model: Any) -> bytes:
+    legacy = _legacy_model(read_model)
+    content = {
+        "total": result.total,
+        "page": result.page,
+        "page_size": result.page_size,
+        "next_cursor": result.next_cursor,
+        "has_more": result.has_more,
+        "items": [legacy.model_validate(item) for item in result.items],
+    }
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _time_per_item(render: Callable[[], bytes], items: int, repeat: int) -> float:
+    render()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - started) * 1_000_000 / repeat / max(items, 1)
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200, help="page size, at most 200 as in the API")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with factory() as session:
+        await _seed(session, args.rows)
+
+    params = PaginationParams(page_size=args.rows)
+    print(f"rows={args.rows} repeat={args.repeat} (microseconds per item, serialization only)")
+    async with factory() as session:
+        pages: list[tuple[str, PaginatedResult[Any], Any]] = [
+            ("vehicles", await VehicleRepository(session).list_vehicles(params), VehicleRead),
+            ("expenses", await ExpenseRepository(session).list_expenses(params), ExpenseRead),
+            ("cash", await CashRepository(session).list_txns(params), CashTxnRead),
+        ]
+        for label, result, read_model in pages:
+            items = len(result.items)
+            legacy = _time_per_item(lambda: _legacy_body(result, read_model), items, args.repeat)
+            fast = _time_per_item(lambda: page_response(result, params, read_model).body, items, args.repeat)
+            print(f"{label:<10} legacy={legacy:>7.1f} us  page_response={fast:>7.1f} us  speedup={legacy / fast:>4.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
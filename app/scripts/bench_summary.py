@@ -0,0 +1,253 @@
+"""Benchmark the dashboard KPI queries.
+
+Compares the previous one-query-per-KPI approach with the consolidated statement used by
+``get_summary``. Runs against an in-memory SQLite database by default; ``--rtt-ms`` adds
+a simulated network round trip to every statement so the effect on a remote MySQL is
+visible locally. The simulated latency blocks the event loop, so the parallel scenario
+only shows its benefit against a real server passed with ``--database-url``.
+
+    python -m app.scripts.bench_summary --vehicles 2000 --rtt-ms 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import and_, event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ..db import Base
+from ..models.capital import CapitalEntry, CapitalType
+from ..models.cash import CashTxn, CashTxnType
+from ..models.driver import Driver, DriverStatus
+from ..models.expense import Expense, ExpenseCategory
+from ..models.rent_payment import RentPayment
+from ..models.rental import BillingDay, Rental, RentalStatus
+from ..models.vehicle import Vehicle, VehicleStatus
+from ..services.summary import _kpi_statement, get_summary
+
+
+async def _seed(session: AsyncSession, vehicles: int, today: date) -> None:
+    rng = random.Random(42)
+    vehicle_rows: list[dict[str, Any]] = []
+    driver_rows: list[dict[str, Any]] = []
+    rental_rows: list[dict[str, Any]] = []
+    payment_rows: list[dict[str, Any]] = []
+    expense_rows: list[dict[str, Any]] = []
+    cash_rows: list[dict[str, Any]] = []
+    for index in range(vehicles):
+        acquired = today - timedelta(days=rng.randint(30, 900))
+        status = rng.choice(list(VehicleStatus))
+        sold = status == VehicleStatus.SOLD
+        vehicle_id = f"CAR-{index:06d}"
+        vehicle_rows.append(
+            {
+                "id": vehicle_id,
+                "plate": f"BEN{index:06d}",
+                "renavam": f"R{index:010d}",
+                "vin": f"V{index:016d}",
+                "model_year": 2020,
+                "manufacture_year": 2019,
+                "make": rng.choice(["Fiat", "VW", "Toyota", "Hyundai"]),
+                "model": "Bench",
+                "acquisition_date": acquired,
+                "acquisition_price": Decimal(rng.randint(20000, 80000)),
+                "sale_date": acquired + timedelta(days=rng.randint(1, 29)) if sold else None,
+                "sale_price": Decimal(rng.randint(25000, 95000)) if sold else None,
+                "sale_fees": Decimal("500") if sold else None,
+                "status": status,
+            }
+        )
+        for expense_index in range(rng.randint(1, 6)):
+            expense_id = f"EXP-{index:06d}{expense_index}"
+            expense_date = acquired + timedelta(days=expense_index)
+            amount = Decimal(rng.randint(50, 3000))
+            expense_rows.append(
+                {
+                    "id": expense_id,
+                    "vehicle_id": vehicle_id,
+                    "date": expense_date,
+                    "category": rng.choice(list(ExpenseCategory)),
+                    "description": "Bench",
+                    "amount": amount,
+                }
+            )
+            cash_rows.append(
+                {
+                    "id": f"CSH-{index:06d}{expense_index}",
+                    "date": expense_date,
+                    "type": CashTxnType.OUTFLOW,
+                    "category": "Bench",
+                    "amount": amount,
+                }
+            )
+        if status == VehicleStatus.RENTED:
+            driver_id = f"DRV-{index:06d}"
+            rental_id = f"RENT-{index:06d}"
+            driver_rows.append(
+                {
+                    "id": driver_id,
+                    "name": "Bench",
+                    "cpf": f"{index:011d}",
+                    "start_date": acquired,
+                    "weekly_rate": Decimal("500"),
+                    "status": DriverStatus.ACTIVE,
+                }
+            )
+            rental_rows.append(
+                {
+                    "id": rental_id,
+                    "vehicle_id": vehicle_id,
+                    "driver_id": driver_id,
+                    "start_date": acquired,
+                    "weekly_rate": Decimal("500"),
+                    "billing_day": rng.choice(list(BillingDay)),
+                    "status": RentalStatus.ACTIVE,
+                }
+            )
+            for week in range(rng.randint(4, 52)):
+                period_start = acquired + timedelta(weeks=week)
+                paid = Decimal("500") if rng.random() < 0.8 else Decimal("0")
+                payment_rows.append(
+                    {
+                        "id": f"PAY-{index:06d}{week:02d}",
+                        "rental_id": rental_id,
+                        "period_start": period_start,
+                        "period_end": period_start + timedelta(days=6),
+                        "weekly_rate": Decimal("500"),
+                        "weeks": 1,
+                        "due_amount": Decimal("500"),
+                        "paid_amount": paid,
+                        "payment_date": period_start + timedelta(days=7) if paid else None,
+                        "late_fee": Decimal("0"),
+                    }
+                )
+    capital_rows = [
+        {
+            "id": f"CAP-{index:04d}",
+            "partner": f"Partner {index % 3}",
+            "date": today - timedelta(days=index),
+            "type": CapitalType.CONTRIBUTION if index % 4 else CapitalType.WITHDRAWAL,
+            "amount": Decimal("10000"),
+        }
+        for index in range(max(1, vehicles // 10))
+    ]
+    for model, rows in (
+        (Vehicle, vehicle_rows),
+        (Driver, driver_rows),
+        (Rental, rental_rows),
+        (RentPayment, payment_rows),
+        (Expense, expense_rows),
+        (CashTxn, cash_rows),
+        (CapitalEntry, capital_rows),
+    ):
+        if rows:
+            await session.execute(insert(model), rows)
+    await session.commit()
+
+
+async def _per_query_kpis(session: AsyncSession, today: date) -> None:
+    """The KPI block as it was issued before: one statement per figure."""
+    year_start = date(today.year, 1, 1)
+    await session.scalar(select(func.count()).where(Vehicle.status == VehicleStatus.STOCK))
+    await session.scalar(select(func.count()).where(Vehicle.status == VehicleStatus.RENTED))
+    await session.scalar(
+        select(func.count()).where(
+            and_(Vehicle.status == VehicleStatus.SOLD, Vehicle.sale_date >= year_start, Vehicle.sale_date <= today)
+        )
+    )
+    await session.scalar(
+        select(func.coalesce(func.sum(CapitalEntry.amount), 0)).where(CapitalEntry.type == CapitalType.CONTRIBUTION)
+    )
+    await session.scalar(
+        select(func.coalesce(func.sum(CapitalEntry.amount), 0)).where(CapitalEntry.type == CapitalType.WITHDRAWAL)
+    )
+    await session.scalar(
+        select(func.coalesce(func.sum(RentPayment.paid_amount), 0)).where(
+            and_(
+                RentPayment.payment_date.is_not(None),
+                RentPayment.payment_date >= year_start,
+                RentPayment.payment_date <= today,
+            )
+        )
+    )
+    (await session.execute(select(Vehicle.status, func.count()).group_by(Vehicle.status))).all()
+    await session.scalar(
+        select(func.coalesce(func.sum(CashTxn.amount), 0)).where(CashTxn.type == CashTxnType.INFLOW)
+    )
+    await session.scalar(
+        select(func.coalesce(func.sum(CashTxn.amount), 0)).where(CashTxn.type == CashTxnType.OUTFLOW)
+    )
+
+
+async def _single_statement_kpis(session: AsyncSession, today: date) -> None:
+    (await session.execute(_kpi_statement(today, date(today.year, 1, 1)))).one()
+
+
+async def _full_summary(session: AsyncSession, today: date) -> None:
+    await get_summary(session, today=today)
+
+
+async def _measure(
+    factory: async_sessionmaker[AsyncSession],
+    counter: dict[str, int],
+    runner: Callable[[AsyncSession, date], Awaitable[None]],
+    today: date,
+    repeat: int,
+) -> tuple[float, float]:
+    counter["statements"] = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        async with factory() as session:
+            await runner(session, today)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+    return counter["statements"] / repeat, elapsed_ms
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--vehicles", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="simulated latency added to every statement")
+    args = parser.parse_args(argv)
+
+    engine = create_async_engine(args.database_url)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    today = date.today()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with factory() as session:
+        await _seed(session, args.vehicles, today)
+
+    counter = {"statements": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(*_: Any) -> None:
+        counter["statements"] += 1
+        if args.rtt_ms:
+            time.sleep(args.rtt_ms / 1000)
+
+    async def _parallel_summary(session: AsyncSession, today: date) -> None:
+        await get_summary(session, today=today, parallel=True, session_factory=factory)
+
+    scenarios: list[tuple[str, Callable[[AsyncSession, date], Awaitable[None]]]] = [
+        ("kpis: one query per figure", _per_query_kpis),
+        ("kpis: single statement", _single_statement_kpis),
+        ("get_summary (full)", _full_summary),
+        ("get_summary (parallel)", _parallel_summary),
+    ]
+    print(f"vehicles={args.vehicles} repeat={args.repeat} rtt={args.rtt_ms}ms")
+    for label, runner in scenarios:
+        statements, elapsed_ms = await _measure(factory, counter, runner, today, args.repeat)
+        print(f"{label:<32} round trips={statements:>5.1f}  latency={elapsed_ms:>8.2f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+"""Export the financial tables as Arrow IPC streams or Parquet files.
+
+    python -m app.scripts.export_analytics --format parquet --start-date 2023-01-01 --output exports/
+    python -m app.scripts.export_analytics --table cash_txns --format arrow --output exports/
+
+Writes one ``<table>.parquet`` (or ``.arrows``) per table into ``--output``. Requires the
+optional ``pyarrow`` package.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import date
+from pathlib import Path
+
+from ..config import settings
+from ..db import AsyncSessionLocal
+from ..services.analytics_export import (
+    ANALYTICS_EXTENSIONS,
+    ANALYTICS_TABLES,
+    AnalyticsExportUnavailable,
+    analytics_chunks,
+    require_pyarrow,
+)
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", choices=sorted(ANALYTICS_TABLES), action="append", help="default: all tables")
+    parser.add_argument("--format", choices=sorted(ANALYTICS_EXTENSIONS), default="parquet")
+    parser.add_argument("--start-date", type=date.fromisoformat)
+    parser.add_argument("--end-date", type=date.fromisoformat)
+    parser.add_argument("--output", type=Path, default=Path("."))
+    args = parser.parse_args(argv)
+
+    try:
+        require_pyarrow()
+    except AnalyticsExportUnavailable as exc:
+        parser.error(str(exc))
+    args.output.mkdir(parents=True, exist_ok=True)
+    for table in args.table or list(ANALYTICS_TABLES):
+        path = args.output / f"{table}.{ANALYTICS_EXTENSIONS[args.format]}"
+        with path.open("wb") as handle:
+            async for chunk in analytics_chunks(
+                AsyncSessionLocal,
+                table,
+                args.format,
+                args.start_date,
+                args.end_date,
+                settings.analytics_batch_size,
+            ):
+                handle.write(chunk)
+        print(f"{table}: {path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
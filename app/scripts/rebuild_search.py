@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import asyncio
+
+from ..db import AsyncSessionLocal
+from ..services.search import rebuild_search_index
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as session:
+        entries = await rebuild_search_index(session)
+        await session.commit()
+    print(f"Search index rebuilt ({entries} entries).")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
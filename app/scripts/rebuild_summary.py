@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import asyncio
+
+from ..db import AsyncSessionLocal
+from ..services.summary import rebuild_summary_snapshot
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as session:
+        rows = await rebuild_summary_snapshot(session)
+        await session.commit()
+    print(f"Summary snapshot rebuilt ({rows} counters).")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
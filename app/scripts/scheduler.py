@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from ..db import AsyncSessionLocal
+from ..services.scheduler import Scheduler, default_jobs, run_job
+
+
+async def main(argv: list[str] | None = None) -> None:
+    jobs = {job.name: job for job in default_jobs()}
+    parser = argparse.ArgumentParser(description="Run scheduled jobs (billing, summary snapshot).")
+    parser.add_argument("--run-now", choices=sorted(jobs), default=None, help="run one job immediately and exit")
+    args = parser.parse_args(argv)
+
+    if args.run_now:
+        job_run = await run_job(AsyncSessionLocal, jobs[args.run_now])
+        print(
+            f"{job_run.job_name}: {job_run.status.value} in {job_run.duration_ms} ms, "
+            f"{job_run.rows_created} rows created" + (f" ({job_run.error})" if job_run.error else "")
+        )
+        return
+
+    scheduler = Scheduler(AsyncSessionLocal, jobs.values())
+    for job in scheduler.jobs:
+        print(f"Scheduled {job.name}: {job.schedule.expression} (UTC)")
+    await scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
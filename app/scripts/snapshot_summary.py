@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import date
+
+from ..db import AsyncSessionLocal
+from ..services.summary import take_daily_snapshot
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Store the daily dashboard snapshot.")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="day to snapshot (default: yesterday)")
+    args = parser.parse_args(argv)
+
+    async with AsyncSessionLocal() as session:
+        payload = await take_daily_snapshot(session, args.date)
+        await session.commit()
+    print(f"Summary snapshot stored (cash balance {payload.cash_balance}).")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
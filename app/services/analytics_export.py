@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Literal, Optional
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..models.capital import CapitalEntry
+from ..models.cash import CashTxn
+from ..models.expense import Expense
+from ..models.rent_payment import RentPayment
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency: pip install pyarrow
+    pa = None
+    pq = None
+
+AnalyticsFormat = Literal["arrow", "parquet"]
+AnalyticsTableName = Literal["expenses", "cash_txns", "rent_payments", "capital_entries"]
+
+ANALYTICS_MEDIA_TYPES: dict[str, str] = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+ANALYTICS_EXTENSIONS: dict[str, str] = {"arrow": "arrows", "parquet": "parquet"}
+
+
+class AnalyticsExportUnavailable(RuntimeError):
+    """Raised when the optional ``pyarrow`` dependency is missing."""
+
+
+@dataclass(frozen=True)
+class AnalyticsTable:
+    model: Any
+    date_column: str
+
+
+ANALYTICS_TABLES: dict[str, AnalyticsTable] = {
+    "expenses": AnalyticsTable(Expense, "date"),
+    "cash_txns": AnalyticsTable(CashTxn, "date"),
+    "rent_payments": AnalyticsTable(RentPayment, "period_start"),
+    "capital_entries": AnalyticsTable(CapitalEntry, "date"),
+}
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise AnalyticsExportUnavailable("Analytics export needs pyarrow (pip install pyarrow)")
+
+
+def _arrow_type(column: Any) -> Any:
+    column_type = column.type
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Numeric):
+        return pa.decimal128(column_type.precision or 18, column_type.scale or 0)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    return pa.string()
+
+
+def arrow_schema(model: Any) -> Any:
+    """Arrow schema of ``model``'s columns: Numeric as decimal128, Date as date32, enums as text."""
+    require_pyarrow()
+    return pa.schema(
+        [
+            pa.field(attr.key, _arrow_type(attr.columns[0]), nullable=attr.columns[0].nullable)
+            for attr in model.__mapper__.column_attrs
+        ]
+    )
+
+
+def _arrow_value(value: Any, arrow_type: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal) and pa.types.is_decimal(arrow_type):
+        # decimal128 refuses values with more digits than its scale.
+        return value.quantize(Decimal(1).scaleb(-arrow_type.scale))
+    return value
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that keeps what the Arrow writers produce until it is drained."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def analytics_chunks(
+    session_factory: async_sessionmaker[AsyncSession],
+    table: AnalyticsTableName,
+    format: AnalyticsFormat,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    batch_size: int = 10_000,
+) -> AsyncIterator[bytes]:
+    """``table`` as an Arrow IPC stream or a Parquet file, one record batch at a time.
+
+    Rows are read from a server-side cursor in ``batch_size`` partitions and every
+    partition becomes one record batch (one row group in Parquet), so memory stays
+    bounded by a batch. ``start_date``/``end_date`` filter the table's date column
+    (``period_start`` for rent payments), both inclusive.
+    """
+    require_pyarrow()
+    source = ANALYTICS_TABLES[table]
+    schema = arrow_schema(source.model)
+    attrs = list(source.model.__mapper__.column_attrs)
+    date_attr = getattr(source.model, source.date_column)
+    query = select(*(getattr(source.model, attr.key) for attr in attrs)).order_by(date_attr, source.model.id)
+    if start_date is not None:
+        query = query.where(date_attr >= start_date)
+    if end_date is not None:
+        query = query.where(date_attr <= end_date)
+
+    sink = _ChunkSink()
+    if format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    async with session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions(batch_size):
+            columns = list(zip(*partition))
+            batch = pa.record_batch(
+                [
+                    pa.array([_arrow_value(value, field.type) for value in values], type=field.type)
+                    for values, field in zip(columns, schema)
+                ],
+                schema=schema,
+            )
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    writer.close()
+    yield sink.drain()
+
+
+__all__ = [
+    "ANALYTICS_EXTENSIONS",
+    "ANALYTICS_MEDIA_TYPES",
+    "ANALYTICS_TABLES",
+    "AnalyticsExportUnavailable",
+    "AnalyticsFormat",
+    "AnalyticsTableName",
+    "analytics_chunks",
+    "arrow_schema",
+    "require_pyarrow",
+]
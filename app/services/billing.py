@@ -1,15 +1,33 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
-from typing import Sequence
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple, Optional, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+import anyio
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Select,
+    Subquery,
+    and_,
+    case,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from ..config import settings
+from ..models.billing_partition import BillingPartition, BillingPartitionStatus
+from ..models.rent_payment import RentPayment
 from ..models.rental import BillingDay, Rental, RentalStatus
 from ..repositories.rent_payment import RentPaymentRepository
-from ..repositories.rental import RentalRepository
 
 
 DAY_MAP = {
@@ -22,49 +40,356 @@ DAY_MAP = {
     6: BillingDay.SUN,
 }
 
+# Run days resolved per statement in backfill mode.
+BACKFILL_WINDOW_DAYS = 31
+
+
+def _billing_period(today: date) -> tuple[date, date]:
+    """The week charged on ``today``: the seven days ending yesterday."""
+    period_end = today - timedelta(days=1)
+    return period_end - timedelta(days=6), period_end
+
+
+def _run_days(run_dates: Sequence[date]) -> Subquery:
+    """One row per billing run: the run date's weekday and the week it charges."""
+    rows = []
+    for run_date in run_dates:
+        period_start, period_end = _billing_period(run_date)
+        rows.append(
+            select(
+                literal(run_date, Date()).label("run_date"),
+                literal(DAY_MAP[run_date.weekday()], Rental.billing_day.type).label("billing_day"),
+                literal(period_start, Date()).label("period_start"),
+                literal(period_end, Date()).label("period_end"),
+            )
+        )
+    return (rows[0] if len(rows) == 1 else union_all(*rows)).subquery("run_days")
 
-async def generate_weekly_charges(session: AsyncSession, today: date | None = None) -> Sequence[str]:
-    today = today or date.today()
-    repo = RentalRepository(session)
-    payment_repo = RentPaymentRepository(session)
 
-    target_day = DAY_MAP[today.weekday()]
+def _billable_rentals(include_closed: bool) -> ColumnElement[bool]:
+    condition = Rental.status == RentalStatus.ACTIVE
+    if include_closed:
+        condition = or_(condition, and_(Rental.status == RentalStatus.CLOSED, Rental.end_date.is_not(None)))
+    return condition
 
-    stmt = (
-        select(Rental)
-        .options(selectinload(Rental.payments))
-        .where(Rental.status == RentalStatus.ACTIVE)
+
+def _rental_id_range(rental_id_after: Optional[str], rental_id_upto: Optional[str]) -> list[ColumnElement[bool]]:
+    conditions = []
+    if rental_id_after is not None:
+        conditions.append(Rental.id > rental_id_after)
+    if rental_id_upto is not None:
+        conditions.append(Rental.id <= rental_id_upto)
+    return conditions
+
+
+def _missing_charges_statement(
+    run_dates: Sequence[date],
+    include_closed: bool = False,
+    rental_id_after: Optional[str] = None,
+    rental_id_upto: Optional[str] = None,
+) -> Select:
+    """Charges due on ``run_dates`` that do not exist yet, found with one anti-join.
+
+    Rentals are matched to the runs on their billing day in SQL, each period is clipped to
+    the rental's start and end dates, and periods that already have a payment are
+    excluded. ``include_closed`` also bills rentals closed since, up to their end date;
+    ``rental_id_after``/``rental_id_upto`` restrict the run to one partition.
+    """
+    run = _run_days(run_dates)
+    effective_start = case((Rental.start_date > run.c.period_start, Rental.start_date), else_=run.c.period_start)
+    effective_end = case(
+        (and_(Rental.end_date.is_not(None), Rental.end_date < run.c.period_end), Rental.end_date),
+        else_=run.c.period_end,
+    )
+    already_billed = exists().where(
+        RentPayment.rental_id == Rental.id,
+        RentPayment.period_start == effective_start,
+        RentPayment.period_end == effective_end,
+    )
+    return (
+        select(
+            Rental.id.label("rental_id"),
+            Rental.weekly_rate,
+            effective_start.label("period_start"),
+            effective_end.label("period_end"),
+        )
+        .join(run, Rental.billing_day == run.c.billing_day)
+        .where(
+            _billable_rentals(include_closed),
+            *_rental_id_range(rental_id_after, rental_id_upto),
+            Rental.start_date <= run.c.period_end,
+            or_(
+                Rental.end_date.is_(None),
+                and_(Rental.end_date >= run.c.period_start, Rental.end_date >= Rental.start_date),
+            ),
+            ~already_billed,
+        )
+        .order_by(run.c.run_date, Rental.id)
     )
-    rentals = (await session.execute(stmt)).scalars().all()
-    created_ids: list[str] = []
 
-    for rental in rentals:
-        if rental.billing_day != target_day:
-            continue
-        period_end = today - timedelta(days=1)
-        period_start = period_end - timedelta(days=6)
 
-        if rental.start_date > period_end:
-            continue
+async def generate_weekly_charges(
+    session: AsyncSession,
+    today: date | None = None,
+    *,
+    since: date | None = None,
+    until: date | None = None,
+    batch_size: int = 500,
+    rental_id_after: Optional[str] = None,
+    rental_id_upto: Optional[str] = None,
+) -> Sequence[str]:
+    """Create the weekly charges due on ``today``, or on every day from ``since`` to ``until``.
 
-        effective_start = max(rental.start_date, period_start)
-        effective_end = period_end
-        if rental.end_date and rental.end_date < effective_end:
-            effective_end = rental.end_date
-        if effective_start > effective_end:
-            continue
-        if await payment_repo.exists_for_period(rental.id, effective_start, effective_end):
-            continue
-        payload = {
-            "rental_id": rental.id,
-            "period_start": effective_start,
-            "period_end": effective_end,
-            "weekly_rate": rental.weekly_rate,
-            "paid_amount": 0,
-            "late_fee": 0,
-        }
-        payment = await payment_repo.create_payment(payload)
-        created_ids.append(payment.id)
+    A single day runs in a constant number of statements: one to find the missing
+    periods, one for the id range and one bulk insert. The range mode catches up missed
+    runs: the missing periods of ``BACKFILL_WINDOW_DAYS`` days are found per statement and
+    inserted ``batch_size`` at a time, and rentals closed since are billed up to their end
+    date. ``rental_id_after``/``rental_id_upto`` limit the run to one partition of rentals.
+    """
+    payment_repo = RentPaymentRepository(session)
+    if since is None:
+        run_dates = [today or date.today()]
+        windows = [run_dates]
+    else:
+        until = until or today or date.today()
+        run_dates = [since + timedelta(days=offset) for offset in range((until - since).days + 1)]
+        windows = [
+            run_dates[index : index + BACKFILL_WINDOW_DAYS] for index in range(0, len(run_dates), BACKFILL_WINDOW_DAYS)
+        ]
 
+    created_ids: list[str] = []
+    for window in windows:
+        if not window:
+            continue
+        charges = (
+            await session.execute(
+                _missing_charges_statement(
+                    window,
+                    include_closed=since is not None,
+                    rental_id_after=rental_id_after,
+                    rental_id_upto=rental_id_upto,
+                )
+            )
+        ).mappings().all()
+        for index in range(0, len(charges), batch_size):
+            batch = [dict(charge) for charge in charges[index : index + batch_size]]
+            created_ids.extend(await payment_repo.bulk_create_payments(batch))
     return created_ids
 
+
+class ClaimedPartition(NamedTuple):
+    run_key: str
+    partition_no: int
+    rental_id_after: Optional[str]
+    rental_id_upto: Optional[str]
+
+
+def billing_run_key(today: date, since: date | None = None, until: date | None = None) -> str:
+    """Identifies a run's partitions, so a rerun of the same days resumes them."""
+    if since is None:
+        return f"day:{today.isoformat()}"
+    return f"range:{since.isoformat()}:{(until or today).isoformat()}"
+
+
+async def plan_billing_partitions(
+    session_factory: async_sessionmaker[AsyncSession],
+    run_key: str,
+    *,
+    include_closed: bool,
+    partition_size: int,
+) -> int:
+    """Split the billable rentals into chunks of ``partition_size`` ids, once per run.
+
+    Returns the number of partitions of ``run_key``; when another worker (or an earlier,
+    interrupted run) already planned it, the existing partitions are kept.
+    """
+    async with session_factory() as session:
+        planned = await session.scalar(
+            select(func.count()).select_from(BillingPartition).where(BillingPartition.run_key == run_key)
+        )
+        if planned:
+            return planned
+        rental_ids = (
+            await session.execute(select(Rental.id).where(_billable_rentals(include_closed)).order_by(Rental.id))
+        ).scalars().all()
+        bounds = [rental_ids[index - 1] for index in range(partition_size, len(rental_ids), partition_size)]
+        rows = [
+            {
+                "run_key": run_key,
+                "partition_no": number,
+                "rental_id_after": bounds[number - 1] if number else None,
+                "rental_id_upto": bounds[number] if number < len(bounds) else None,
+                "status": BillingPartitionStatus.PENDING,
+                "rows_created": 0,
+            }
+            for number in range(len(bounds) + 1)
+        ]
+        try:
+            await session.execute(insert(BillingPartition), rows)
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            return await session.scalar(
+                select(func.count()).select_from(BillingPartition).where(BillingPartition.run_key == run_key)
+            )
+    return len(rows)
+
+
+async def claim_billing_partition(
+    session_factory: async_sessionmaker[AsyncSession],
+    run_key: str,
+    worker: str,
+    lease_seconds: float,
+    now: datetime | None = None,
+) -> Optional[ClaimedPartition]:
+    """Lease the next pending partition of ``run_key`` whose lease is free or expired.
+
+    The candidate row is locked with ``SKIP LOCKED`` so concurrent workers pick different
+    partitions. When a claim is lost anyway (no row locks on SQLite, or the lease expired
+    in between) the transaction is ended before looking again: under InnoDB's repeatable
+    read a re-select in the same transaction would keep seeing the stale candidate.
+    """
+    now = now or datetime.now(timezone.utc)
+    claimable = and_(
+        BillingPartition.run_key == run_key,
+        BillingPartition.status == BillingPartitionStatus.PENDING,
+        or_(BillingPartition.lease_until.is_(None), BillingPartition.lease_until < now),
+    )
+    async with session_factory() as session:
+        while True:
+            candidate = (
+                await session.execute(
+                    select(
+                        BillingPartition.partition_no,
+                        BillingPartition.rental_id_after,
+                        BillingPartition.rental_id_upto,
+                    )
+                    .where(claimable)
+                    .order_by(BillingPartition.partition_no)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+            ).first()
+            if candidate is None:
+                await session.commit()
+                return None
+            claimed = await session.execute(
+                update(BillingPartition)
+                .where(claimable, BillingPartition.partition_no == candidate.partition_no)
+                .values(owner=worker, lease_until=now + timedelta(seconds=lease_seconds))
+                .execution_options(synchronize_session=False)
+            )
+            if claimed.rowcount:
+                await session.commit()
+                return ClaimedPartition(run_key, *candidate)
+            await session.rollback()
+
+
+async def bill_partition(
+    session_factory: async_sessionmaker[AsyncSession],
+    partition: ClaimedPartition,
+    worker: str,
+    today: date,
+    *,
+    since: date | None = None,
+    until: date | None = None,
+) -> int:
+    """Bill one claimed partition and mark it done in the same transaction.
+
+    If the lease was lost to another worker meanwhile, nothing is committed and 0 is
+    returned; that worker bills the partition instead.
+    """
+    async with session_factory() as session:
+        created = await generate_weekly_charges(
+            session,
+            today,
+            since=since,
+            until=until,
+            rental_id_after=partition.rental_id_after,
+            rental_id_upto=partition.rental_id_upto,
+        )
+        finished = await session.execute(
+            update(BillingPartition)
+            .where(
+                BillingPartition.run_key == partition.run_key,
+                BillingPartition.partition_no == partition.partition_no,
+                BillingPartition.status == BillingPartitionStatus.PENDING,
+                BillingPartition.owner == worker,
+            )
+            .values(
+                status=BillingPartitionStatus.DONE,
+                rows_created=len(created),
+                finished_at=datetime.now(timezone.utc),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if not finished.rowcount:
+            await session.rollback()
+            return 0
+        await session.commit()
+    return len(created)
+
+
+async def run_partitioned_billing(
+    session_factory: async_sessionmaker[AsyncSession],
+    today: date | None = None,
+    *,
+    since: date | None = None,
+    until: date | None = None,
+    worker_prefix: str = "billing",
+    workers: int | None = None,
+    partition_size: int | None = None,
+    lease_seconds: float | None = None,
+) -> int:
+    """Run ``generate_weekly_charges`` over partitions of rentals, one transaction each.
+
+    ``workers`` tasks claim partitions concurrently; other processes calling this for the
+    same days share the work through the partition leases. Partitions already committed
+    are skipped, so a run interrupted by a crash resumes where it stopped. Returns the
+    number of charges created by this call.
+
+    The plan is fixed when the run key is first seen, so once every partition is done an
+    un-partitioned pass bills whatever it missed: rentals created after the plan, or a
+    rerun of a day that already completed. It is a single anti-join and charges are
+    idempotent, so it costs little and is safe alongside other processes.
+    """
+    today = today or date.today()
+    workers = workers or settings.billing_workers
+    lease_seconds = lease_seconds or settings.billing_partition_lease_seconds
+    run_key = billing_run_key(today, since, until)
+    await plan_billing_partitions(
+        session_factory,
+        run_key,
+        include_closed=since is not None,
+        partition_size=partition_size or settings.billing_partition_size,
+    )
+
+    created = [0] * workers
+
+    async def work(index: int) -> None:
+        worker = f"{worker_prefix}-{index}"
+        while True:
+            partition = await claim_billing_partition(session_factory, run_key, worker, lease_seconds)
+            if partition is None:
+                return
+            created[index] += await bill_partition(
+                session_factory, partition, worker, today, since=since, until=until
+            )
+
+    async with anyio.create_task_group() as task_group:
+        for index in range(workers):
+            task_group.start_soon(work, index)
+
+    async with session_factory() as session:
+        unfinished = await session.scalar(
+            select(func.count())
+            .select_from(BillingPartition)
+            .where(BillingPartition.run_key == run_key, BillingPartition.status != BillingPartitionStatus.DONE)
+        )
+        if unfinished:
+            # Another process still holds a lease; its run ends with this pass.
+            await session.commit()
+            return sum(created)
+        swept = await generate_weekly_charges(session, today, since=since, until=until)
+        await session.commit()
+    return sum(created) + len(swept)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.common import quantize_decimal
+from ..models.rental import Rental, RentalStatus
+from ..schemas.billing import (
+    BillingForecastDriver,
+    BillingForecastRental,
+    BillingForecastResponse,
+    BillingForecastVehicle,
+    BillingForecastWeek,
+)
+from .billing import DAY_MAP
+
+WEEKDAY_OF = {billing_day: weekday for weekday, billing_day in DAY_MAP.items()}
+
+
+def _cents(value: Decimal) -> int:
+    return int((quantize_decimal(value) or Decimal("0")) * 100)
+
+
+def _amount(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def _ceil_div(numerator: int, denominator: int) -> int:
+    return -(-numerator // denominator)
+
+
+async def forecast_charges(
+    session: AsyncSession,
+    weeks: int,
+    start: Optional[date] = None,
+) -> BillingForecastResponse:
+    """Charges ``generate_weekly_charges`` will create for active rentals over ``weeks`` weeks.
+
+    Week ``k`` covers ``start + 7k`` to ``start + 7k + 6``, so each rental bills at most
+    once per week. Rentals are loaded as columns with one query and never expanded day by
+    day: the range of weeks a rental bills in follows from its start and end dates in
+    closed form (a run on day R charges R-7..R-1, clipped to the rental), and the weekly
+    totals are built from a difference array. Existing payments are not read, so charges
+    already generated for today are included again.
+    """
+    start = start or date.today()
+    end = start + timedelta(days=7 * weeks - 1)
+    rows = (
+        await session.execute(
+            select(
+                Rental.id,
+                Rental.driver_id,
+                Rental.vehicle_id,
+                Rental.billing_day,
+                Rental.start_date,
+                Rental.end_date,
+                Rental.weekly_rate,
+            )
+            .where(
+                Rental.status == RentalStatus.ACTIVE,
+                Rental.start_date < end,
+                or_(Rental.end_date.is_(None), Rental.end_date >= start - timedelta(days=7)),
+            )
+            .order_by(Rental.id)
+        )
+    ).all()
+    rental_ids, driver_ids, vehicle_ids, billing_days, start_dates, end_dates, rates = (
+        zip(*rows) if rows else ((),) * 7
+    )
+
+    origin = start.toordinal()
+    origin_weekday = start.weekday()
+    week_cents = [0] * (weeks + 1)
+    week_charges = [0] * (weeks + 1)
+    rentals: list[BillingForecastRental] = []
+    drivers: dict[str, list[int]] = {}
+    vehicles: dict[str, list[int]] = {}
+    for index, billing_day in enumerate(billing_days):
+        first_run = origin + (WEEKDAY_OF[billing_day] - origin_weekday) % 7
+        # Billed on run R when start_date <= R-1 and end_date >= R-7.
+        first_week = max(0, _ceil_div(start_dates[index].toordinal() + 1 - first_run, 7))
+        last_week = weeks - 1
+        end_date = end_dates[index]
+        if end_date is not None:
+            if end_date < start_dates[index]:
+                continue
+            last_week = min(last_week, (end_date.toordinal() + 7 - first_run) // 7)
+        if first_week > last_week:
+            continue
+        cents = _cents(rates[index])
+        charges = last_week - first_week + 1
+        week_cents[first_week] += cents
+        week_cents[last_week + 1] -= cents
+        week_charges[first_week] += 1
+        week_charges[last_week + 1] -= 1
+        rentals.append(
+            BillingForecastRental(
+                rental_id=rental_ids[index],
+                driver_id=driver_ids[index],
+                vehicle_id=vehicle_ids[index],
+                billing_day=billing_day,
+                weekly_rate=_amount(cents),
+                charges=charges,
+                total=_amount(cents * charges),
+                first_charge=date.fromordinal(first_run + 7 * first_week),
+                last_charge=date.fromordinal(first_run + 7 * last_week),
+            )
+        )
+        for totals, key in ((drivers, driver_ids[index]), (vehicles, vehicle_ids[index])):
+            entry = totals.setdefault(key, [0, 0])
+            entry[0] += charges
+            entry[1] += cents * charges
+
+    week_rows: list[BillingForecastWeek] = []
+    running_cents = running_charges = 0
+    for week in range(weeks):
+        running_cents += week_cents[week]
+        running_charges += week_charges[week]
+        week_start = start + timedelta(days=7 * week)
+        week_rows.append(
+            BillingForecastWeek(
+                week_start=week_start,
+                week_end=week_start + timedelta(days=6),
+                charges=running_charges,
+                total=_amount(running_cents),
+            )
+        )
+
+    return BillingForecastResponse(
+        start_date=start,
+        end_date=end,
+        charges=sum(row.charges for row in week_rows),
+        total=sum((row.total for row in week_rows), Decimal("0.00")),
+        weeks=week_rows,
+        rentals=rentals,
+        drivers=[
+            BillingForecastDriver(driver_id=key, charges=charges, total=_amount(cents))
+            for key, (charges, cents) in sorted(drivers.items())
+        ],
+        vehicles=[
+            BillingForecastVehicle(vehicle_id=key, charges=charges, total=_amount(cents))
+            for key, (charges, cents) in sorted(vehicles.items())
+        ],
+    )
+
+
+__all__ = ["forecast_charges"]
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Sequence, Type
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config import settings
+from ..repositories.base import BaseRepository
+from ..schemas.common import ExportFormat
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunk(rows: Sequence[dict[str, Any]], fields: Sequence[str], header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(fields)
+    writer.writerows([_plain(row[field]) for field in fields] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _ndjson_chunk(rows: Sequence[dict[str, Any]]) -> bytes:
+    return "".join(
+        json.dumps({key: _plain(value) for key, value in row.items()}, ensure_ascii=False) + "\n" for row in rows
+    ).encode()
+
+
+async def export_chunks(
+    session_factory: async_sessionmaker[AsyncSession],
+    repository: Type[BaseRepository[Any]],
+    fields: Sequence[str],
+    filters: Sequence[Any],
+    format: ExportFormat,
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    """Encoded export of every matching row, one chunk of ``chunk_size`` rows at a time.
+
+    The session is opened here rather than taken from the request, since the body is
+    produced after the endpoint has returned. A CSV export starts with its header even
+    when nothing matches.
+    """
+    header = format == "csv"
+    async with session_factory() as session:
+        async for rows in repository(session).stream_rows(fields, filters, chunk_size):
+            yield _csv_chunk(rows, fields, header) if format == "csv" else _ndjson_chunk(rows)
+            header = False
+    if header:
+        yield _csv_chunk((), fields, header)
+
+
+def export_response(
+    session_factory: async_sessionmaker[AsyncSession],
+    repository: Type[BaseRepository[Any]],
+    filters: Sequence[Any],
+    format: ExportFormat,
+    fields: Sequence[str] | None,
+    filename: str,
+) -> StreamingResponse:
+    """Streaming download of ``repository``'s rows; unknown ``fields`` fail before streaming."""
+    columns = repository.select_fields(fields)
+    return StreamingResponse(
+        export_chunks(session_factory, repository, columns, filters, format, settings.export_chunk_size),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
+
+__all__ = ["EXPORT_MEDIA_TYPES", "export_chunks", "export_response"]
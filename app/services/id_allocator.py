@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+from sqlalchemy import Insert, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from ..config import settings
+from ..models.id_counter import IdCounter
+
+
+def format_id(prefix: str, number: int) -> str:
+    return f"{prefix}-{number:04d}"
+
+
+async def _last_number(conn: AsyncConnection | AsyncSession, model: Any, prefix: str) -> int:
+    """Highest numeric suffix of ``prefix`` ids in ``model``, compared as numbers."""
+    last = 0
+    for entity_id in (await conn.execute(select(model.id).where(model.id.like(f"{prefix}-%")))).scalars():
+        suffix = str(entity_id).split("-", 1)[1]
+        if suffix.isdigit():
+            last = max(last, int(suffix))
+    return last
+
+
+def _create_counter(dialect: str, prefix: str, next_value: int) -> Insert:
+    """Insert the counter unless a concurrent allocator already created it."""
+    values = {"prefix": prefix, "next_value": next_value}
+    if dialect == "mysql":
+        return mysql.insert(IdCounter).values(values).on_duplicate_key_update(prefix=IdCounter.prefix)
+    if dialect in {"sqlite", "postgresql"}:
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        return dialect_insert(IdCounter).values(values).on_conflict_do_nothing(index_elements=[IdCounter.prefix])
+    return insert(IdCounter).values(values)
+
+
+async def _reserve(conn: AsyncConnection | AsyncSession, dialect: str, model: Any, prefix: str, count: int) -> int:
+    """Advance the ``prefix`` counter by ``count`` and return the first reserved number.
+
+    The ``UPDATE`` locks the counter row, so concurrent reservations are serialized by
+    the database and never overlap. A missing counter is created after the ids already
+    in ``model``.
+    """
+    advance = (
+        update(IdCounter)
+        .where(IdCounter.prefix == prefix)
+        .values(next_value=IdCounter.next_value + count)
+        .execution_options(synchronize_session=False)
+    )
+    if not (await conn.execute(advance)).rowcount:
+        first = await _last_number(conn, model, prefix) + 1
+        await conn.execute(_create_counter(dialect, prefix, first))
+        await conn.execute(advance)
+    next_value = (await conn.execute(select(IdCounter.next_value).where(IdCounter.prefix == prefix))).scalar_one()
+    return next_value - count
+
+
+class IdAllocator:
+    """Hi-lo allocator of entity ids such as ``PAY-0042``, backed by ``id_counters``.
+
+    On MySQL and Postgres a block of ``block_size`` numbers is reserved in its own short
+    transaction and ids are then handed out from memory, so concurrent creates never
+    share an id and the counter row is never held for the length of a request. A
+    rollback of the caller only leaves a gap.
+
+    SQLite allows a single writer, and a second connection would wait on the caller's
+    own write lock, so there the counter is advanced by exactly the ids requested inside
+    the caller's transaction and nothing is cached.
+    """
+
+    def __init__(self, block_size: int, in_transaction_dialects: frozenset[str] = frozenset({"sqlite"})) -> None:
+        self.block_size = block_size
+        self.in_transaction_dialects = in_transaction_dialects
+        self._ranges: dict[tuple[str, str], deque[tuple[int, int]]] = {}
+
+    async def allocate(self, session: AsyncSession, model: Any, prefix: str, count: int = 1) -> list[str]:
+        if count < 1:
+            return []
+        dialect = session.get_bind().dialect.name
+        engine = session.bind
+        if dialect in self.in_transaction_dialects or engine is None:
+            first = await _reserve(session, dialect, model, prefix, count)
+            return [format_id(prefix, number) for number in range(first, first + count)]
+
+        ranges = self._ranges.setdefault((str(engine.url), prefix), deque())
+        numbers: list[int] = []
+        while len(numbers) < count:
+            if not ranges:
+                size = max(self.block_size, count - len(numbers))
+                async with engine.begin() as conn:
+                    first = await _reserve(conn, dialect, model, prefix, size)
+                ranges.append((first, first + size))
+                continue
+            start, end = ranges.popleft()
+            take = min(end - start, count - len(numbers))
+            numbers.extend(range(start, start + take))
+            if start + take < end:
+                ranges.appendleft((start + take, end))
+        return [format_id(prefix, number) for number in numbers]
+
+    def reset(self) -> None:
+        """Forget cached blocks; their unused numbers are skipped."""
+        self._ranges.clear()
+
+
+id_allocator = IdAllocator(settings.id_block_size)
+
+
+__all__ = ["IdAllocator", "format_id", "id_allocator"]
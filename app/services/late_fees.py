@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.rent_payment import RentPayment
+from ..repositories.rent_payment import RentPaymentRepository
+
+
+@dataclass(frozen=True)
+class LateFeePolicy:
+    """Late fee charged on unpaid rent once ``grace_days`` have passed after the due date.
+
+    A charge is due on its billing run, the day after ``period_end``. The fee is
+    ``fixed_fee`` plus ``daily_pct`` percent of the unpaid amount for every day late beyond
+    the grace period, up to ``max_days`` days.
+    """
+
+    grace_days: int
+    fixed_fee: Decimal
+    daily_pct: Decimal
+    max_days: int
+
+    @classmethod
+    def from_settings(cls) -> "LateFeePolicy":
+        return cls(
+            grace_days=settings.late_fee_grace_days,
+            fixed_fee=settings.late_fee_fixed,
+            daily_pct=settings.late_fee_daily_pct,
+            max_days=settings.late_fee_max_days,
+        )
+
+    @property
+    def is_active(self) -> bool:
+        return self.fixed_fee > 0 or self.daily_pct > 0
+
+    def unpaid_rate(self, days_late: int) -> Decimal:
+        return self.daily_pct / Decimal(100) * min(days_late, self.max_days)
+
+
+async def apply_late_fees(
+    session: AsyncSession,
+    today: Optional[date] = None,
+    policy: Optional[LateFeePolicy] = None,
+) -> int:
+    """Bring the late fee of every overdue payment up to date; returns the payments touched.
+
+    Payments are bucketed by ``period_end``, which fixes the days late, and each bucket is
+    updated with one set-based ``UPDATE``. Payments late by ``max_days`` or more share the
+    last bucket, so there are at most ``max_days`` statements plus one to find the buckets.
+    """
+    today = today or date.today()
+    policy = policy or LateFeePolicy.from_settings()
+    if not policy.is_active:
+        return 0
+    # Latest period_end that is late by at least one day beyond the grace period.
+    last_late_end = today - timedelta(days=policy.grace_days + 2)
+    capped_end = last_late_end - timedelta(days=policy.max_days - 1)
+    period_ends = (
+        await session.execute(
+            select(RentPayment.period_end)
+            .where(
+                RentPayment.period_end > capped_end,
+                RentPayment.period_end <= last_late_end,
+                RentPayment.due_amount > RentPayment.paid_amount,
+            )
+            .distinct()
+        )
+    ).scalars().all()
+
+    repo = RentPaymentRepository(session)
+    touched = await repo.accrue_late_fees(
+        RentPayment.period_end <= capped_end, policy.fixed_fee, policy.unpaid_rate(policy.max_days)
+    )
+    for period_end in sorted(period_ends):
+        days_late = (last_late_end - period_end).days + 1
+        touched += await repo.accrue_late_fees(
+            RentPayment.period_end == period_end, policy.fixed_fee, policy.unpaid_rate(days_late)
+        )
+    return touched
+
+
+__all__ = ["LateFeePolicy", "apply_late_fees"]
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Hashable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from ..config import settings
+
+WRITTEN_TABLES = "written_tables"
+
+
+class CountCache:
+    """Process-level cache of list totals, keyed by table and filter signature.
+
+    Entries expire after ``ttl_seconds`` and every entry of a table is dropped as soon as
+    a session that wrote to it commits. Each table has its own generation, bumped on
+    invalidation, so a count taken while a write was committing is never stored.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, dict[Hashable, tuple[int, float]]] = {}
+        self._generations: dict[str, int] = {}
+
+    def generation(self, table: str) -> int:
+        return self._generations.get(table, 0)
+
+    def get(self, table: str, key: Hashable) -> Optional[int]:
+        entry = self._entries.get(table, {}).get(key)
+        if entry is None:
+            return None
+        total, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._entries[table].pop(key, None)
+            return None
+        return total
+
+    def store(self, table: str, key: Hashable, total: int, generation: int) -> None:
+        if self.ttl_seconds > 0 and generation == self.generation(table):
+            self._entries.setdefault(table, {})[key] = (total, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        for table in tables:
+            self._generations[table] = self.generation(table) + 1
+            self._entries.pop(table, None)
+
+
+count_cache = CountCache(settings.list_count_cache_ttl)
+
+
+def count_cache_key(statement: Any, dialect: Any) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """Filter signature of a count query: its SQL plus the bound values."""
+    compiled = statement.compile(dialect=dialect)
+    return compiled.string, tuple(sorted((name, repr(value)) for name, value in compiled.params.items()))
+
+
+def _written(session: Session) -> set[str]:
+    return session.info.setdefault(WRITTEN_TABLES, set())
+
+
+@event.listens_for(Session, "before_flush")
+def _track_flushed_tables(session: Session, flush_context: Any, instances: Any) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            _written(session).add(table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_tables(orm_execute_state: Any) -> None:
+    # Bulk INSERT/UPDATE/DELETE statements never reach the flush.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _written(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    tables = session.info.pop(WRITTEN_TABLES, None)
+    if tables:
+        count_cache.invalidate(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session: Session) -> None:
+    session.info.pop(WRITTEN_TABLES, None)
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN`` of ``statement``, compiled for the planners that report row estimates."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Any) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _explain_postgresql(element: Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain, "mysql")
+def _explain_mysql(element: Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN " + compiler.process(element.statement, **kw)
+
+
+async def estimate_rows(session: AsyncSession, statement: Any) -> Optional[int]:
+    """Rows the planner expects ``statement`` to return, from table statistics.
+
+    Postgres reports the top plan node's ``Plan Rows``; MySQL the first table's ``rows``
+    scaled by ``filtered``. Other dialects (SQLite keeps no usable statistics) and plans
+    that cannot be read return None, and the caller counts instead.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect not in {"postgresql", "mysql"}:
+        return None
+    result = await session.execute(Explain(statement))
+    if dialect == "postgresql":
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        try:
+            return max(0, int(plan[0]["Plan"]["Plan Rows"]))
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+    row = result.mappings().first()
+    if row is None or row.get("rows") is None:
+        return None
+    return int(int(row["rows"]) * float(row.get("filtered") or 100) / 100)
+
+
+__all__ = ["CountCache", "count_cache", "count_cache_key", "estimate_rows"]
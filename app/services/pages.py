@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from fastapi import Response
+
+from ..schemas.common import Page, PaginatedResult, PaginationParams, list_adapter
+
+
+def page_response(result: PaginatedResult[Any], params: PaginationParams, read_model: Optional[Any]) -> Response:
+    """JSON list response rendered in one pass.
+
+    ORM items are validated into ``read_model`` with a single cached ``TypeAdapter`` call
+    and the page is serialized to bytes by pydantic (decimals as strings), skipping
+    FastAPI's ``jsonable_encoder`` walk. Items projected with ``fields=`` are already
+    plain dicts and are dumped as they are.
+    """
+    if params.fields or read_model is None:
+        page_model: Any = Page[dict[str, Any]]
+        items = list(result.items)
+    else:
+        page_model = Page[read_model]
+        items = list_adapter(read_model).validate_python(result.items, from_attributes=True)
+    page = page_model.model_construct(
+        total=result.total,
+        page=result.page,
+        page_size=result.page_size,
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+        items=items,
+    )
+    return Response(content=page.model_dump_json(), media_type="application/json")
+
+
+__all__ = ["page_response"]
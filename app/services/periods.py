@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import Date
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from ..schemas.summary import SeriesGranularity
+
+
+def bucket_start(reference: date, granularity: SeriesGranularity) -> date:
+    """First day of the bucket containing ``reference``. Weeks start on Monday."""
+    if granularity == SeriesGranularity.DAY:
+        return reference
+    if granularity == SeriesGranularity.WEEK:
+        return reference - timedelta(days=reference.weekday())
+    if granularity == SeriesGranularity.MONTH:
+        return date(reference.year, reference.month, 1)
+    return date(reference.year, (reference.month - 1) // 3 * 3 + 1, 1)
+
+
+def next_bucket_start(start: date, granularity: SeriesGranularity) -> date:
+    if granularity == SeriesGranularity.DAY:
+        return start + timedelta(days=1)
+    if granularity == SeriesGranularity.WEEK:
+        return start + timedelta(days=7)
+    months = 1 if granularity == SeriesGranularity.MONTH else 3
+    month_index = start.year * 12 + start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def bucket_starts(start: date, end: date, granularity: SeriesGranularity) -> list[date]:
+    """Every bucket start touching the inclusive ``start``..``end`` range."""
+    current = bucket_start(start, granularity)
+    sequence: list[date] = []
+    while current <= end:
+        sequence.append(current)
+        current = next_bucket_start(current, granularity)
+    return sequence
+
+
+def bucket_count(start: date, end: date, granularity: SeriesGranularity) -> int:
+    if end < start:
+        return 0
+    first = bucket_start(start, granularity)
+    last = bucket_start(end, granularity)
+    if granularity == SeriesGranularity.DAY:
+        return (last - first).days + 1
+    if granularity == SeriesGranularity.WEEK:
+        return (last - first).days // 7 + 1
+    months = (last.year - first.year) * 12 + last.month - first.month
+    return months // (1 if granularity == SeriesGranularity.MONTH else 3) + 1
+
+
+def bucket_label(start: date, granularity: SeriesGranularity) -> str:
+    if granularity == SeriesGranularity.MONTH:
+        return start.strftime("%b/%y")
+    if granularity == SeriesGranularity.QUARTER:
+        return f"T{(start.month - 1) // 3 + 1}/{start.strftime('%y')}"
+    return start.strftime("%d/%m/%y")
+
+
+class date_bucket(FunctionElement):
+    """``date_bucket(granularity, column)`` truncates a date column to its bucket start.
+
+    Rendered per dialect so that series can be grouped in the database. The granularity
+    lives on a dedicated subclass so it takes part in the statement cache key.
+    """
+
+    type = Date()
+    name = "date_bucket"
+    inherit_cache = True
+    granularity: SeriesGranularity = SeriesGranularity.DAY
+
+    def __new__(cls, granularity: SeriesGranularity | str, column: Any) -> "date_bucket":
+        if cls is date_bucket:
+            cls = _BUCKET_CLASSES[SeriesGranularity(granularity)]
+        return super().__new__(cls)
+
+    def __init__(self, granularity: SeriesGranularity | str, column: Any) -> None:
+        super().__init__(column)
+
+
+_BUCKET_CLASSES: dict[SeriesGranularity, type[date_bucket]] = {
+    granularity: type(
+        f"date_bucket_{granularity.value}",
+        (date_bucket,),
+        {"granularity": granularity, "inherit_cache": True},
+    )
+    for granularity in SeriesGranularity
+}
+
+_SQLITE_BUCKETS = {
+    SeriesGranularity.DAY: "date({col})",
+    SeriesGranularity.WEEK: "date({col}, '-' || ((CAST(strftime('%w', {col}) AS INTEGER) + 6) % 7) || ' days')",
+    SeriesGranularity.MONTH: "date({col}, 'start of month')",
+    SeriesGranularity.QUARTER: (
+        "date({col}, 'start of month', '-' || ((CAST(strftime('%m', {col}) AS INTEGER) - 1) % 3) || ' months')"
+    ),
+}
+
+_MYSQL_BUCKETS = {
+    SeriesGranularity.DAY: "DATE({col})",
+    SeriesGranularity.WEEK: "DATE_SUB(DATE({col}), INTERVAL WEEKDAY({col}) DAY)",
+    SeriesGranularity.MONTH: "DATE_SUB(DATE({col}), INTERVAL DAYOFMONTH({col}) - 1 DAY)",
+    SeriesGranularity.QUARTER: "DATE_ADD(MAKEDATE(YEAR({col}), 1), INTERVAL (QUARTER({col}) - 1) * 3 MONTH)",
+}
+
+
+def _column_sql(element: date_bucket, compiler: Any, **kw: Any) -> str:
+    return compiler.process(list(element.clauses)[0], **kw)
+
+
+@compiles(date_bucket)
+def _compile_date_bucket(element: date_bucket, compiler: Any, **kw: Any) -> str:
+    return f"CAST(date_trunc('{element.granularity.value}', {_column_sql(element, compiler, **kw)}) AS DATE)"
+
+
+@compiles(date_bucket, "sqlite")
+def _compile_date_bucket_sqlite(element: date_bucket, compiler: Any, **kw: Any) -> str:
+    return _SQLITE_BUCKETS[element.granularity].format(col=_column_sql(element, compiler, **kw))
+
+
+@compiles(date_bucket, "mysql")
+def _compile_date_bucket_mysql(element: date_bucket, compiler: Any, **kw: Any) -> str:
+    return _MYSQL_BUCKETS[element.granularity].format(col=_column_sql(element, compiler, **kw))
+
+
+__all__ = [
+    "bucket_count",
+    "bucket_label",
+    "bucket_start",
+    "bucket_starts",
+    "date_bucket",
+    "next_bucket_start",
+]
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import os
+import socket
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional, Sequence
+
+import anyio
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config import settings
+from ..models.job_lock import JobLock
+from ..models.job_run import JobRun, JobRunStatus
+from .billing import run_partitioned_billing
+from .late_fees import apply_late_fees
+from .summary import take_daily_snapshot
+
+SCHEDULER_LEASE = "scheduler"
+
+# (low, high) per cron field: minute, hour, day of month, month, day of week (0 and 7 are Sunday).
+_CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+# Long enough for a 29 February schedule to fire.
+_CRON_HORIZON = timedelta(days=4 * 366)
+
+JobFunc = Callable[[async_sessionmaker[AsyncSession], datetime], Awaitable[int]]
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_cron_field(spec: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in spec.split(","):
+        body, has_step, step_text = part.partition("/")
+        step = int(step_text) if has_step else 1
+        if body == "*":
+            start, end = low, high
+        elif "-" in body:
+            start_text, end_text = body.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(body)
+            end = high if has_step else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid cron field {spec!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """Five-field cron expression (``minute hour day month weekday``) evaluated in UTC.
+
+    Fields accept ``*``, numbers, ranges, lists and steps (``*/15``, ``1-5``, ``0,30``).
+    As in cron, when both day of month and day of week are restricted either one matches.
+    """
+
+    expression: str
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression {expression!r} must have 5 fields")
+        minutes, hours, days, months, cron_weekdays = (
+            _parse_cron_field(spec, low, high) for spec, (low, high) in zip(fields, _CRON_FIELDS)
+        )
+        return cls(
+            expression=expression,
+            minutes=minutes,
+            hours=hours,
+            days=days,
+            months=months,
+            # cron counts from Sunday, date.weekday() from Monday.
+            weekdays=frozenset((value - 1) % 7 for value in cron_weekdays),
+            any_day=fields[2] == "*",
+            any_weekday=fields[4] == "*",
+        )
+
+    def _day_matches(self, day: date) -> bool:
+        day_match = day.day in self.days
+        weekday_match = day.weekday() in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_match and weekday_match
+        return day_match or weekday_match
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First minute strictly after ``moment`` that matches the expression."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + _CRON_HORIZON
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month_start = candidate.replace(day=1, hour=0, minute=0)
+                candidate = (month_start + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate.date()):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression {self.expression!r} never fires")
+
+
+@dataclass(frozen=True)
+class Job:
+    """A scheduled job: ``run`` opens and commits its own sessions and returns rows written."""
+
+    name: str
+    schedule: CronSchedule
+    run: JobFunc
+
+
+async def last_successful_run(session: AsyncSession, job_name: str) -> Optional[datetime]:
+    """When the latest successful run of ``job_name`` was due (or started, if run by hand)."""
+    return await session.scalar(
+        select(func.max(func.coalesce(JobRun.scheduled_for, JobRun.started_at))).where(
+            JobRun.job_name == job_name,
+            JobRun.status == JobRunStatus.SUCCESS,
+        )
+    )
+
+
+async def run_billing_job(session_factory: async_sessionmaker[AsyncSession], now: datetime) -> int:
+    """Weekly charges due today, plus any days missed since the last successful run.
+
+    Billing is partitioned (see ``run_partitioned_billing``), so a run that died halfway
+    resumes from its last committed partition when started again for the same days.
+    """
+    today = now.date()
+    since = None
+    async with session_factory() as session:
+        last_run = await last_successful_run(session, "billing")
+    if last_run is not None and (today - last_run.date()).days > 1:
+        oldest = today - timedelta(days=settings.billing_backfill_max_days - 1)
+        since = max(last_run.date() + timedelta(days=1), oldest)
+    return await run_partitioned_billing(
+        session_factory, today, since=since, until=today if since else None, worker_prefix=default_instance()
+    )
+
+
+async def run_summary_snapshot_job(session_factory: async_sessionmaker[AsyncSession], now: datetime) -> int:
+    async with session_factory() as session:
+        await take_daily_snapshot(session, now.date() - timedelta(days=1))
+        await session.commit()
+    return 1
+
+
+async def run_late_fee_job(session_factory: async_sessionmaker[AsyncSession], now: datetime) -> int:
+    async with session_factory() as session:
+        touched = await apply_late_fees(session, now.date())
+        await session.commit()
+    return touched
+
+
+def default_jobs() -> list[Job]:
+    return [
+        Job("late_fees", CronSchedule.parse(settings.late_fee_schedule), run_late_fee_job),
+        Job("billing", CronSchedule.parse(settings.billing_schedule), run_billing_job),
+        Job("summary_snapshot", CronSchedule.parse(settings.summary_snapshot_schedule), run_summary_snapshot_job),
+    ]
+
+
+def default_instance() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def acquire_lease(
+    session_factory: async_sessionmaker[AsyncSession],
+    name: str,
+    owner: str,
+    ttl_seconds: float,
+    now: Optional[datetime] = None,
+) -> bool:
+    """Take or renew the ``job_locks`` row ``name``; False while another owner holds it."""
+    now = now or utcnow()
+    locked_until = now + timedelta(seconds=ttl_seconds)
+    async with session_factory() as session:
+        renewed = await session.execute(
+            update(JobLock)
+            .where(JobLock.name == name, or_(JobLock.owner == owner, JobLock.locked_until < now))
+            .values(owner=owner, locked_until=locked_until)
+            .execution_options(synchronize_session=False)
+        )
+        if not renewed.rowcount:
+            try:
+                await session.execute(insert(JobLock).values(name=name, owner=owner, locked_until=locked_until))
+            except IntegrityError:
+                await session.rollback()
+                return False
+        await session.commit()
+    return True
+
+
+async def release_lease(session_factory: async_sessionmaker[AsyncSession], name: str, owner: str) -> None:
+    async with session_factory() as session:
+        await session.execute(delete(JobLock).where(JobLock.name == name, JobLock.owner == owner))
+        await session.commit()
+
+
+async def run_job(
+    session_factory: async_sessionmaker[AsyncSession],
+    job: Job,
+    *,
+    instance: Optional[str] = None,
+    scheduled_for: Optional[datetime] = None,
+    now: Optional[datetime] = None,
+) -> JobRun:
+    """Run ``job`` and record the outcome in ``job_runs``.
+
+    A failing job is recorded as failed with whatever it committed before the error left
+    in place; the error does not propagate, so one broken job never stops the scheduler.
+    """
+    started_at = now or utcnow()
+    clock = time.perf_counter()
+    try:
+        rows_created = await job.run(session_factory, scheduled_for or started_at)
+        status, error = JobRunStatus.SUCCESS, None
+    except Exception as exc:  # noqa: BLE001 - recorded in job_runs
+        rows_created, status, error = 0, JobRunStatus.FAILED, f"{type(exc).__name__}: {exc}"
+    async with session_factory() as session:
+        duration_ms = int((time.perf_counter() - clock) * 1000)
+        job_run = JobRun(
+            job_name=job.name,
+            instance=instance or default_instance(),
+            scheduled_for=scheduled_for,
+            started_at=started_at,
+            finished_at=started_at + timedelta(milliseconds=duration_ms),
+            duration_ms=duration_ms,
+            status=status,
+            rows_created=rows_created,
+            error=error,
+        )
+        session.add(job_run)
+        await session.commit()
+    return job_run
+
+
+class Scheduler:
+    """Runs ``jobs`` on their cron schedules from inside the application process.
+
+    Every instance tracks the schedule, but only the holder of the ``scheduler`` lease in
+    ``job_locks`` executes jobs. The leader renews the lease on each tick; if it dies,
+    another instance takes over once ``lease_seconds`` have passed, so the lease must
+    outlast the longest job.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        jobs: Sequence[Job],
+        *,
+        instance: Optional[str] = None,
+        lease_seconds: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.jobs = list(jobs)
+        self.instance = instance or default_instance()
+        self.lease_seconds = lease_seconds or settings.scheduler_lease_seconds
+        self.poll_seconds = poll_seconds or settings.scheduler_poll_seconds
+        self._next_run: dict[str, datetime] = {}
+
+    def start(self, now: Optional[datetime] = None) -> None:
+        now = now or utcnow()
+        self._next_run = {job.name: job.schedule.next_after(now) for job in self.jobs}
+
+    async def tick(self, now: Optional[datetime] = None) -> list[JobRun]:
+        """Run the jobs that are due at ``now`` if this instance holds the lease."""
+        now = now or utcnow()
+        if not self._next_run:
+            self.start(now)
+        is_leader = await acquire_lease(self.session_factory, SCHEDULER_LEASE, self.instance, self.lease_seconds, now)
+        runs: list[JobRun] = []
+        for job in self.jobs:
+            due_at = self._next_run[job.name]
+            if due_at > now:
+                continue
+            self._next_run[job.name] = job.schedule.next_after(now)
+            if is_leader:
+                runs.append(await run_job(self.session_factory, job, instance=self.instance, scheduled_for=due_at))
+        return runs
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> float:
+        now = now or utcnow()
+        earliest = min(self._next_run.values(), default=now + timedelta(seconds=self.poll_seconds))
+        return max(0.0, min(self.poll_seconds, (earliest - now).total_seconds()))
+
+    async def run_forever(self) -> None:
+        self.start()
+        try:
+            while True:
+                await anyio.sleep(self.seconds_until_next())
+                await self.tick()
+        finally:
+            with anyio.CancelScope(shield=True):
+                await release_lease(self.session_factory, SCHEDULER_LEASE, self.instance)
+
+
+__all__ = [
+    "CronSchedule",
+    "Job",
+    "Scheduler",
+    "acquire_lease",
+    "default_jobs",
+    "last_successful_run",
+    "release_lease",
+    "run_billing_job",
+    "run_job",
+    "run_late_fee_job",
+    "run_summary_snapshot_job",
+]
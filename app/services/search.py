@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Sequence
+
+from sqlalchemy import Insert, delete, event, inspect, insert, select, text
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.driver import Driver
+from ..models.partner import Partner
+from ..models.search_entry import SearchEntry
+from ..models.vehicle import Vehicle
+from ..models.vendor import Vendor
+
+_TERM = re.compile(r"[0-9a-z]+")
+# Shortest term each full-text index can serve; shorter terms only use the LIKE check.
+_MIN_INDEXED_TERM = {"sqlite": 3, "mysql": 2}
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """How one model is indexed: identifiers are compacted, words kept apart."""
+
+    entity_type: str
+    model: Any
+    identifiers: tuple[str, ...]
+    words: tuple[str, ...]
+    label: str
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(("id", *self.identifiers, *self.words)))
+
+
+SEARCH_SOURCES: dict[str, SearchSource] = {
+    source.entity_type: source
+    for source in (
+        SearchSource("vehicle", Vehicle, ("plate", "vin", "renavam"), ("make", "model"), "{plate} {make} {model}"),
+        SearchSource("driver", Driver, ("cpf", "phone"), ("name",), "{name} ({cpf})"),
+        SearchSource("vendor", Vendor, ("phone",), ("name",), "{name}"),
+        SearchSource("partner", Partner, ("phone",), ("name",), "{name}"),
+    )
+}
+_SOURCE_BY_MODEL = {source.model: source for source in SEARCH_SOURCES.values()}
+
+
+def search_terms(value: Optional[str]) -> list[str]:
+    """Accent-free lowercase alphanumeric runs of ``value`` (``"João-9"`` -> ``["joao", "9"]``)."""
+    if not value:
+        return []
+    folded = unicodedata.normalize("NFKD", value)
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return _TERM.findall(folded.casefold())
+
+
+def search_key(source: SearchSource, values: Mapping[str, Any]) -> str:
+    parts = ["".join(search_terms(str(values.get(field) or ""))) for field in ("id", *source.identifiers)]
+    for field in source.words:
+        parts.extend(search_terms(str(values.get(field) or "")))
+    return " ".join(dict.fromkeys(part for part in parts if part))
+
+
+def search_entry_values(source: SearchSource, values: Mapping[str, Any]) -> dict[str, Any]:
+    """``search_index`` row for an entity given its column values."""
+    label = source.label.format_map({field: values.get(field) or "" for field in source.columns})
+    return {
+        "entity_type": source.entity_type,
+        "entity_id": values["id"],
+        "label": label.strip()[:200],
+        "search_key": search_key(source, values),
+    }
+
+
+def _upsert(dialect: str, row: dict[str, Any]) -> Insert:
+    changes = {"label": row["label"], "search_key": row["search_key"]}
+    if dialect == "mysql":
+        return mysql.insert(SearchEntry).values(row).on_duplicate_key_update(**changes)
+    if dialect in {"sqlite", "postgresql"}:
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        return (
+            dialect_insert(SearchEntry)
+            .values(row)
+            .on_conflict_do_update(index_elements=[SearchEntry.entity_type, SearchEntry.entity_id], set_=changes)
+        )
+    return insert(SearchEntry).values(row)
+
+
+def _index_entity(mapper: Any, connection: Connection, target: Any) -> None:
+    source = _SOURCE_BY_MODEL[mapper.class_]
+    values = {field: getattr(target, field) for field in source.columns}
+    connection.execute(_upsert(connection.dialect.name, search_entry_values(source, values)))
+
+
+def _reindex_entity(mapper: Any, connection: Connection, target: Any) -> None:
+    source = _SOURCE_BY_MODEL[mapper.class_]
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in source.columns):
+        _index_entity(mapper, connection, target)
+
+
+def _unindex_entity(mapper: Any, connection: Connection, target: Any) -> None:
+    source = _SOURCE_BY_MODEL[mapper.class_]
+    connection.execute(
+        delete(SearchEntry).where(SearchEntry.entity_type == source.entity_type, SearchEntry.entity_id == target.id)
+    )
+
+
+# Mapper events run inside the flush, so the index commits or rolls back with the entity.
+for _model in _SOURCE_BY_MODEL:
+    event.listen(_model, "after_insert", _index_entity)
+    event.listen(_model, "after_update", _reindex_entity)
+    event.listen(_model, "after_delete", _unindex_entity)
+
+
+async def rebuild_search_index(session: AsyncSession, chunk_size: int = 1000) -> int:
+    """Recreate ``search_index`` from the indexed tables; returns the entries written."""
+    await session.execute(delete(SearchEntry))
+    written = 0
+    for source in SEARCH_SOURCES.values():
+        columns = [getattr(source.model, field) for field in source.columns]
+        result = await session.stream(select(*columns).execution_options(yield_per=chunk_size))
+        async for partition in result.partitions(chunk_size):
+            rows = [search_entry_values(source, row._mapping) for row in partition]
+            await session.execute(insert(SearchEntry), rows)
+            written += len(rows)
+    return written
+
+
+async def search(
+    session: AsyncSession,
+    query: str,
+    entity_types: Optional[Sequence[str]] = None,
+    limit: int = 20,
+) -> list[SearchEntry]:
+    """Entities whose search key contains every term of ``query``.
+
+    Terms long enough for the dialect's index are matched through it (FTS5 trigram on
+    SQLite, FULLTEXT ngram on MySQL, trigram GIN serving ``LIKE`` on Postgres); every
+    term is then checked with ``LIKE``, so all dialects return the same rows.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    stmt = select(SearchEntry).where(*(SearchEntry.search_key.like(f"%{term}%") for term in terms))
+    dialect = session.get_bind().dialect.name
+    indexed = [term for term in terms if len(term) >= _MIN_INDEXED_TERM.get(dialect, len(term) + 1)]
+    if indexed and dialect == "sqlite":
+        stmt = stmt.where(
+            text(
+                "search_index.rowid IN (SELECT rowid FROM search_index_fts WHERE search_index_fts MATCH :fts_query)"
+            ).bindparams(fts_query=" AND ".join(f'"{term}"' for term in indexed))
+        )
+    elif indexed and dialect == "mysql":
+        stmt = stmt.where(SearchEntry.search_key.match(" ".join(f'+"{term}"' for term in indexed)))
+    if entity_types:
+        stmt = stmt.where(SearchEntry.entity_type.in_(entity_types))
+    stmt = stmt.order_by(SearchEntry.entity_type, SearchEntry.label, SearchEntry.entity_id).limit(limit)
+    return list((await session.execute(stmt)).scalars())
+
+
+__all__ = [
+    "SEARCH_SOURCES",
+    "SearchSource",
+    "rebuild_search_index",
+    "search",
+    "search_entry_values",
+    "search_key",
+    "search_terms",
+]
@@ -1,26 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
-from datetime import date
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from typing import Any, Awaitable, Callable
 
-from sqlalchemy import and_, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy import ColumnElement, Select, and_, case, exists, func, literal, not_, or_, select, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from ..config import settings
+from ..db import AsyncSessionLocal
 from ..models.capital import CapitalEntry, CapitalType
 from ..models.cash import CashTxn, CashTxnType
 from ..models.common import quantize_decimal
 from ..models.expense import Expense
 from ..models.rent_payment import RentPayment
+from ..models.rental import Rental
 from ..models.vehicle import Vehicle, VehicleStatus
+from ..repositories.summary_daily import SummaryDailyRepository
+from ..repositories.summary_snapshot import SummarySnapshotRepository, month_bucket
 from ..schemas.summary import (
+    SeriesGranularity,
     SummaryPartnerBalance,
     SummaryRentSeriesPoint,
     SummaryResponse,
+    SummarySeriesPoint,
+    SummarySeriesResponse,
     SummaryValuePoint,
     SummaryVehicleStatus,
 )
+from .periods import bucket_label, bucket_starts, date_bucket, next_bucket_start
+from .summary_cache import SummaryCacheEntry, summary_cache, summary_cache_key
 
 
 def _month_start(reference: date) -> date:
@@ -49,172 +60,204 @@ def _recent_month_starts(today: date, months: int = 6) -> list[date]:
     return sequence
 
 
+def default_series_start(end_date: date) -> date:
+    """Start of the six-month window the dashboard charts show by default."""
+    return _recent_month_starts(end_date)[0]
+
+
 def _month_label(reference: date) -> str:
-    return reference.strftime("%b/%y")
+    return bucket_label(reference, SeriesGranularity.MONTH)
 
 
-async def get_summary(session: AsyncSession, today: date | None = None) -> SummaryResponse:
-    today = today or date.today()
-    year_start = date(today.year, 1, 1)
+def _sum_when(condition, value=1):  # type: ignore[no-untyped-def]
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
 
-    total_stock = await session.scalar(select(func.count()).where(Vehicle.status == VehicleStatus.STOCK))
-    vehicles_rented = await session.scalar(select(func.count()).where(Vehicle.status == VehicleStatus.RENTED))
-    vehicles_sold_ytd = await session.scalar(
-        select(func.count()).where(
-            and_(
-                Vehicle.status == VehicleStatus.SOLD,
-                Vehicle.sale_date >= year_start,
-                Vehicle.sale_date <= today,
-            )
-        )
-    )
 
-    capital_in_total = await session.scalar(
-        select(func.coalesce(func.sum(CapitalEntry.amount), 0)).where(CapitalEntry.type == CapitalType.CONTRIBUTION)
-    )
-    capital_out_total = await session.scalar(
-        select(func.coalesce(func.sum(CapitalEntry.amount), 0)).where(CapitalEntry.type == CapitalType.WITHDRAWAL)
+def _status_conditions(cutoff: date | None) -> dict[VehicleStatus, ColumnElement[bool]]:
+    """Per-status vehicle predicates, reconstructed from dates when ``cutoff`` is given."""
+    if cutoff is None:
+        return {status: Vehicle.status == status for status in VehicleStatus}
+    sold = and_(Vehicle.sale_date.is_not(None), Vehicle.sale_date <= cutoff)
+    rented = and_(
+        not_(sold),
+        exists().where(
+            Rental.vehicle_id == Vehicle.id,
+            Rental.start_date <= cutoff,
+            or_(Rental.end_date.is_(None), Rental.end_date >= cutoff),
+        ),
     )
+    owned = Vehicle.acquisition_date <= cutoff
+    return {
+        VehicleStatus.STOCK: and_(owned, not_(sold), not_(rented)),
+        VehicleStatus.RENTED: and_(owned, rented),
+        VehicleStatus.SOLD: and_(owned, sold),
+    }
 
-    rent_collected_ytd = await session.scalar(
-        select(func.coalesce(func.sum(RentPayment.paid_amount), 0)).where(
+
+def _dated(column: Any, cutoff: date | None) -> ColumnElement[bool]:
+    return true() if cutoff is None else column <= cutoff
+
+
+def _kpi_statement(today: date, year_start: date, cutoff: date | None = None) -> Select:
+    """Every scalar dashboard KPI in one round trip.
+
+    Each source table is reduced to a single row with conditional aggregation and the
+    one-row derived tables are cross joined. With ``cutoff`` only rows dated on or before
+    it are counted and vehicle statuses are derived from sale and rental dates.
+    """
+    status_conditions = _status_conditions(cutoff)
+    sold_ytd = and_(
+        status_conditions[VehicleStatus.SOLD],
+        Vehicle.sale_date >= year_start,
+        Vehicle.sale_date <= today,
+    )
+    vehicle_kpis = select(
+        *(_sum_when(condition).label(f"status_{status.name.lower()}") for status, condition in status_conditions.items()),
+        _sum_when(sold_ytd).label("vehicles_sold_ytd"),
+        _sum_when(and_(sold_ytd, Vehicle.sale_price.is_not(None)), Vehicle.profit).label("profit_realized_sales_ytd"),
+    ).subquery("vehicle_kpis")
+    capital_kpis = select(
+        _sum_when(
+            and_(CapitalEntry.type == CapitalType.CONTRIBUTION, _dated(CapitalEntry.date, cutoff)), CapitalEntry.amount
+        ).label("capital_in_total"),
+        _sum_when(
+            and_(CapitalEntry.type == CapitalType.WITHDRAWAL, _dated(CapitalEntry.date, cutoff)), CapitalEntry.amount
+        ).label("capital_out_total"),
+    ).subquery("capital_kpis")
+    rent_kpis = select(
+        _sum_when(
             and_(
                 RentPayment.payment_date.is_not(None),
                 RentPayment.payment_date >= year_start,
                 RentPayment.payment_date <= today,
-            )
-        )
+            ),
+            RentPayment.paid_amount,
+        ).label("rent_collected_ytd"),
+    ).subquery("rent_kpis")
+    cash_kpis = select(
+        _sum_when(and_(CashTxn.type == CashTxnType.INFLOW, _dated(CashTxn.date, cutoff)), CashTxn.amount).label(
+            "cash_in"
+        ),
+        _sum_when(and_(CashTxn.type == CashTxnType.OUTFLOW, _dated(CashTxn.date, cutoff)), CashTxn.amount).label(
+            "cash_out"
+        ),
+    ).subquery("cash_kpis")
+    return select(vehicle_kpis, capital_kpis, rent_kpis, cash_kpis).select_from(
+        vehicle_kpis.join(capital_kpis, true()).join(rent_kpis, true()).join(cash_kpis, true())
     )
 
-    sold_stmt = (
-        select(Vehicle)
-        .options(selectinload(Vehicle.expenses))
-        .where(
-            and_(
-                Vehicle.status == VehicleStatus.SOLD,
-                Vehicle.sale_date >= year_start,
-                Vehicle.sale_date <= today,
-            )
-        )
-    )
-    sold_vehicles = (await session.execute(sold_stmt)).scalars().all()
-    profit_realized_sales_ytd = Decimal("0")
-    for vehicle in sold_vehicles:
-        vehicle.sync_status()
-        profit = vehicle.profit
-        if profit:
-            profit_realized_sales_ytd += profit
 
-    # Vehicle status breakdown (ensure all statuses are represented)
-    status_counts = {status.value: 0 for status in VehicleStatus}
-    status_rows = await session.execute(
-        select(Vehicle.status, func.count()).group_by(Vehicle.status)
-    )
-    for status, count in status_rows:
-        key = status.value if isinstance(status, VehicleStatus) else str(status)
-        status_counts[key] = int(count or 0)
-    vehicle_status_breakdown = [
-        SummaryVehicleStatus(status=status_key, count=count)
-        for status_key, count in status_counts.items()
-    ]
+async def _load_kpis(
+    session: AsyncSession, today: date, year_start: date, cutoff: date | None = None
+) -> dict[str, Any]:
+    return dict((await session.execute(_kpi_statement(today, year_start, cutoff))).mappings().one())
 
-    # Cash balance
-    cash_in = await session.scalar(
-        select(func.coalesce(func.sum(CashTxn.amount), 0)).where(CashTxn.type == CashTxnType.INFLOW)
-    )
-    cash_out = await session.scalar(
-        select(func.coalesce(func.sum(CashTxn.amount), 0)).where(CashTxn.type == CashTxnType.OUTFLOW)
-    )
-    cash_balance = quantize_decimal(Decimal(cash_in or 0) - Decimal(cash_out or 0)) or Decimal("0")
 
-    # Outstanding rent
-    open_rows = (
-        await session.execute(
-            select(RentPayment.due_amount, RentPayment.late_fee, RentPayment.paid_amount).where(
-                (RentPayment.due_amount + RentPayment.late_fee) > RentPayment.paid_amount
-            )
-        )
-    ).all()
-    outstanding_total = Decimal("0")
-    for due, late_fee, paid in open_rows:
-        due_val = Decimal(due or 0)
-        late_val = Decimal(late_fee or 0)
-        paid_val = Decimal(paid or 0)
-        balance = due_val + late_val - paid_val
-        if balance > 0:
-            outstanding_total += balance
-    outstanding_rent_total = quantize_decimal(outstanding_total) or Decimal("0")
-    open_rent_payments = len(open_rows)
-
-    # Monthly series (last 6 months)
-    month_starts = _recent_month_starts(today)
-    range_start = month_starts[0]
+def _outstanding_rent_statement(cutoff: date | None = None) -> Select:
+    """Open receivables as one aggregate, answered from ``ix_rent_payment_outstanding``.
 
-    due_map: defaultdict[tuple[int, int], Decimal] = defaultdict(lambda: Decimal("0"))
-    collected_map: defaultdict[tuple[int, int], Decimal] = defaultdict(lambda: Decimal("0"))
-    expense_map: defaultdict[tuple[int, int], Decimal] = defaultdict(lambda: Decimal("0"))
+    With ``cutoff`` the balance is rebuilt from charges billed and payments received by that
+    date, which needs a scan of the earlier payments instead of the index.
+    """
+    if cutoff is None:
+        balance: ColumnElement[Any] = RentPayment.outstanding_amount
+        billed: ColumnElement[bool] = true()
+    else:
+        paid = case((RentPayment.payment_date <= cutoff, RentPayment.paid_amount), else_=0)
+        balance = RentPayment.due_amount + RentPayment.late_fee - paid
+        billed = RentPayment.period_start <= cutoff
+    return select(func.coalesce(func.sum(balance), 0), func.count()).where(billed, balance > 0)
 
-    rent_due_rows = (
-        await session.execute(
-            select(RentPayment.period_start, RentPayment.due_amount, RentPayment.late_fee).where(
-                RentPayment.period_start >= range_start
-            )
-        )
-    ).all()
-    for period_start, due_amount, late_fee in rent_due_rows:
-        if not period_start:
-            continue
-        key = (period_start.year, period_start.month)
-        due_val = Decimal(due_amount or 0)
-        late_val = Decimal(late_fee or 0)
-        due_map[key] += due_val + late_val
 
-    rent_paid_rows = (
-        await session.execute(
-            select(RentPayment.payment_date, RentPayment.paid_amount).where(
-                and_(
-                    RentPayment.payment_date.is_not(None),
-                    RentPayment.payment_date >= range_start,
-                )
-            )
-        )
-    ).all()
-    for payment_date, paid_amount in rent_paid_rows:
-        if not payment_date:
-            continue
-        key = (payment_date.year, payment_date.month)
-        collected_map[key] += Decimal(paid_amount or 0)
+async def _load_outstanding_rent(session: AsyncSession, cutoff: date | None = None) -> tuple[Decimal, int]:
+    outstanding_total, open_count = (await session.execute(_outstanding_rent_statement(cutoff))).one()
+    return quantize_decimal(Decimal(outstanding_total or 0)) or Decimal("0"), int(open_count or 0)
 
-    expense_rows = (
-        await session.execute(
-            select(Expense.date, Expense.amount).where(Expense.date >= range_start)
+
+def _series_statement(start: date, end: date, granularity: SeriesGranularity) -> Select:
+    """Rent due, rent collected and expenses summed per bucket in one round trip.
+
+    Each branch groups on the truncated date in the database, so the result has at most
+    three rows per bucket regardless of how many payments or expenses fall in the range.
+    """
+    due_bucket = date_bucket(granularity, RentPayment.period_start)
+    collected_bucket = date_bucket(granularity, RentPayment.payment_date)
+    expense_bucket = date_bucket(granularity, Expense.date)
+    return union_all(
+        select(
+            literal("rent_due").label("series"),
+            due_bucket.label("bucket"),
+            func.sum(RentPayment.due_amount + RentPayment.late_fee).label("total"),
         )
-    ).all()
-    for expense_date, amount in expense_rows:
-        if not expense_date:
+        .where(RentPayment.period_start >= start, RentPayment.period_start <= end)
+        .group_by(due_bucket),
+        select(
+            literal("rent_collected"),
+            collected_bucket,
+            func.sum(RentPayment.paid_amount),
+        )
+        .where(
+            RentPayment.payment_date.is_not(None),
+            RentPayment.payment_date >= start,
+            RentPayment.payment_date <= end,
+        )
+        .group_by(collected_bucket),
+        select(
+            literal("expenses"),
+            expense_bucket,
+            func.sum(Expense.amount),
+        )
+        .where(Expense.date >= start, Expense.date <= end)
+        .group_by(expense_bucket),
+    )
+
+
+async def _load_series(
+    session: AsyncSession, start: date, end: date, granularity: SeriesGranularity
+) -> list[SummarySeriesPoint]:
+    totals: defaultdict[tuple[str, date], Decimal] = defaultdict(lambda: Decimal("0"))
+    for series, bucket, total in await session.execute(_series_statement(start, end, granularity)):
+        if bucket is None:
             continue
-        key = (expense_date.year, expense_date.month)
-        expense_map[key] += Decimal(amount or 0)
+        if isinstance(bucket, str):
+            bucket = date.fromisoformat(bucket)
+        elif isinstance(bucket, datetime):
+            bucket = bucket.date()
+        totals[(series, bucket)] += Decimal(total or 0)
 
-    rent_collection_last_6_months: list[SummaryRentSeriesPoint] = []
-    expenses_last_6_months: list[SummaryValuePoint] = []
-    for month_start in month_starts:
-        key = (month_start.year, month_start.month)
-        rent_collection_last_6_months.append(
-            SummaryRentSeriesPoint(
-                label=_month_label(month_start),
-                due=quantize_decimal(due_map[key]) or Decimal("0"),
-                collected=quantize_decimal(collected_map[key]) or Decimal("0"),
-            )
-        )
-        expenses_last_6_months.append(
-            SummaryValuePoint(
-                label=_month_label(month_start),
-                value=quantize_decimal(expense_map[key]) or Decimal("0"),
+    points: list[SummarySeriesPoint] = []
+    for bucket in bucket_starts(start, end, granularity):
+        points.append(
+            SummarySeriesPoint(
+                label=bucket_label(bucket, granularity),
+                start=bucket,
+                end=next_bucket_start(bucket, granularity) - timedelta(days=1),
+                rent_due=quantize_decimal(totals[("rent_due", bucket)]) or Decimal("0"),
+                rent_collected=quantize_decimal(totals[("rent_collected", bucket)]) or Decimal("0"),
+                expenses=quantize_decimal(totals[("expenses", bucket)]) or Decimal("0"),
             )
         )
+    return points
+
+
+async def _load_monthly_series(
+    session: AsyncSession, month_starts: list[date], cutoff: date | None = None
+) -> tuple[list[SummaryRentSeriesPoint], list[SummaryValuePoint]]:
+    range_end = _next_month_start(month_starts[-1]) - timedelta(days=1)
+    if cutoff is not None:
+        range_end = min(range_end, cutoff)
+    points = await _load_series(session, month_starts[0], range_end, SeriesGranularity.MONTH)
+    rent_series = [
+        SummaryRentSeriesPoint(label=point.label, due=point.rent_due, collected=point.rent_collected)
+        for point in points
+    ]
+    expense_series = [SummaryValuePoint(label=point.label, value=point.expenses) for point in points]
+    return rent_series, expense_series
+
 
-    # Expenses grouped by category (YTD)
+async def _load_expenses_by_category(
+    session: AsyncSession, today: date, year_start: date
+) -> list[SummaryValuePoint]:
     category_rows = (
         await session.execute(
             select(Expense.category, func.coalesce(func.sum(Expense.amount), 0)).where(
@@ -222,7 +265,7 @@ async def get_summary(session: AsyncSession, today: date | None = None) -> Summa
             ).group_by(Expense.category)
         )
     ).all()
-    expenses_by_category_ytd = [
+    return [
         SummaryValuePoint(
             label=category.value if hasattr(category, "value") else str(category),
             value=quantize_decimal(Decimal(total or 0)) or Decimal("0"),
@@ -230,14 +273,19 @@ async def get_summary(session: AsyncSession, today: date | None = None) -> Summa
         for category, total in category_rows
     ]
 
-    # Capital balance per partner
+
+async def _load_partner_balances(
+    session: AsyncSession, cutoff: date | None = None
+) -> list[SummaryPartnerBalance]:
     capital_rows = (
         await session.execute(
             select(
                 CapitalEntry.partner,
                 CapitalEntry.type,
                 func.coalesce(func.sum(CapitalEntry.amount), 0),
-            ).group_by(CapitalEntry.partner, CapitalEntry.type)
+            )
+            .where(_dated(CapitalEntry.date, cutoff))
+            .group_by(CapitalEntry.partner, CapitalEntry.type)
         )
     ).all()
     capital_totals: dict[str, dict[str, Decimal]] = {}
@@ -248,7 +296,7 @@ async def get_summary(session: AsyncSession, today: date | None = None) -> Summa
             bucket["contribution"] += decimal_amount
         else:
             bucket["withdrawal"] += decimal_amount
-    capital_balance_by_partner = [
+    return [
         SummaryPartnerBalance(
             partner=partner,
             contribution_total=quantize_decimal(values["contribution"]) or Decimal("0"),
@@ -258,14 +306,77 @@ async def get_summary(session: AsyncSession, today: date | None = None) -> Summa
         for partner, values in sorted(capital_totals.items())
     ]
 
+
+async def get_summary(
+    session: AsyncSession,
+    today: date | None = None,
+    *,
+    point_in_time: bool = False,
+    parallel: bool = False,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+    max_connections: int | None = None,
+) -> SummaryResponse:
+    """Compute the dashboard from the source tables.
+
+    With ``point_in_time=True`` the dashboard is rebuilt as it stood at the end of
+    ``today``: later rows are ignored, vehicle statuses come from sale and rental dates and
+    rent balances only count payments received by then.
+
+    With ``parallel=True`` the independent query groups run concurrently, each on its own
+    short-lived session from ``session_factory`` (``AsyncSessionLocal`` by default), and at
+    most ``max_connections`` pool connections are held at once. Groups then read from
+    separate transactions.
+    """
+    today = today or date.today()
+    year_start = date(today.year, 1, 1)
+    month_starts = _recent_month_starts(today)
+    cutoff = today if point_in_time else None
+
+    groups: tuple[tuple[Callable[..., Awaitable[Any]], tuple[Any, ...]], ...] = (
+        (_load_kpis, (today, year_start, cutoff)),
+        (_load_outstanding_rent, (cutoff,)),
+        (_load_monthly_series, (month_starts, cutoff)),
+        (_load_expenses_by_category, (today, year_start)),
+        (_load_partner_balances, (cutoff,)),
+    )
+    if parallel:
+        factory = session_factory or AsyncSessionLocal
+        limit = asyncio.Semaphore(max_connections or settings.summary_max_connections)
+
+        async def run(loader: Callable[..., Awaitable[Any]], args: tuple[Any, ...]) -> Any:
+            async with limit:
+                async with factory() as group_session:
+                    return await loader(group_session, *args)
+
+        results = await asyncio.gather(*(run(loader, args) for loader, args in groups))
+    else:
+        results = [await loader(session, *args) for loader, args in groups]
+
+    (
+        kpis,
+        (outstanding_rent_total, open_rent_payments),
+        (rent_collection_last_6_months, expenses_last_6_months),
+        expenses_by_category_ytd,
+        capital_balance_by_partner,
+    ) = results
+
+    # Vehicle status breakdown (ensure all statuses are represented)
+    vehicle_status_breakdown = [
+        SummaryVehicleStatus(status=status.value, count=int(kpis[f"status_{status.name.lower()}"] or 0))
+        for status in VehicleStatus
+    ]
+
+    # Cash balance
+    cash_balance = quantize_decimal(Decimal(kpis["cash_in"] or 0) - Decimal(kpis["cash_out"] or 0)) or Decimal("0")
+
     return SummaryResponse(
-        total_vehicles_stock=int(total_stock or 0),
-        vehicles_rented=int(vehicles_rented or 0),
-        vehicles_sold_ytd=int(vehicles_sold_ytd or 0),
-        capital_in_total=quantize_decimal(capital_in_total) or Decimal("0"),
-        capital_out_total=quantize_decimal(capital_out_total) or Decimal("0"),
-        rent_collected_ytd=quantize_decimal(rent_collected_ytd) or Decimal("0"),
-        profit_realized_sales_ytd=quantize_decimal(profit_realized_sales_ytd) or Decimal("0"),
+        total_vehicles_stock=int(kpis["status_stock"] or 0),
+        vehicles_rented=int(kpis["status_rented"] or 0),
+        vehicles_sold_ytd=int(kpis["vehicles_sold_ytd"] or 0),
+        capital_in_total=quantize_decimal(kpis["capital_in_total"]) or Decimal("0"),
+        capital_out_total=quantize_decimal(kpis["capital_out_total"]) or Decimal("0"),
+        rent_collected_ytd=quantize_decimal(kpis["rent_collected_ytd"]) or Decimal("0"),
+        profit_realized_sales_ytd=quantize_decimal(kpis["profit_realized_sales_ytd"]) or Decimal("0"),
         outstanding_rent_total=outstanding_rent_total,
         open_rent_payments=open_rent_payments,
         cash_balance=cash_balance,
@@ -275,3 +386,203 @@ async def get_summary(session: AsyncSession, today: date | None = None) -> Summa
         expenses_by_category_ytd=expenses_by_category_ytd,
         capital_balance_by_partner=capital_balance_by_partner,
     )
+
+
+async def get_summary_series(
+    session: AsyncSession,
+    start_date: date,
+    end_date: date,
+    granularity: SeriesGranularity = SeriesGranularity.MONTH,
+) -> SummarySeriesResponse:
+    """Rent and expense series over an arbitrary inclusive date range.
+
+    Buckets that only partially overlap the range cover just the dates inside it.
+    """
+    return SummarySeriesResponse(
+        granularity=granularity,
+        start_date=start_date,
+        end_date=end_date,
+        points=await _load_series(session, start_date, end_date, granularity),
+    )
+
+
+async def take_daily_snapshot(session: AsyncSession, day: date | None = None) -> SummaryResponse:
+    """Store the dashboard as it stood at the end of ``day`` (yesterday by default)."""
+    day = day or date.today() - timedelta(days=1)
+    payload = await get_summary(session, today=day, point_in_time=True)
+    await SummaryDailyRepository(session).save(day, payload.model_dump(mode="json"))
+    return payload
+
+
+async def get_summary_as_of(session: AsyncSession, day: date) -> SummaryResponse:
+    """Historical dashboard from the daily snapshot, computed on the fly when missing."""
+    stored = await SummaryDailyRepository(session).get_payload(day)
+    if stored is not None:
+        return SummaryResponse.model_validate(stored)
+    return await get_summary(session, today=day, point_in_time=True)
+
+
+async def get_cached_summary(session: AsyncSession, as_of: date | None = None) -> SummaryCacheEntry:
+    """Dashboard for today (or a past ``as_of`` day) through the process-level cache.
+
+    The source follows ``SUMMARY_SOURCE``; both only read.
+    """
+    today = date.today()
+    historical = as_of is not None and as_of < today
+    key = summary_cache_key("as_of" if historical else settings.summary_source, as_of or today)
+    entry = summary_cache.get(key)
+    if entry is not None:
+        return entry
+    generation = summary_cache.generation
+    if historical:
+        payload = await get_summary_as_of(session, as_of)
+    elif settings.summary_source == "snapshot":
+        payload = await get_summary_snapshot(session, today=today)
+    else:
+        payload = await get_summary(session, today=today, parallel=settings.summary_parallel)
+    return summary_cache.store(key, payload, generation)
+
+
+async def rebuild_summary_snapshot(session: AsyncSession) -> int:
+    """Recompute every dashboard counter from the source tables."""
+    return await SummarySnapshotRepository(session).rebuild()
+
+
+async def _later_this_month(session: AsyncSession, today: date) -> dict[str, Any]:
+    """YTD amounts dated after ``today`` but inside its month, which monthly counters include.
+
+    Only rows in the few remaining days of the month are read, through the date indexes.
+    """
+    later = (today, _next_month_start(today) - timedelta(days=1))
+    sold = (
+        await session.execute(
+            select(func.count(), func.coalesce(func.sum(Vehicle.profit), 0)).where(
+                Vehicle.status == VehicleStatus.SOLD, Vehicle.sale_date > later[0], Vehicle.sale_date <= later[1]
+            )
+        )
+    ).one()
+    collected = await session.scalar(
+        select(func.coalesce(func.sum(RentPayment.paid_amount), 0)).where(
+            RentPayment.payment_date > later[0], RentPayment.payment_date <= later[1]
+        )
+    )
+    categories = (
+        await session.execute(
+            select(Expense.category, func.sum(Expense.amount))
+            .where(Expense.date > later[0], Expense.date <= later[1])
+            .group_by(Expense.category)
+        )
+    ).all()
+    return {
+        "vehicles_sold_ytd": Decimal(sold[0] or 0),
+        "sales_profit_ytd": Decimal(sold[1] or 0),
+        "rent_collected_ytd": Decimal(collected or 0),
+        "expenses": {
+            category.value if hasattr(category, "value") else str(category): Decimal(amount or 0)
+            for category, amount in categories
+        },
+    }
+
+
+async def get_summary_snapshot(session: AsyncSession, today: date | None = None) -> SummaryResponse:
+    """Build the dashboard from the pre-aggregated ``summary_counters`` table.
+
+    Counters are kept per calendar month, so YTD figures subtract what is dated later in
+    the current month to match ``get_summary``. Like the live dashboard, the six-month
+    series cover whole months and all-time totals (cash, capital) include future-dated
+    entries. Reading never writes: until the counters have been built (migration 0006 or
+    ``python -m app.scripts.rebuild_summary``) the live dashboard is returned.
+    """
+    today = today or date.today()
+    repo = SummarySnapshotRepository(session)
+    if not await repo.is_built():
+        return await get_summary(session, today=today)
+
+    month_starts = _recent_month_starts(today)
+    year_bucket = month_bucket(date(today.year, 1, 1))
+    current_bucket = month_bucket(today)
+    rows = await repo.read(min(year_bucket, month_bucket(month_starts[0])))
+
+    totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
+    monthly: defaultdict[tuple[str, str], Decimal] = defaultdict(lambda: Decimal("0"))
+    status_counts = {status.value: 0 for status in VehicleStatus}
+    category_totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
+    capital_totals: dict[str, dict[str, Decimal]] = {}
+
+    for metric, bucket, dimension, value in rows:
+        value = Decimal(value or 0)
+        ytd = year_bucket <= bucket <= current_bucket
+        if metric == "vehicles_status":
+            status_counts[dimension] = int(value)
+        elif metric in {"capital_contribution", "capital_withdrawal"}:
+            totals[metric] += value
+            bucket_totals = capital_totals.setdefault(
+                dimension, {"contribution": Decimal("0"), "withdrawal": Decimal("0")}
+            )
+            bucket_totals["contribution" if metric == "capital_contribution" else "withdrawal"] += value
+        elif not bucket:
+            totals[metric] += value
+        else:
+            monthly[(metric, bucket)] += value
+            if ytd:
+                totals[f"{metric}_ytd"] += value
+                if metric == "expenses":
+                    category_totals[dimension] += value
+
+    later = await _later_this_month(session, today)
+    for metric in ("vehicles_sold_ytd", "sales_profit_ytd", "rent_collected_ytd"):
+        totals[metric] -= later[metric]
+    for category, amount in later["expenses"].items():
+        category_totals[category] -= amount
+
+    rent_collection_last_6_months: list[SummaryRentSeriesPoint] = []
+    expenses_last_6_months: list[SummaryValuePoint] = []
+    for month_start in month_starts:
+        bucket = month_bucket(month_start)
+        rent_collection_last_6_months.append(
+            SummaryRentSeriesPoint(
+                label=_month_label(month_start),
+                due=quantize_decimal(monthly[("rent_due", bucket)]) or Decimal("0"),
+                collected=quantize_decimal(monthly[("rent_collected", bucket)]) or Decimal("0"),
+            )
+        )
+        expenses_last_6_months.append(
+            SummaryValuePoint(
+                label=_month_label(month_start),
+                value=quantize_decimal(monthly[("expenses", bucket)]) or Decimal("0"),
+            )
+        )
+
+    cash_balance = quantize_decimal(totals["cash_inflow"] - totals["cash_outflow"]) or Decimal("0")
+    return SummaryResponse(
+        total_vehicles_stock=status_counts[VehicleStatus.STOCK.value],
+        vehicles_rented=status_counts[VehicleStatus.RENTED.value],
+        vehicles_sold_ytd=int(totals["vehicles_sold_ytd"]),
+        capital_in_total=quantize_decimal(totals["capital_contribution"]) or Decimal("0"),
+        capital_out_total=quantize_decimal(totals["capital_withdrawal"]) or Decimal("0"),
+        rent_collected_ytd=quantize_decimal(totals["rent_collected_ytd"]) or Decimal("0"),
+        profit_realized_sales_ytd=quantize_decimal(totals["sales_profit_ytd"]) or Decimal("0"),
+        outstanding_rent_total=quantize_decimal(totals["rent_outstanding"]) or Decimal("0"),
+        open_rent_payments=int(totals["rent_open"]),
+        cash_balance=cash_balance,
+        vehicle_status_breakdown=[
+            SummaryVehicleStatus(status=status_key, count=count) for status_key, count in status_counts.items()
+        ],
+        rent_collection_last_6_months=rent_collection_last_6_months,
+        expenses_last_6_months=expenses_last_6_months,
+        expenses_by_category_ytd=[
+            SummaryValuePoint(label=category, value=quantize_decimal(total) or Decimal("0"))
+            for category, total in sorted(category_totals.items())
+            if total
+        ],
+        capital_balance_by_partner=[
+            SummaryPartnerBalance(
+                partner=partner,
+                contribution_total=quantize_decimal(values["contribution"]) or Decimal("0"),
+                withdrawal_total=quantize_decimal(values["withdrawal"]) or Decimal("0"),
+                balance=quantize_decimal(values["contribution"] - values["withdrawal"]) or Decimal("0"),
+            )
+            for partner, values in sorted(capital_totals.items())
+            if values["contribution"] or values["withdrawal"]
+        ],
+    )
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import date
+from typing import Any, Hashable, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..schemas.summary import SummaryResponse
+
+SUMMARY_CHANGED = "summary_changed"
+
+
+class SummaryCacheEntry(NamedTuple):
+    payload: SummaryResponse
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class SummaryCache:
+    """Process-level cache of the computed dashboard.
+
+    Entries expire after ``ttl_seconds`` and are dropped as soon as a session that wrote
+    summary-relevant rows commits. Every invalidation bumps :attr:`generation`, so a result
+    computed while a write was committing is never stored.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[Hashable, SummaryCacheEntry] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[SummaryCacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return entry
+
+    def store(self, key: Hashable, payload: SummaryResponse, generation: int) -> SummaryCacheEntry:
+        body = payload.model_dump_json().encode()
+        entry = SummaryCacheEntry(
+            payload=payload,
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        if self.ttl_seconds > 0 and generation == self._generation:
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+
+summary_cache = SummaryCache(settings.summary_cache_ttl)
+
+
+def summary_cache_key(source: str, today: date) -> tuple[str, date]:
+    return source, today
+
+
+def mark_summary_changed(session: Any) -> None:
+    """Flag ``session`` so the dashboard cache is invalidated when it commits."""
+    session.info[SUMMARY_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop(SUMMARY_CHANGED, False):
+        summary_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session: Session) -> None:
+    session.info.pop(SUMMARY_CHANGED, None)
+
+
+__all__ = [
+    "SummaryCache",
+    "SummaryCacheEntry",
+    "mark_summary_changed",
+    "summary_cache",
+    "summary_cache_key",
+]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import anyio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config import settings
+from .summary import get_cached_summary
+from .summary_cache import summary_cache
+
+
+def format_event(event: str, data: Any, event_id: int | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def summary_events(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    interval: float | None = None,
+    keepalive: float | None = None,
+) -> AsyncIterator[str]:
+    """Server-Sent Events carrying the dashboard KPIs that changed.
+
+    The first event holds the full summary. Afterwards the cache generation, bumped by
+    every commit that touches summary data, is checked once per ``interval``. A burst of
+    commits within one interval therefore yields a single event, and the recomputation is
+    shared with ``/summary`` and every other open stream through the cache.
+
+    The generation only sees commits made by this process, so the summary is also
+    recomputed once the cached entry's TTL has passed; that picks up writes from the
+    scheduler and other workers, and the date rolling over. Unchanged KPIs send nothing.
+    """
+    interval = interval or settings.summary_stream_interval
+    keepalive = keepalive or settings.summary_stream_keepalive
+    last: dict[str, Any] = {}
+    seen_generation: int | None = None
+    expires_at = 0.0
+    idle = 0.0
+    while True:
+        generation = summary_cache.generation
+        if generation != seen_generation or time.monotonic() >= expires_at:
+            seen_generation = generation
+            async with session_factory() as session:
+                entry = await get_cached_summary(session)
+                await session.commit()
+            expires_at = entry.expires_at
+            current = entry.payload.model_dump(mode="json")
+            changed = {key: value for key, value in current.items() if last.get(key) != value}
+            last = current
+            if changed:
+                yield format_event("summary", changed, generation)
+                idle = 0.0
+        if idle >= keepalive:
+            yield ": keepalive\n\n"
+            idle = 0.0
+        await anyio.sleep(interval)
+        idle += interval
+
+
+__all__ = ["format_event", "summary_events"]
@@ -0,0 +1,34 @@
+"""add summary counters table"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_summary_counters"
+down_revision = "0005_partners"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The table starts empty; the first /summary request (or
+    # `python -m app.scripts.rebuild_summary`) builds the snapshot.
+    op.create_table(
+        "summary_counters",
+        sa.Column("metric", sa.String(length=40), primary_key=True),
+        sa.Column("bucket", sa.String(length=7), primary_key=True),
+        sa.Column("dimension", sa.String(length=100), primary_key=True),
+        sa.Column("value", sa.Numeric(14, 2), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            onupdate=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("summary_counters")
@@ -0,0 +1,37 @@
+"""add stored outstanding amount to rent payments"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_rent_outstanding"
+down_revision = "0006_summary_counters"
+branch_labels = None
+depends_on = None
+
+
+def _outstanding_column() -> sa.Column:
+    return sa.Column(
+        "outstanding_amount",
+        sa.Numeric(11, 2),
+        sa.Computed("due_amount + late_fee - paid_amount", persisted=True),
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        # SQLite cannot ALTER TABLE ADD a STORED generated column; batch mode rebuilds the table.
+        with op.batch_alter_table("rent_payments", recreate="always") as batch_op:
+            batch_op.add_column(_outstanding_column())
+    else:
+        op.add_column("rent_payments", _outstanding_column())
+    op.create_index("ix_rent_payment_outstanding", "rent_payments", ["outstanding_amount"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rent_payment_outstanding", table_name="rent_payments")
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table("rent_payments", recreate="always") as batch_op:
+            batch_op.drop_column("outstanding_amount")
+    else:
+        op.drop_column("rent_payments", "outstanding_amount")
@@ -0,0 +1,92 @@
+"""make rent payment periods unique per rental"""
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_payment_period_unique"
+down_revision = "0008_summary_daily"
+branch_labels = None
+depends_on = None
+
+
+rent_payments_table = sa.table(
+    "rent_payments",
+    sa.column("id", sa.String(length=12)),
+    sa.column("rental_id", sa.String(length=12)),
+    sa.column("period_start", sa.Date()),
+    sa.column("period_end", sa.Date()),
+    sa.column("paid_amount", sa.Numeric(10, 2)),
+    sa.column("late_fee", sa.Numeric(10, 2)),
+    sa.column("payment_date", sa.Date()),
+)
+
+summary_counters_table = sa.table(
+    "summary_counters",
+    sa.column("metric", sa.String(length=40)),
+)
+
+
+def _deduplicate(conn: sa.engine.Connection) -> int:
+    """Fold duplicate charges into one row per period.
+
+    The row with the largest payment is kept; payments recorded on the duplicates are
+    added to it so no received money disappears.
+    """
+    rp = rent_payments_table
+    duplicated = (
+        sa.select(rp.c.rental_id, rp.c.period_start, rp.c.period_end)
+        .group_by(rp.c.rental_id, rp.c.period_start, rp.c.period_end)
+        .having(sa.func.count() > 1)
+        .subquery()
+    )
+    rows = conn.execute(
+        sa.select(rp.c.id, rp.c.rental_id, rp.c.period_start, rp.c.period_end, rp.c.paid_amount, rp.c.late_fee, rp.c.payment_date)
+        .join(
+            duplicated,
+            sa.and_(
+                rp.c.rental_id == duplicated.c.rental_id,
+                rp.c.period_start == duplicated.c.period_start,
+                rp.c.period_end == duplicated.c.period_end,
+            ),
+        )
+        .order_by(rp.c.rental_id, rp.c.period_start, rp.c.period_end, rp.c.paid_amount.desc(), rp.c.id)
+    ).all()
+
+    groups: defaultdict[tuple, list] = defaultdict(list)
+    for row in rows:
+        groups[(row.rental_id, row.period_start, row.period_end)].append(row)
+
+    removed: list[str] = []
+    for keeper, *duplicates in groups.values():
+        paid = sum((Decimal(row.paid_amount or 0) for row in duplicates), Decimal(keeper.paid_amount or 0))
+        late_fee = max(Decimal(row.late_fee or 0) for row in (keeper, *duplicates))
+        payment_dates = [row.payment_date for row in (keeper, *duplicates) if row.payment_date]
+        conn.execute(
+            rp.update()
+            .where(rp.c.id == keeper.id)
+            .values(paid_amount=paid, late_fee=late_fee, payment_date=max(payment_dates) if payment_dates else None)
+        )
+        removed.extend(row.id for row in duplicates)
+
+    if removed:
+        conn.execute(rp.delete().where(rp.c.id.in_(removed)))
+        # Drop the snapshot marker so the dashboard counters are rebuilt on next read.
+        conn.execute(summary_counters_table.delete().where(summary_counters_table.c.metric == "snapshot"))
+    return len(removed)
+
+
+def upgrade() -> None:
+    _deduplicate(op.get_bind())
+    op.create_unique_constraint(
+        "uq_rent_payment_period",
+        "rent_payments",
+        ["rental_id", "period_start", "period_end"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_rent_payment_period", "rent_payments", type_="unique")
@@ -0,0 +1,39 @@
+"""add scheduler run history and lock tables"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_job_runs"
+down_revision = "0009_payment_period_unique"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_runs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("job_name", sa.String(length=50), nullable=False),
+        sa.Column("instance", sa.String(length=100), nullable=False),
+        sa.Column("scheduled_for", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.Column("status", sa.Enum("SUCCESS", "FAILED", name="job_run_status"), nullable=False),
+        sa.Column("rows_created", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_job_runs_job_started", "job_runs", ["job_name", "started_at"])
+    op.create_table(
+        "job_locks",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("owner", sa.String(length=100), nullable=False),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_locks")
+    op.drop_index("ix_job_runs_job_started", table_name="job_runs")
+    op.drop_table("job_runs")
@@ -0,0 +1,37 @@
+"""add billing partitions table"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_billing_partitions"
+down_revision = "0010_job_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "billing_partitions",
+        sa.Column("run_key", sa.String(length=40), primary_key=True),
+        sa.Column("partition_no", sa.Integer(), primary_key=True),
+        sa.Column("rental_id_after", sa.String(length=12), nullable=True),
+        sa.Column("rental_id_upto", sa.String(length=12), nullable=True),
+        sa.Column("status", sa.Enum("PENDING", "DONE", name="billing_partition_status"), nullable=False),
+        sa.Column("owner", sa.String(length=100), nullable=True),
+        sa.Column("lease_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("rows_created", sa.Integer(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            onupdate=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("billing_partitions")
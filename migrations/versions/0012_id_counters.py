@@ -0,0 +1,55 @@
+"""add id counters for hi-lo id allocation"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012_id_counters"
+down_revision = "0011_billing_partitions"
+branch_labels = None
+depends_on = None
+
+
+ID_PREFIXES = {
+    "CAR": "vehicles",
+    "DRV": "drivers",
+    "EXP": "expenses",
+    "PAY": "rent_payments",
+    "CSH": "cash_txns",
+    "RENT": "rentals",
+    "CAP": "capital_entries",
+    "PRT": "partners",
+    "VND": "vendors",
+}
+
+
+def _last_number(conn: sa.engine.Connection, table_name: str, prefix: str) -> int:
+    """Highest numeric suffix in use; ids are compared as numbers, not strings."""
+    table = sa.table(table_name, sa.column("id", sa.String(length=12)))
+    last = 0
+    for (entity_id,) in conn.execute(sa.select(table.c.id).where(table.c.id.like(f"{prefix}-%"))):
+        suffix = entity_id.split("-", 1)[1]
+        if suffix.isdigit():
+            last = max(last, int(suffix))
+    return last
+
+
+def upgrade() -> None:
+    counters = op.create_table(
+        "id_counters",
+        sa.Column("prefix", sa.String(length=8), primary_key=True),
+        sa.Column("next_value", sa.BigInteger(), nullable=False),
+    )
+    conn = op.get_bind()
+    rows = []
+    for prefix, table_name in ID_PREFIXES.items():
+        last = _last_number(conn, table_name, prefix)
+        # Empty tables are seeded on first use, after any explicit seed ids.
+        if last:
+            rows.append({"prefix": prefix, "next_value": last + 1})
+    if rows:
+        op.bulk_insert(counters, rows)
+
+
+def downgrade() -> None:
+    op.drop_table("id_counters")
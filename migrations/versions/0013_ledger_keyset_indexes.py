@@ -0,0 +1,21 @@
+"""add (created_at, id) indexes for keyset pagination of ledgers"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0013_ledger_keyset_indexes"
+down_revision = "0012_id_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_cash_txn_created_id", "cash_txns", ["created_at", "id"])
+    op.create_index("ix_expense_created_id", "expenses", ["created_at", "id"])
+    op.create_index("ix_rent_payment_created_id", "rent_payments", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rent_payment_created_id", table_name="rent_payments")
+    op.drop_index("ix_expense_created_id", table_name="expenses")
+    op.drop_index("ix_cash_txn_created_id", table_name="cash_txns")
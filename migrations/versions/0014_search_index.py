@@ -0,0 +1,108 @@
+"""add search_index with a dialect-native substring index"""
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0014_search_index"
+down_revision = "0013_ledger_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE search_index_fts USING fts5("
+    "search_key, content='search_index', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER search_index_ai AFTER INSERT ON search_index BEGIN "
+    "INSERT INTO search_index_fts(rowid, search_key) VALUES (new.rowid, new.search_key); END",
+    "CREATE TRIGGER search_index_ad AFTER DELETE ON search_index BEGIN "
+    "INSERT INTO search_index_fts(search_index_fts, rowid, search_key) "
+    "VALUES ('delete', old.rowid, old.search_key); END",
+    "CREATE TRIGGER search_index_au AFTER UPDATE ON search_index BEGIN "
+    "INSERT INTO search_index_fts(search_index_fts, rowid, search_key) "
+    "VALUES ('delete', old.rowid, old.search_key); "
+    "INSERT INTO search_index_fts(rowid, search_key) VALUES (new.rowid, new.search_key); END",
+)
+
+# entity_type: (table, identifiers, words, label)
+SEARCH_SOURCES = {
+    "vehicle": ("vehicles", ("plate", "vin", "renavam"), ("make", "model"), "{plate} {make} {model}"),
+    "driver": ("drivers", ("cpf", "phone"), ("name",), "{name} ({cpf})"),
+    "vendor": ("vendors", ("phone",), ("name",), "{name}"),
+    "partner": ("partners", ("phone",), ("name",), "{name}"),
+}
+_TERM = re.compile(r"[0-9a-z]+")
+
+
+def _terms(value: object) -> list[str]:
+    folded = unicodedata.normalize("NFKD", str(value or ""))
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return _TERM.findall(folded.casefold())
+
+
+def _entry(entity_type: str, values: dict, identifiers: tuple, words: tuple, label: str) -> dict:
+    """Same key and label as ``search_entry_values`` at the time of this revision."""
+    parts = ["".join(_terms(values[field])) for field in ("id", *identifiers)]
+    for field in words:
+        parts.extend(_terms(values[field]))
+    return {
+        "entity_type": entity_type,
+        "entity_id": values["id"],
+        "label": label.format_map({field: value or "" for field, value in values.items()}).strip()[:200],
+        "search_key": " ".join(dict.fromkeys(part for part in parts if part)),
+    }
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    entries = op.create_table(
+        "search_index",
+        sa.Column("entity_type", sa.String(length=20), primary_key=True),
+        sa.Column("entity_id", sa.String(length=12), primary_key=True),
+        sa.Column("label", sa.String(length=200), nullable=False),
+        sa.Column("search_key", sa.Text(), nullable=False),
+    )
+    if dialect == "mysql":
+        # The ngram parser drops every token containing a stopword ("a", "de", "to"...),
+        # which hides plates and names; InnoDB fixes the stopword list at index creation.
+        op.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+        op.create_index(
+            "ix_search_index_fulltext",
+            "search_index",
+            ["search_key"],
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        )
+    elif dialect == "postgresql":
+        op.create_index(
+            "ix_search_index_trgm",
+            "search_index",
+            ["search_key"],
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        )
+    elif dialect == "sqlite":
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+
+    conn = op.get_bind()
+    for entity_type, (table_name, identifiers, words, label) in SEARCH_SOURCES.items():
+        fields = tuple(dict.fromkeys(("id", *identifiers, *words)))
+        table = sa.table(table_name, *(sa.column(field) for field in fields))
+        rows = [
+            _entry(entity_type, dict(row._mapping), identifiers, words, label)
+            for row in conn.execute(sa.select(*table.c))
+        ]
+        if rows:
+            op.bulk_insert(entries, rows)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS search_index_fts")
+    op.drop_table("search_index")
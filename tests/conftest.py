@@ -9,7 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import settings
-from app.db import Base, get_db
+from app.db import Base, get_db, get_session_factory
 from app.main import app
 from app.models.driver import Driver, DriverStatus
 from app.models.user import User
@@ -53,6 +53,9 @@ async def client(session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: async_sessionmaker(
+        bind=session.bind, expire_on_commit=False, class_=AsyncSession
+    )
 
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
@@ -2,7 +2,10 @@ from datetime import date, timedelta
 from decimal import Decimal
 
 import pytest
+from sqlalchemy import select
 
+from app.models.common import quantize_decimal
+from app.models.expense import Expense, ExpenseCategory
 from app.models.rent_payment import RentPayment
 from app.models.vehicle import Vehicle
 
@@ -41,3 +44,44 @@ async def test_rent_payment_recompute():
     assert payment.weeks == 1
     assert payment.due_amount == Decimal("400.00")
     assert payment.balance == Decimal("320.00")
+
+
+@pytest.mark.anyio
+async def test_vehicle_financials_sql_expressions(session):
+    vehicle = Vehicle(
+        id="CAR-SQLP",
+        plate="SQL1P23",
+        renavam="RENSQLP",
+        vin="VINSQLPROFIT01",
+        manufacture_year=2019,
+        model_year=2020,
+        make="Hybrid",
+        model="Profit",
+        acquisition_date=date.today() - timedelta(days=30),
+        acquisition_price=Decimal("20000"),
+        sale_date=date.today(),
+        sale_price=Decimal("26000"),
+        sale_fees=Decimal("300"),
+    )
+    vehicle.expenses = [
+        Expense(id="EXP-SQLP1", date=date.today(), category=ExpenseCategory.REPAIR, description="A", amount=Decimal("1200")),
+        Expense(id="EXP-SQLP2", date=date.today(), category=ExpenseCategory.DOCS, description="B", amount=Decimal("250.50")),
+    ]
+    vehicle.sync_status()
+    session.add(vehicle)
+    await session.flush()
+
+    row = (
+        await session.execute(
+            select(Vehicle.total_expenses, Vehicle.total_cost, Vehicle.sale_net, Vehicle.profit).where(
+                Vehicle.id == vehicle.id
+            )
+        )
+    ).one()
+    assert [quantize_decimal(value) for value in row] == [
+        vehicle.total_expenses,
+        vehicle.total_cost,
+        vehicle.sale_net,
+        vehicle.profit,
+    ]
+    assert vehicle.profit == Decimal("4249.50")
@@ -3,17 +3,35 @@ import uuid
 from datetime import date
 from decimal import Decimal
 
+import anyio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db import Base
+
 from app.repositories.driver import DriverRepository
 from app.repositories.vehicle import VehicleRepository
 from app.repositories.expense import ExpenseRepository
 from app.repositories.cash import CashRepository
 from app.repositories.capital import CapitalRepository
 from app.repositories.partner import PartnerRepository
+from app.repositories.rent_payment import RentPaymentRepository
 from app.models.driver import DriverStatus
-from app.models.cash import CashTxnType
+from app.models.cash import CashTxn, CashTxnType
 from app.models.expense import ExpenseCategory
 from app.models.capital import CapitalType
+from app.models.expense import Expense
+from app.models.rent_payment import RentPayment
+from app.models.id_counter import IdCounter
+from app.models.partner import Partner
+from app.models.rental import BillingDay, Rental
+from app.models.vehicle import Vehicle, VehicleStatus
+from app.models.summary_counter import SummaryCounter
+from app.repositories.base import InvalidCursorError
+from app.repositories.summary_snapshot import SummarySnapshotRepository, month_bucket
 from app.schemas.common import PaginationParams
+from app.schemas.vehicle import VehicleSell
+from app.services.id_allocator import IdAllocator
 
 
 @pytest.mark.anyio
@@ -130,3 +148,318 @@ async def test_partner_repository_crud(session):
 
     result = await repo.list_partners(PaginationParams(page=1, page_size=10))
     assert any(item.name == "Repo Partner" for item in result.items)
+
+
+@pytest.mark.anyio
+async def test_summary_snapshot_tracks_repository_writes(session, sample_vehicle):
+    snapshot = SummarySnapshotRepository(session)
+    await snapshot.rebuild()
+
+    async def counter(metric, bucket="", dimension=""):
+        row = await session.get(SummaryCounter, (metric, bucket, dimension))
+        return row.value if row else Decimal("0")
+
+    partner = f"Snapshot {uuid.uuid4().hex[:6]}"
+    cash_before = await counter("cash_inflow")
+    capital_repo = CapitalRepository(session)
+    entry = await capital_repo.create_capital(
+        {
+            "partner": partner,
+            "date": date.today(),
+            "type": CapitalType.CONTRIBUTION,
+            "amount": Decimal("1000.00"),
+        }
+    )
+    assert await counter("capital_contribution", dimension=partner) == Decimal("1000.00")
+    assert await counter("cash_inflow") == cash_before + Decimal("1000.00")
+
+    await capital_repo.update_capital(entry, {"amount": Decimal("400.00")})
+    assert await counter("capital_contribution", dimension=partner) == Decimal("400.00")
+    assert await counter("cash_inflow") == cash_before + Decimal("400.00")
+
+    await capital_repo.delete_capital_entry(entry)
+    assert await counter("capital_contribution", dimension=partner) == Decimal("0")
+    assert await counter("cash_inflow") == cash_before
+
+    bucket = month_bucket(date.today())
+    vehicle_repo = VehicleRepository(session)
+    vehicle = await vehicle_repo.get(sample_vehicle.id)
+    profit_before = await counter("sales_profit", bucket)
+    await vehicle_repo.sell_vehicle(
+        vehicle,
+        VehicleSell(sale_date=date.today(), sale_price=Decimal("35000"), sale_fees=Decimal("500")),
+    )
+    sold_profit = await counter("sales_profit", bucket)
+    assert sold_profit == profit_before + vehicle.profit
+
+    expense_repo = ExpenseRepository(session)
+    await expense_repo.create_expense(
+        {
+            "vehicle_id": vehicle.id,
+            "date": date.today(),
+            "category": ExpenseCategory.DOCS,
+            "description": "Transferencia",
+            "amount": Decimal("250.00"),
+        }
+    )
+    assert await counter("sales_profit", bucket) == sold_profit - Decimal("250.00")
+
+
+@pytest.mark.anyio
+async def test_summary_counter_increment_upserts(session):
+    snapshot = SummarySnapshotRepository(session)
+    key = ("expenses", "2090-01", f"Upsert {uuid.uuid4().hex[:6]}")
+    await snapshot.record(None, {key: Decimal("5.00")})
+    await snapshot.record(None, {key: Decimal("2.50")})
+    value = await session.scalar(
+        select(SummaryCounter.value).where(
+            SummaryCounter.metric == key[0], SummaryCounter.bucket == key[1], SummaryCounter.dimension == key[2]
+        )
+    )
+    assert value == Decimal("7.50")
+
+
+@pytest.mark.anyio
+async def test_fleet_profitability_report(session, async_engine):
+    tag = uuid.uuid4().hex[:5].upper()
+    make = f"Prof{tag}"
+    session.add_all(
+        [
+            Vehicle(
+                id=f"CAR-P{tag}1",
+                plate=f"P{tag}1",
+                renavam=f"RP{tag}1",
+                vin=f"VP{tag}1",
+                manufacture_year=2019,
+                model_year=2020,
+                make=make,
+                model="Seller",
+                acquisition_date=date(2024, 1, 1),
+                acquisition_price=Decimal("20000"),
+                sale_date=date(2024, 3, 1),
+                sale_price=Decimal("25000"),
+                sale_fees=Decimal("500"),
+                status=VehicleStatus.SOLD,
+            ),
+            Vehicle(
+                id=f"CAR-P{tag}2",
+                plate=f"P{tag}2",
+                renavam=f"RP{tag}2",
+                vin=f"VP{tag}2",
+                manufacture_year=2019,
+                model_year=2020,
+                make=make,
+                model="Renter",
+                acquisition_date=date(2024, 1, 1),
+                acquisition_price=Decimal("10000"),
+                status=VehicleStatus.RENTED,
+            ),
+            Expense(id=f"EXP-P{tag}1", vehicle_id=f"CAR-P{tag}1", date=date(2024, 1, 5), category=ExpenseCategory.REPAIR, description="A", amount=Decimal("1000")),
+            Expense(id=f"EXP-P{tag}2", vehicle_id=f"CAR-P{tag}1", date=date(2024, 1, 6), category=ExpenseCategory.DOCS, description="B", amount=Decimal("500")),
+            Expense(id=f"EXP-P{tag}3", vehicle_id=f"CAR-P{tag}2", date=date(2024, 1, 7), category=ExpenseCategory.REPAIR, description="C", amount=Decimal("2000")),
+            Rental(id=f"RENT-P{tag}", vehicle_id=f"CAR-P{tag}2", driver_id="DRV-TST", start_date=date(2024, 1, 8), weekly_rate=Decimal("500"), billing_day=BillingDay.MON),
+        ]
+    )
+    await session.flush()
+    session.add_all(
+        [
+            RentPayment(
+                id=f"PAY-P{tag}{week}",
+                rental_id=f"RENT-P{tag}",
+                period_start=date(2024, 1, 8 + 7 * week),
+                period_end=date(2024, 1, 14 + 7 * week),
+                weekly_rate=Decimal("500"),
+                due_amount=Decimal("500"),
+                paid_amount=Decimal("500") if week < 2 else Decimal("0"),
+                late_fee=Decimal("25") if week == 1 else Decimal("0"),
+            )
+            for week in range(3)
+        ]
+    )
+    await session.flush()
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        result = await VehicleRepository(session).profitability_report(
+            PaginationParams(page=1, page_size=10, order_by="profit", order_dir="desc"), make=make
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+
+    assert len(statements) == 1
+    assert result.total == 2
+    seller, renter = result.items
+    assert seller["id"] == f"CAR-P{tag}1"
+    assert seller["total_cost"] == Decimal("21500.00")
+    assert seller["sale_net"] == Decimal("24500.00")
+    assert seller["profit"] == Decimal("3000.00")
+    assert seller["roi"] == Decimal("0.14")
+    assert renter["rent_collected"] == Decimal("1000.00")
+    assert renter["late_fees"] == Decimal("25.00")
+    assert renter["rent_due"] == Decimal("1500.00")
+    assert renter["sale_net"] is None
+    assert renter["profit"] == Decimal("-10975.00")
+
+    rented_only = await VehicleRepository(session).profitability_report(
+        PaginationParams(page=1, page_size=10), status=VehicleStatus.RENTED, make=make
+    )
+    assert [row["id"] for row in rented_only.items] == [f"CAR-P{tag}2"]
+
+    # ROI is rounded exactly as Vehicle.roi does for the financial endpoint.
+    assert seller["roi"] == Vehicle.return_on_cost(seller["profit"], seller["total_cost"])
+    projected = await VehicleRepository(session).profitability_report(
+        PaginationParams(page=1, page_size=1, order_by="profit", order_dir="desc", total_mode="none", fields=["roi"]),
+        make=make,
+    )
+    assert projected.total is None and projected.has_more is True
+    assert projected.items == [{"id": f"CAR-P{tag}1", "roi": "0.14"}]
+
+
+@pytest.mark.anyio
+async def test_bulk_rent_payments_skip_billed_periods(session, sample_vehicle):
+    session.add(
+        Rental(
+            id="RENT-UPS",
+            vehicle_id=sample_vehicle.id,
+            driver_id="DRV-TST",
+            start_date=date(2032, 1, 1),
+            weekly_rate=Decimal("450"),
+            billing_day=BillingDay.MON,
+        )
+    )
+    await session.flush()
+    repo = RentPaymentRepository(session)
+    charge = {
+        "rental_id": "RENT-UPS",
+        "period_start": date(2032, 1, 5),
+        "period_end": date(2032, 1, 11),
+        "weekly_rate": Decimal("450"),
+    }
+    first = await repo.bulk_create_payments([charge])
+    assert len(first) == 1
+
+    second = await repo.bulk_create_payments(
+        [charge, {**charge, "period_start": date(2032, 1, 12), "period_end": date(2032, 1, 18)}]
+    )
+    assert len(second) == 1 and second[0] != first[0]
+    payments = (
+        await session.execute(select(RentPayment.period_start).where(RentPayment.rental_id == "RENT-UPS"))
+    ).scalars().all()
+    assert sorted(payments) == [date(2032, 1, 5), date(2032, 1, 12)]
+
+
+@pytest.mark.anyio
+async def test_generate_ids_orders_numerically(session):
+    session.add_all([Partner(id="TST-9999", name="Old"), Partner(id="TST-10000", name="Newer")])
+    await session.flush()
+    repo = PartnerRepository(session)
+
+    assert await repo.generate_id("TST") == "TST-10001"
+    assert await repo.generate_ids("TST", 3) == ["TST-10002", "TST-10003", "TST-10004"]
+    assert (await session.get(IdCounter, "TST")).next_value == 10005
+
+
+@pytest.mark.anyio
+async def test_id_allocator_hands_out_blocks_without_collisions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ids.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    # Two processes sharing the database, each with its own cache of blocks.
+    allocators = [IdAllocator(5, in_transaction_dialects=frozenset()) for _ in range(2)]
+    issued: list[str] = []
+
+    async def create_many(allocator: IdAllocator) -> None:
+        async with factory() as session:
+            for _ in range(12):
+                issued.extend(await allocator.allocate(session, Partner, "PRT"))
+                await anyio.sleep(0)
+
+    try:
+        async with anyio.create_task_group() as task_group:
+            for allocator in allocators:
+                task_group.start_soon(create_many, allocator)
+        async with factory() as session:
+            reserved = await allocators[0].allocate(session, Partner, "PRT", 7)
+            next_value = (await session.get(IdCounter, "PRT")).next_value
+    finally:
+        await engine.dispose()
+
+    assert len(set(issued + reserved)) == len(issued) + len(reserved) == 31
+    # 24 single ids in blocks of 5 per allocator, then 7 more: 3 left over plus a new block of 5.
+    assert next_value == 1 + 5 * 3 + 5 * 3 + 5
+
+
+@pytest.mark.anyio
+async def test_cursor_pagination_walks_every_row_once(session):
+    repo = CashRepository(session)
+    category = f"Keyset {uuid.uuid4().hex[:8]}"
+    for day in (3, 1, 2, 2, 5):
+        await repo.create_txn(
+            {"date": date(2031, 1, day), "type": CashTxnType.INFLOW, "category": category, "amount": Decimal("10")}
+        )
+    await session.flush()
+
+    for order_by, order_dir in (("date", "asc"), ("date", "desc"), (None, "asc")):
+        expected = await repo.list_txns(
+            PaginationParams(page_size=50, order_by=order_by, order_dir=order_dir), category=category
+        )
+        seen: list[str] = []
+        cursor = ""
+        while cursor is not None:
+            page = await repo.list_txns(
+                PaginationParams(page_size=2, order_by=order_by, order_dir=order_dir, cursor=cursor), category=category
+            )
+            assert page.total == 5
+            seen.extend(txn.id for txn in page.items)
+            cursor = page.next_cursor
+        assert len(seen) == len(set(seen)) == 5
+        assert sorted(seen) == sorted(txn.id for txn in expected.items)
+        if order_by == "date":
+            dates = [(await session.get(CashTxn, txn_id)).date for txn_id in seen]
+            assert dates == sorted(dates, reverse=order_dir == "desc")
+
+    first = await repo.list_txns(PaginationParams(page_size=2, order_by="date", cursor=""), category=category)
+    with pytest.raises(InvalidCursorError):
+        await repo.list_txns(
+            PaginationParams(page_size=2, order_by="amount", cursor=first.next_cursor), category=category
+        )
+    with pytest.raises(InvalidCursorError):
+        await repo.list_txns(PaginationParams(page_size=2, cursor="not-a-cursor"), category=category)
+
+
+@pytest.mark.anyio
+async def test_list_total_modes(session):
+    repo = PartnerRepository(session)
+    tag = f"Totals {uuid.uuid4().hex[:8]}"
+    for index in range(3):
+        await repo.create_partner({"name": f"{tag} {index}"})
+    await session.commit()
+    try:
+        first = PaginationParams(page_size=2)
+        exact = await repo.list_partners(first, name=tag)
+        assert (exact.total, exact.has_more) == (3, True)
+        last = await repo.list_partners(PaginationParams(page=2, page_size=2), name=tag)
+        assert (last.total, last.has_more, len(last.items)) == (3, False, 1)
+
+        skipped = await repo.list_partners(first.model_copy(update={"total_mode": "none"}), name=tag)
+        assert (skipped.total, skipped.has_more, len(skipped.items)) == (None, True, 2)
+        # SQLite keeps no planner statistics, so the estimate falls back to a count.
+        estimated = await repo.list_partners(first.model_copy(update={"total_mode": "estimated"}), name=tag)
+        assert estimated.total == 3
+
+        cached = first.model_copy(update={"total_mode": "cached"})
+        assert (await repo.list_partners(cached, name=tag)).total == 3
+        await repo.create_partner({"name": f"{tag} 3"})
+        await session.commit()
+        assert (await repo.list_partners(cached, name=tag)).total == 4
+        assert (await repo.list_partners(cached.model_copy(update={"page_size": 1}), name=f"{tag} 3")).total == 1
+    finally:
+        for partner in (await repo.list_partners(PaginationParams(page_size=10), name=tag)).items:
+            await session.delete(partner)
+        await session.commit()
@@ -1,7 +1,12 @@
+import json
+
 import pytest
 import uuid
+from datetime import date
+from decimal import Decimal
 
 from app.services.security import create_access_token
+from app.services.summary_cache import summary_cache
 
 
 @pytest.mark.anyio
@@ -84,3 +89,333 @@ async def test_summary_endpoint(client, admin_user):
     assert "rent_collection_last_6_months" in data
     assert len(data['rent_collection_last_6_months']) <= 6
     assert "capital_balance_by_partner" in data
+
+
+@pytest.mark.anyio
+async def test_summary_series_endpoint(client, admin_user):
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.get(
+        "/summary/series",
+        params={"start_date": "2024-01-01", "end_date": "2024-12-31", "granularity": "quarter"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["granularity"] == "quarter"
+    assert [point["start"] for point in data["points"]] == ["2024-01-01", "2024-04-01", "2024-07-01", "2024-10-01"]
+
+    response = await client.get(
+        "/summary/series",
+        params={"start_date": "2024-02-01", "end_date": "2024-01-01"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_summary_cache_etag_and_invalidation(client, admin_user):
+    summary_cache.invalidate()
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = await client.get("/summary", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = await client.get("/summary", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    txn_resp = await client.post(
+        "/cash",
+        json={"date": "2024-03-01", "type": "Inflow", "category": "Cache", "amount": "123.45"},
+        headers=headers,
+    )
+    assert txn_resp.status_code == 201
+
+    refreshed = await client.get("/summary", headers={**headers, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    balance = Decimal(refreshed.json()["cash_balance"]) - Decimal(first.json()["cash_balance"])
+    assert balance == Decimal("123.45")
+
+
+@pytest.mark.anyio
+async def test_summary_as_of(client, admin_user):
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.get("/summary", params={"as_of": "2024-01-15"}, headers=headers)
+    assert response.status_code == 200
+    assert "cash_balance" in response.json()
+
+    future = await client.get("/summary", params={"as_of": "2999-01-01"}, headers=headers)
+    assert future.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_fleet_profitability_endpoint(client, admin_user, sample_vehicle):
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.get(
+        "/reports/fleet-profitability",
+        params={"order_by": "roi", "order_dir": "desc", "page_size": 5},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] >= 1
+    assert len(data["items"]) <= 5
+    assert {"acquisition_price", "total_expenses", "rent_collected", "late_fees", "profit", "roi"} <= set(data["items"][0])
+
+    response = await client.get(
+        "/reports/fleet-profitability",
+        params={"fields": "profit,roi", "total": "none", "page_size": 1},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert set(data["items"][0]) == {"id", "profit", "roi"}
+
+    response = await client.get(
+        "/reports/fleet-profitability", params={"fields": "nope"}, headers=headers
+    )
+    assert response.status_code == 400
+    response = await client.get("/reports/fleet-profitability", params={"cursor": ""}, headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_billing_backfill_validation(client, admin_user):
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("/billing/run", params={"from": "2024-02-10", "to": "2024-02-01"}, headers=headers)
+    assert response.status_code == 400
+    response = await client.post("/billing/run", params={"from": "2024-02-01", "to": "2999-01-01"}, headers=headers)
+    assert response.status_code == 400
+    response = await client.post("/billing/run", params={"from": "2024-02-01", "to": "2024-02-07"}, headers=headers)
+    assert response.status_code == 200
+    assert isinstance(response.json()["generated"], list)
+    response = await client.post("/billing/late-fees", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"updated": 0}  # no policy configured
+
+
+@pytest.mark.anyio
+async def test_billing_forecast_route(client, admin_user):
+    token = create_access_token(admin_user.email, ["user"])
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.get("/billing/forecast", params={"weeks": 52, "start_date": "2046-01-05"}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["weeks"]) == 52
+    assert body["end_date"] == "2047-01-03"
+    assert {"rentals", "drivers", "vehicles", "total"} <= set(body)
+    response = await client.get("/billing/forecast", params={"weeks": 1000}, headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_list_cursor_mode(client, admin_user):
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    category = f"Cursor {uuid.uuid4().hex[:8]}"
+    for amount in ("1", "2", "3"):
+        response = await client.post(
+            "/cash",
+            json={"date": "2032-01-01", "type": "Inflow", "category": category, "amount": amount},
+            headers=headers,
+        )
+        assert response.status_code == 201
+    params = {"category": category, "page_size": 2, "cursor": ""}
+    first = (await client.get("/cash", params=params, headers=headers)).json()
+    assert len(first["items"]) == 2 and first["next_cursor"]
+    second = (await client.get("/cash", params={**params, "cursor": first["next_cursor"]}, headers=headers)).json()
+    assert len(second["items"]) == 1 and second["next_cursor"] is None
+    response = await client.get("/cash", params={**params, "cursor": "garbage"}, headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_list_sparse_fieldsets(client, admin_user):
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    category = f"Fields {uuid.uuid4().hex[:8]}"
+    for amount in ("1.50", "2.00", "3.25"):
+        response = await client.post(
+            "/cash",
+            json={"date": "2033-01-01", "type": "Inflow", "category": category, "amount": amount},
+            headers=headers,
+        )
+        assert response.status_code == 201
+    params = {"category": category, "fields": "amount,type", "order_by": "amount", "page_size": 2}
+    page = (await client.get("/cash", params=params, headers=headers)).json()
+    assert page["total"] == 3 and page["has_more"] is True
+    assert [set(item) for item in page["items"]] == [{"id", "amount", "type"}] * 2
+    assert [item["amount"] for item in page["items"]] == ["1.50", "2.00"]
+    assert page["items"][0]["type"] == "Inflow"
+
+    walked = []
+    cursor = ""
+    while cursor is not None:
+        page = (await client.get("/cash", params={**params, "cursor": cursor}, headers=headers)).json()
+        walked.extend(item["amount"] for item in page["items"])
+        cursor = page["next_cursor"]
+    assert walked == ["1.50", "2.00", "3.25"]
+
+    response = await client.get("/cash", params={**params, "fields": "amount,secret"}, headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_export_streams_filtered_rows(client, admin_user):
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    category = f"Export {uuid.uuid4().hex[:8]}"
+    for day, amount in (("2034-01-02", "5.00"), ("2034-01-01", "7.50"), ("2035-01-01", "1.00")):
+        response = await client.post(
+            "/cash",
+            json={"date": day, "type": "Outflow", "category": category, "amount": amount},
+            headers=headers,
+        )
+        assert response.status_code == 201
+    params = {"category": category, "end_date": "2034-12-31"}
+
+    response = await client.get(
+        "/cash/export", params={**params, "format": "csv", "fields": "date,amount,type"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0] == "id,date,amount,type"
+    assert sorted(line.split(",", 1)[1] for line in lines[1:]) == ["2034-01-01,7.50,Outflow", "2034-01-02,5.00,Outflow"]
+
+    response = await client.get("/cash/export", params={**params, "format": "ndjson"}, headers=headers)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["amount"] for row in rows) == ["5.00", "7.50"]
+    assert {row["category"] for row in rows} == {category}
+
+    response = await client.get("/cash/export", params={**params, "fields": "nope"}, headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_search_route(client, admin_user):
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    name = f"Parceira Busca {uuid.uuid4().hex[:8]}"
+    response = await client.post("/partners", json={"name": name}, headers=headers)
+    assert response.status_code == 201
+    partner_id = response.json()["id"]
+    try:
+        response = await client.get("/search", params={"q": name.upper()[-12:]}, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["items"] == [{"entity_type": "partner", "entity_id": partner_id, "label": name}]
+        response = await client.get("/search", params={"q": name[-8:], "types": "vehicle"}, headers=headers)
+        assert response.json()["items"] == []
+    finally:
+        await client.delete(f"/partners/{partner_id}", headers=headers)
+
+
+@pytest.mark.anyio
+async def test_analytics_export(client, admin_user):
+    from app.services import analytics_export
+
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.get(
+        "/analytics/export",
+        params={"table": "cash_txns", "start_date": "2036-02-01", "end_date": "2036-01-01"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    if analytics_export.pa is None:
+        response = await client.get("/analytics/export", params={"table": "cash_txns"}, headers=headers)
+        assert response.status_code == 501
+        pytest.skip("pyarrow is not installed")
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    category = f"Analytics {uuid.uuid4().hex[:8]}"
+    for day, amount in (("2036-01-02", "5.00"), ("2036-01-01", "7.50"), ("2037-01-01", "1.00")):
+        response = await client.post(
+            "/cash",
+            json={"date": day, "type": "Inflow", "category": category, "amount": amount},
+            headers=headers,
+        )
+        assert response.status_code == 201
+    params = {"table": "cash_txns", "start_date": "2036-01-01", "end_date": "2036-12-31"}
+
+    response = await client.get("/analytics/export", params={**params, "format": "arrow"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    arrow_table = pa.ipc.open_stream(response.content).read_all()
+    assert pa.types.is_decimal(arrow_table.schema.field("amount").type)
+    assert arrow_table.schema.field("date").type == pa.date32()
+
+    response = await client.get("/analytics/export", params={**params, "format": "parquet"}, headers=headers)
+    assert response.status_code == 200
+    parquet_table = pq.read_table(pa.BufferReader(response.content))
+    rows = [row for row in parquet_table.to_pylist() if row["category"] == category]
+    assert [(str(row["date"]), row["amount"]) for row in rows] == [
+        ("2036-01-01", Decimal("7.50")),
+        ("2036-01-02", Decimal("5.00")),
+    ]
+
+
+@pytest.mark.anyio
+async def test_rent_payment_integrity_errors(client, admin_user, session, sample_vehicle):
+    from app.models.rental import BillingDay, Rental
+
+    token = create_access_token(admin_user.email, ["user", "admin"])
+    headers = {"Authorization": f"Bearer {token}"}
+    rental_id = f"RENT-{uuid.uuid4().hex[:6].upper()}"
+    session.add(
+        Rental(
+            id=rental_id,
+            vehicle_id=sample_vehicle.id,
+            driver_id="DRV-TST",
+            start_date=date(2042, 1, 1),
+            weekly_rate=Decimal("100"),
+            billing_day=BillingDay.MON,
+        )
+    )
+    await session.commit()
+    payload = {
+        "rental_id": rental_id,
+        "period_start": "2042-01-05",
+        "period_end": "2042-01-11",
+        "weekly_rate": "100",
+        "due_amount": "100",
+    }
+    created_ids = []
+    try:
+        response = await client.post("/rent-payments", json={**payload, "rental_id": "RENT-NOPE"}, headers=headers)
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Rental not found"
+
+        response = await client.post("/rent-payments", json=payload, headers=headers)
+        assert response.status_code == 201
+        created_ids.append(response.json()["id"])
+        response = await client.post("/rent-payments", json=payload, headers=headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Payment for period already exists"
+
+        response = await client.post(
+            "/rent-payments", json={**payload, "period_start": "2042-01-12", "period_end": "2042-01-18"}, headers=headers
+        )
+        created_ids.append(response.json()["id"])
+        response = await client.patch(
+            f"/rent-payments/{created_ids[1]}",
+            json={"period_start": "2042-01-05", "period_end": "2042-01-11"},
+            headers=headers,
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Payment for period already exists"
+    finally:
+        for payment_id in created_ids:
+            await client.delete(f"/rent-payments/{payment_id}", headers=headers)
+        await session.execute(Rental.__table__.delete().where(Rental.id == rental_id))
+        await session.commit()
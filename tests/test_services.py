@@ -0,0 +1,901 @@
+import json
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import anyio
+import pytest
+from sqlalchemy import event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.billing_partition import BillingPartition, BillingPartitionStatus
+from app.models.cash import CashTxn, CashTxnType
+from app.models.expense import Expense, ExpenseCategory
+from app.models.job_lock import JobLock
+from app.models.job_run import JobRun, JobRunStatus
+from app.models.rent_payment import RentPayment
+from app.models.rental import BillingDay, Rental, RentalStatus
+from app.models.summary_counter import SummaryCounter
+from app.models.summary_daily import SummaryDailySnapshot
+from app.models.driver import Driver, DriverStatus
+from app.models.search_entry import SearchEntry
+from app.models.vehicle import Vehicle, VehicleStatus
+from app.repositories.cash import CashRepository
+from app.repositories.rent_payment import RentPaymentRepository
+from app.services.billing import (
+    DAY_MAP,
+    bill_partition,
+    billing_run_key,
+    claim_billing_partition,
+    generate_weekly_charges,
+    plan_billing_partitions,
+    run_partitioned_billing,
+)
+from app.services.billing_forecast import forecast_charges
+from app.services.late_fees import LateFeePolicy, apply_late_fees
+from app.services.scheduler import SCHEDULER_LEASE, CronSchedule, Job, Scheduler, release_lease
+from app.schemas.summary import SeriesGranularity
+from app.services.summary import (
+    _load_outstanding_rent,
+    _outstanding_rent_statement,
+    get_summary,
+    get_summary_as_of,
+    get_summary_series,
+    get_summary_snapshot,
+    rebuild_summary_snapshot,
+    take_daily_snapshot,
+)
+from app.schemas.cash import CashTxnRead
+from app.schemas.common import PaginationParams
+from app.services.pages import page_response
+from app.services.search import rebuild_search_index, search, search_terms
+from app.services.summary_cache import SUMMARY_CHANGED, summary_cache
+from app.services.summary_stream import summary_events
+
+
+def _normalized(summary):
+    data = summary.model_dump()
+    data["expenses_by_category_ytd"] = sorted(data["expenses_by_category_ytd"], key=lambda item: item["label"])
+    return data
+
+
+@pytest.mark.anyio
+async def test_summary_snapshot_matches_live_summary(session, sample_vehicle):
+    today = date.today()
+    await rebuild_summary_snapshot(session)
+    snapshot = await get_summary_snapshot(session, today=today)
+    live = await get_summary(session, today=today)
+    assert _normalized(snapshot) == _normalized(live)
+    assert snapshot.total_vehicles_stock >= 1
+
+
+@pytest.mark.anyio
+async def test_summary_snapshot_matches_live_with_future_dates(session, sample_vehicle):
+    today = date(2050, 6, 10)
+    tag = uuid.uuid4().hex[:5].upper()
+    for index, sale_date in enumerate((date(2050, 6, 3), date(2050, 6, 20))):
+        session.add(
+            Vehicle(
+                id=f"CAR-F{tag}{index}",
+                plate=f"F{tag}{index}",
+                renavam=f"RF{tag}{index}",
+                vin=f"VF{tag}{index}",
+                manufacture_year=2049,
+                model_year=2050,
+                make="Future",
+                model="Sold",
+                acquisition_date=date(2050, 1, 1),
+                acquisition_price=Decimal("1000"),
+                sale_date=sale_date,
+                sale_price=Decimal("1500"),
+                status=VehicleStatus.SOLD,
+            )
+        )
+    session.add_all(
+        [
+            *(
+                Expense(
+                    id=f"EXP-F{tag}{index}",
+                    vehicle_id=sample_vehicle.id,
+                    date=expense_date,
+                    category=category,
+                    description="Future",
+                    amount=amount,
+                )
+                for index, (expense_date, category, amount) in enumerate(
+                    (
+                        (date(2050, 6, 5), ExpenseCategory.DOCS, Decimal("10")),
+                        (date(2050, 6, 25), ExpenseCategory.DOCS, Decimal("20")),
+                        (date(2050, 6, 28), ExpenseCategory.REPAIR, Decimal("5")),
+                    )
+                )
+            ),
+            CashTxn(id=f"CSH-F{tag}", date=date(2050, 6, 30), type=CashTxnType.INFLOW, category="Future", amount=Decimal("7")),
+            Rental(
+                id=f"RENT-F{tag}",
+                vehicle_id=sample_vehicle.id,
+                driver_id="DRV-TST",
+                start_date=date(2050, 5, 1),
+                weekly_rate=Decimal("100"),
+                billing_day=BillingDay.MON,
+            ),
+        ]
+    )
+    await session.flush()
+    for index, payment_date in enumerate((date(2050, 6, 8), date(2050, 6, 22))):
+        session.add(
+            RentPayment(
+                id=f"PAY-F{tag}{index}",
+                rental_id=f"RENT-F{tag}",
+                period_start=date(2050, 5, 4) + timedelta(days=7 * index),
+                period_end=date(2050, 5, 10) + timedelta(days=7 * index),
+                weekly_rate=Decimal("100"),
+                weeks=1,
+                due_amount=Decimal("100"),
+                paid_amount=Decimal("100"),
+                late_fee=Decimal("0"),
+                payment_date=payment_date,
+            )
+        )
+    await session.flush()
+    await rebuild_summary_snapshot(session)
+
+    snapshot = await get_summary_snapshot(session, today=today)
+    live = await get_summary(session, today=today)
+    assert _normalized(snapshot) == _normalized(live)
+    assert snapshot.vehicles_sold_ytd == live.vehicles_sold_ytd
+
+
+@pytest.mark.anyio
+async def test_summary_snapshot_falls_back_to_live_without_counters(session):
+    await session.execute(SummaryCounter.__table__.delete())
+    today = date.today()
+    assert _normalized(await get_summary_snapshot(session, today=today)) == _normalized(
+        await get_summary(session, today=today)
+    )
+    assert await session.scalar(select(func.count()).select_from(SummaryCounter)) == 0
+
+
+@pytest.mark.anyio
+async def test_summary_scalar_kpis_use_one_statement(session, async_engine):
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        summary = await get_summary(session, today=date.today())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+    kpi_statements = [sql for sql in statements if "capital_kpis" in sql]
+    assert len(kpi_statements) == 1
+    assert sum(item.count for item in summary.vehicle_status_breakdown) >= summary.total_vehicles_stock
+
+
+@pytest.mark.anyio
+async def test_summary_parallel_mode_respects_connection_cap(session, async_engine):
+    base_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+    active = {"now": 0, "peak": 0, "opened": 0}
+
+    @asynccontextmanager
+    async def tracking_factory():
+        active["now"] += 1
+        active["opened"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        try:
+            async with base_factory() as group_session:
+                yield group_session
+        finally:
+            active["now"] -= 1
+
+    today = date.today()
+    parallel = await get_summary(session, today=today, parallel=True, session_factory=tracking_factory, max_connections=2)
+    sequential = await get_summary(session, today=today)
+    assert _normalized(parallel) == _normalized(sequential)
+    assert active["opened"] > 2
+    assert active["peak"] <= 2
+
+
+@pytest.mark.anyio
+async def test_summary_series_buckets_in_database(session, async_engine, sample_vehicle):
+    today = date(2031, 5, 14)
+    session.add_all(
+        [
+            Expense(
+                id=f"EXP-SER{index}",
+                vehicle_id=sample_vehicle.id,
+                date=expense_date,
+                category=ExpenseCategory.REPAIR,
+                description="Series",
+                amount=Decimal("100"),
+            )
+            for index, expense_date in enumerate(
+                [date(2031, 1, 31), date(2031, 2, 1), date(2031, 2, 28), date(2031, 4, 2), date(2031, 5, 12)]
+            )
+        ]
+    )
+    await session.flush()
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        monthly = await get_summary_series(session, date(2031, 1, 1), today, SeriesGranularity.MONTH)
+        quarterly = await get_summary_series(session, date(2031, 1, 1), today, SeriesGranularity.QUARTER)
+        weekly = await get_summary_series(session, date(2031, 5, 1), today, SeriesGranularity.WEEK)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+
+    assert len(statements) == 3
+    assert [(point.start, point.expenses) for point in monthly.points] == [
+        (date(2031, 1, 1), Decimal("100.00")),
+        (date(2031, 2, 1), Decimal("200.00")),
+        (date(2031, 3, 1), Decimal("0")),
+        (date(2031, 4, 1), Decimal("100.00")),
+        (date(2031, 5, 1), Decimal("100.00")),
+    ]
+    assert [(point.label, point.expenses) for point in quarterly.points] == [
+        ("T1/31", Decimal("300.00")),
+        ("T2/31", Decimal("200.00")),
+    ]
+    assert [point.start for point in weekly.points] == [
+        date(2031, 4, 28),
+        date(2031, 5, 5),
+        date(2031, 5, 12),
+    ]
+    assert [point.expenses for point in weekly.points] == [Decimal("0"), Decimal("0"), Decimal("100.00")]
+
+
+@pytest.mark.anyio
+async def test_outstanding_rent_aggregated_from_index(session):
+    before_total, before_count = await _load_outstanding_rent(session)
+    session.add_all(
+        [
+            RentPayment(
+                id=f"PAY-OUT{index}",
+                rental_id="RENT-OUT",
+                period_start=date(2030, 1, 7 * index + 1),
+                period_end=date(2030, 1, 7 * index + 7),
+                weekly_rate=Decimal("400"),
+                due_amount=Decimal("400"),
+                paid_amount=paid,
+                late_fee=late_fee,
+            )
+            for index, (paid, late_fee) in enumerate(
+                [(Decimal("400"), Decimal("0")), (Decimal("150"), Decimal("20")), (Decimal("0"), Decimal("0"))]
+            )
+        ]
+    )
+    await session.flush()
+
+    total, count = await _load_outstanding_rent(session)
+    assert total - before_total == Decimal("670.00")
+    assert count - before_count == 2
+
+    compiled = _outstanding_rent_statement().compile(compile_kwargs={"literal_binds": True})
+    plan = (await session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all()
+    assert any("ix_rent_payment_outstanding" in str(row) for row in plan)
+
+
+@pytest.mark.anyio
+async def test_summary_as_of_uses_daily_snapshot_or_point_in_time(session):
+    day = date(2029, 6, 15)
+    session.add_all(
+        [
+            CashTxn(id="CSH-ASOF1", date=day, type=CashTxnType.INFLOW, category="As of", amount=Decimal("1000")),
+            CashTxn(
+                id="CSH-ASOF2",
+                date=date(2029, 6, 16),
+                type=CashTxnType.INFLOW,
+                category="As of",
+                amount=Decimal("50"),
+            ),
+        ]
+    )
+    await session.flush()
+    baseline = await get_summary(session, today=date(2029, 6, 14), point_in_time=True)
+
+    computed = await get_summary_as_of(session, day)
+    assert computed.cash_balance - baseline.cash_balance == Decimal("1000.00")
+
+    stored = await take_daily_snapshot(session, day)
+    assert stored == computed
+    snapshot = await session.get(SummaryDailySnapshot, day)
+    snapshot.payload = {**snapshot.payload, "cash_balance": "1.00"}
+    await session.flush()
+    assert (await get_summary_as_of(session, day)).cash_balance == Decimal("1.00")
+
+
+@pytest.mark.anyio
+async def test_summary_stream_pushes_coalesced_changes(async_engine):
+    factory = async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+    summary_cache.invalidate()
+    events = summary_events(factory, interval=0.01, keepalive=60)
+    try:
+        first = await events.__anext__()
+        assert first.startswith("event: summary\n")
+        initial = json.loads(first.split("data: ", 1)[1])
+        assert "cash_balance" in initial and "vehicle_status_breakdown" in initial
+
+        async with factory() as session:
+            repo = CashRepository(session)
+            for index in range(3):
+                await repo.create_txn(
+                    {"date": date(2028, 1, 2), "type": CashTxnType.INFLOW, "category": "Stream", "amount": Decimal("10")}
+                )
+                await session.commit()
+
+        update = json.loads((await events.__anext__()).split("data: ", 1)[1])
+        assert set(update) == {"cash_balance"}
+        assert Decimal(update["cash_balance"]) - Decimal(initial["cash_balance"]) == Decimal("30.00")
+    finally:
+        await events.aclose()
+
+
+@pytest.mark.anyio
+async def test_summary_stream_refreshes_after_ttl(async_engine, monkeypatch):
+    factory = async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+    monkeypatch.setattr(summary_cache, "ttl_seconds", 0.05)
+    summary_cache.invalidate()
+    events = summary_events(factory, interval=0.01, keepalive=60)
+    try:
+        initial = json.loads((await events.__anext__()).split("data: ", 1)[1])
+        generation = summary_cache.generation
+
+        # A write committed by another process: the data changes, this process's cache
+        # generation does not.
+        async with factory() as session:
+            await CashRepository(session).create_txn(
+                {"date": date(2028, 2, 3), "type": CashTxnType.INFLOW, "category": "Stream", "amount": Decimal("4")}
+            )
+            await session.flush()
+            session.info.pop(SUMMARY_CHANGED, None)
+            await session.commit()
+        assert summary_cache.generation == generation
+
+        with anyio.fail_after(5):
+            update = json.loads((await events.__anext__()).split("data: ", 1)[1])
+        assert Decimal(update["cash_balance"]) - Decimal(initial["cash_balance"]) == Decimal("4.00")
+    finally:
+        await events.aclose()
+
+
+@pytest.mark.anyio
+async def test_weekly_billing_is_set_based(session, async_engine, sample_vehicle):
+    today = date(2031, 3, 10)  # Monday: bills 2031-03-03..2031-03-09
+    session.add_all(
+        [
+            Rental(
+                id="RENT-BIL1",
+                vehicle_id=sample_vehicle.id,
+                driver_id="DRV-TST",
+                start_date=date(2031, 1, 1),
+                weekly_rate=Decimal("500"),
+                billing_day=BillingDay.MON,
+            ),
+            Rental(
+                id="RENT-BIL2",
+                vehicle_id=sample_vehicle.id,
+                driver_id="DRV-TST",
+                start_date=date(2031, 3, 5),
+                weekly_rate=Decimal("700"),
+                billing_day=BillingDay.MON,
+            ),
+            Rental(
+                id="RENT-BIL3",
+                vehicle_id=sample_vehicle.id,
+                driver_id="DRV-TST",
+                start_date=date(2031, 1, 1),
+                weekly_rate=Decimal("500"),
+                billing_day=BillingDay.TUE,
+            ),
+            Rental(
+                id="RENT-BIL4",
+                vehicle_id=sample_vehicle.id,
+                driver_id="DRV-TST",
+                start_date=date(2031, 1, 1),
+                end_date=date(2031, 3, 1),
+                weekly_rate=Decimal("500"),
+                billing_day=BillingDay.MON,
+            ),
+        ]
+    )
+    await session.flush()
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        created = await generate_weekly_charges(session, today=today)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+
+    payments = {
+        payment.rental_id: payment
+        for payment in (
+            await session.execute(select(RentPayment).where(RentPayment.id.in_(created)))
+        ).scalars()
+    }
+    assert set(payments) == {"RENT-BIL1", "RENT-BIL2"}
+    assert (payments["RENT-BIL1"].period_start, payments["RENT-BIL1"].period_end) == (date(2031, 3, 3), date(2031, 3, 9))
+    assert payments["RENT-BIL1"].due_amount == Decimal("500.00")
+    assert payments["RENT-BIL2"].period_start == date(2031, 3, 5)
+    assert payments["RENT-BIL2"].due_amount == Decimal("700.00")
+    assert len([sql for sql in statements if "rentals" in sql or "INSERT INTO rent_payments" in sql]) == 2
+
+    assert await generate_weekly_charges(session, today=today) == []
+
+
+@pytest.mark.anyio
+async def test_weekly_billing_backfill_range(session, sample_vehicle):
+    session.add_all(
+        [
+            Rental(
+                id="RENT-BKF1",
+                vehicle_id=sample_vehicle.id,
+                driver_id="DRV-TST",
+                start_date=date(2033, 1, 1),
+                weekly_rate=Decimal("300"),
+                billing_day=BillingDay.WED,
+            ),
+            Rental(
+                id="RENT-BKF2",
+                vehicle_id=sample_vehicle.id,
+                driver_id="DRV-TST",
+                start_date=date(2033, 1, 1),
+                end_date=date(2033, 1, 20),
+                weekly_rate=Decimal("300"),
+                billing_day=BillingDay.FRI,
+                status=RentalStatus.CLOSED,
+            ),
+        ]
+    )
+    await session.flush()
+
+    # Wednesdays 2033-01-05 .. 2033-02-02 and Fridays 2033-01-07 .. 2033-01-21, over two windows.
+    created = await generate_weekly_charges(
+        session, since=date(2033, 1, 1), until=date(2033, 2, 4), batch_size=2
+    )
+    periods = (
+        await session.execute(
+            select(RentPayment.rental_id, RentPayment.period_start, RentPayment.period_end)
+            .where(RentPayment.id.in_(created))
+            .order_by(RentPayment.rental_id, RentPayment.period_start)
+        )
+    ).all()
+    assert [(rental_id, start) for rental_id, start, _ in periods] == [
+        ("RENT-BKF1", date(2033, 1, 1)),
+        ("RENT-BKF1", date(2033, 1, 5)),
+        ("RENT-BKF1", date(2033, 1, 12)),
+        ("RENT-BKF1", date(2033, 1, 19)),
+        ("RENT-BKF1", date(2033, 1, 26)),
+        ("RENT-BKF2", date(2033, 1, 1)),
+        ("RENT-BKF2", date(2033, 1, 7)),
+        ("RENT-BKF2", date(2033, 1, 14)),
+    ]
+    assert periods[-1][2] == date(2033, 1, 20)
+    assert await generate_weekly_charges(session, since=date(2033, 1, 1), until=date(2033, 2, 4)) == []
+
+
+def test_cron_schedule_next_after():
+    utc = timezone.utc
+    daily = CronSchedule.parse("0 8 * * *")
+    assert daily.next_after(datetime(2030, 1, 1, 7, 59, 30, tzinfo=utc)) == datetime(2030, 1, 1, 8, 0, tzinfo=utc)
+    assert daily.next_after(datetime(2030, 1, 1, 8, 0, tzinfo=utc)) == datetime(2030, 1, 2, 8, 0, tzinfo=utc)
+
+    weekdays = CronSchedule.parse("*/30 9-10 * * 1-5")
+    assert weekdays.next_after(datetime(2030, 1, 4, 10, 45, tzinfo=utc)) == datetime(2030, 1, 7, 9, 0, tzinfo=utc)
+
+    # Day of month or Sunday, as in cron.
+    either = CronSchedule.parse("0 0 15 * 0")
+    assert either.next_after(datetime(2030, 1, 1, tzinfo=utc)) == datetime(2030, 1, 6, tzinfo=utc)
+    assert CronSchedule.parse("0 0 29 2 *").next_after(datetime(2030, 3, 1, tzinfo=utc)) == datetime(
+        2032, 2, 29, tzinfo=utc
+    )
+
+    for invalid in ("0 8 * *", "61 * * * *", "*/0 * * * *", "0 0 31 2 *"):
+        with pytest.raises(ValueError):
+            CronSchedule.parse(invalid).next_after(datetime(2030, 1, 1, tzinfo=utc))
+
+
+@pytest.mark.anyio
+async def test_scheduler_runs_due_jobs_once_and_records_them(async_engine):
+    factory = async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+    calls: list[datetime] = []
+
+    async def produce(session_factory: async_sessionmaker[AsyncSession], now: datetime) -> int:
+        calls.append(now)
+        return 3
+
+    async def explode(session_factory: async_sessionmaker[AsyncSession], now: datetime) -> int:
+        raise RuntimeError("boom")
+
+    every_minute = CronSchedule.parse("* * * * *")
+    jobs = [Job("test_produce", every_minute, produce), Job("test_explode", every_minute, explode)]
+    start = datetime(2030, 5, 1, 8, 0, 30, tzinfo=timezone.utc)
+    first = Scheduler(factory, jobs, instance="first", lease_seconds=60)
+    second = Scheduler(factory, jobs, instance="second", lease_seconds=60)
+    try:
+        first.start(start)
+        second.start(start)
+        due = datetime(2030, 5, 1, 8, 1, 5, tzinfo=timezone.utc)
+        runs = await first.tick(due) + await second.tick(due)
+
+        assert [(run.job_name, run.instance, run.status) for run in runs] == [
+            ("test_produce", "first", JobRunStatus.SUCCESS),
+            ("test_explode", "first", JobRunStatus.FAILED),
+        ]
+        assert calls == [datetime(2030, 5, 1, 8, 1, tzinfo=timezone.utc)]
+        assert runs[0].rows_created == 3 and runs[1].error == "RuntimeError: boom"
+        assert await first.tick(due) == []
+
+        # The lease is taken over once the leader stops renewing it.
+        later = datetime(2030, 5, 1, 8, 5, 5, tzinfo=timezone.utc)
+        assert [run.instance for run in await second.tick(later)] == ["second", "second"]
+        async with factory() as session:
+            stored = (
+                await session.execute(select(JobRun).where(JobRun.job_name == "test_produce").order_by(JobRun.id))
+            ).scalars().all()
+            assert [(run.instance, run.rows_created) for run in stored] == [("first", 3), ("second", 3)]
+    finally:
+        await release_lease(factory, SCHEDULER_LEASE, "first")
+        await release_lease(factory, SCHEDULER_LEASE, "second")
+        async with factory() as session:
+            await session.execute(JobRun.__table__.delete())
+            await session.commit()
+            assert await session.get(JobLock, SCHEDULER_LEASE) is None
+
+
+@pytest.mark.anyio
+async def test_partitioned_billing_resumes_after_crash(async_engine, sample_vehicle):
+    factory = async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+    today = date(2040, 3, 5)
+    rental_ids = [f"RENT-PRT{index}" for index in range(5)]
+    async with factory() as session:
+        session.add_all(
+            Rental(
+                id=rental_id,
+                vehicle_id=sample_vehicle.id,
+                driver_id="DRV-TST",
+                start_date=date(2040, 1, 1),
+                weekly_rate=Decimal("100"),
+                billing_day=DAY_MAP[today.weekday()],
+            )
+            for rental_id in rental_ids
+        )
+        await session.commit()
+
+    run_key = billing_run_key(today)
+    try:
+        assert await plan_billing_partitions(factory, run_key, include_closed=False, partition_size=2) == 3
+        assert await plan_billing_partitions(factory, run_key, include_closed=False, partition_size=2) == 3
+
+        # One partition was committed and another claimed by a worker that then died.
+        first = await claim_billing_partition(factory, run_key, "dead", lease_seconds=60)
+        assert await bill_partition(factory, first, "dead", today) == 2
+        await claim_billing_partition(
+            factory, run_key, "dead", lease_seconds=60, now=datetime(2000, 1, 1, tzinfo=timezone.utc)
+        )
+
+        remaining = await run_partitioned_billing(factory, today, workers=1, partition_size=2, worker_prefix="resume")
+        async with factory() as session:
+            billed = (
+                await session.execute(
+                    select(RentPayment.rental_id).where(RentPayment.rental_id.in_(rental_ids))
+                )
+            ).scalars().all()
+            partitions = (
+                await session.execute(
+                    select(BillingPartition).where(BillingPartition.run_key == run_key).order_by(BillingPartition.partition_no)
+                )
+            ).scalars().all()
+        assert sorted(billed) == rental_ids
+        assert [partition.rows_created for partition in partitions] == [2, 2, 1]
+        assert remaining == 3
+        assert [(partition.status, partition.owner) for partition in partitions] == [
+            (BillingPartitionStatus.DONE, "dead"),
+            (BillingPartitionStatus.DONE, "resume-0"),
+            (BillingPartitionStatus.DONE, "resume-0"),
+        ]
+        assert await run_partitioned_billing(factory, today, workers=2, worker_prefix="again") == 0
+    finally:
+        async with factory() as session:
+            repo = RentPaymentRepository(session)
+            payments = (
+                await session.execute(select(RentPayment).where(RentPayment.rental_id.in_(rental_ids)))
+            ).scalars().all()
+            for payment in payments:
+                await repo.delete(payment)
+            await session.execute(BillingPartition.__table__.delete())
+            await session.execute(Rental.__table__.delete().where(Rental.id.in_(rental_ids)))
+            await session.commit()
+
+
+@pytest.mark.anyio
+async def test_partitioned_billing_with_more_workers_than_partitions(async_engine, sample_vehicle):
+    factory = async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+    today = date(2041, 3, 4)
+    rental_ids = [f"RENT-WRK{index}" for index in range(3)]
+    async with factory() as session:
+        session.add_all(
+            Rental(
+                id=rental_id,
+                vehicle_id=sample_vehicle.id,
+                driver_id="DRV-TST",
+                start_date=date(2041, 1, 1),
+                weekly_rate=Decimal("100"),
+                billing_day=DAY_MAP[today.weekday()],
+            )
+            for rental_id in rental_ids
+        )
+        await session.commit()
+
+    try:
+        # Four workers race for a single partition; the losers must give up, not spin.
+        with anyio.fail_after(10):
+            created = await run_partitioned_billing(factory, today, workers=4, partition_size=300, worker_prefix="race")
+        assert created == 3
+        async with factory() as session:
+            partitions = (
+                await session.execute(select(BillingPartition).where(BillingPartition.run_key == billing_run_key(today)))
+            ).scalars().all()
+        assert [partition.status for partition in partitions] == [BillingPartitionStatus.DONE]
+
+        # A rental created after the day's run completed is billed by a rerun of that day.
+        late_id = f"RENT-WRK{len(rental_ids)}"
+        rental_ids.append(late_id)
+        async with factory() as session:
+            session.add(
+                Rental(
+                    id=late_id,
+                    vehicle_id=sample_vehicle.id,
+                    driver_id="DRV-TST",
+                    start_date=date(2041, 1, 1),
+                    weekly_rate=Decimal("100"),
+                    billing_day=DAY_MAP[today.weekday()],
+                )
+            )
+            await session.commit()
+        assert await run_partitioned_billing(factory, today, workers=2, partition_size=300, worker_prefix="rerun") == 1
+        assert await run_partitioned_billing(factory, today, workers=2, partition_size=300, worker_prefix="again") == 0
+        async with factory() as session:
+            billed = (
+                await session.execute(select(RentPayment.rental_id).where(RentPayment.rental_id.in_(rental_ids)))
+            ).scalars().all()
+        assert sorted(billed) == rental_ids
+    finally:
+        async with factory() as session:
+            repo = RentPaymentRepository(session)
+            payments = (
+                await session.execute(select(RentPayment).where(RentPayment.rental_id.in_(rental_ids)))
+            ).scalars().all()
+            for payment in payments:
+                await repo.delete(payment)
+            await session.execute(BillingPartition.__table__.delete())
+            await session.execute(Rental.__table__.delete().where(Rental.id.in_(rental_ids)))
+            await session.commit()
+
+
+@pytest.mark.anyio
+async def test_billing_forecast_matches_generated_charges(session, sample_vehicle):
+    start = date(2045, 6, 1)  # Thursday
+    rentals = [
+        Rental(id="RENT-FC1", start_date=date(2045, 1, 1), weekly_rate=Decimal("500"), billing_day=BillingDay.MON),
+        Rental(id="RENT-FC2", start_date=date(2045, 6, 9), weekly_rate=Decimal("320.50"), billing_day=BillingDay.THU),
+        Rental(
+            id="RENT-FC3",
+            start_date=date(2045, 5, 1),
+            end_date=date(2045, 6, 12),
+            weekly_rate=Decimal("400"),
+            billing_day=BillingDay.SUN,
+        ),
+        Rental(
+            id="RENT-FC4",
+            start_date=date(2045, 1, 1),
+            weekly_rate=Decimal("999"),
+            billing_day=BillingDay.MON,
+            status=RentalStatus.PAUSED,
+        ),
+    ]
+    for rental in rentals:
+        rental.vehicle_id = sample_vehicle.id
+        rental.driver_id = "DRV-TST"
+    session.add_all(rentals)
+    await session.flush()
+
+    forecast = await forecast_charges(session, weeks=3, start=start)
+    rental_ids = {rental.id for rental in rentals}
+    forecast_rentals = {row.rental_id: row for row in forecast.rentals if row.rental_id in rental_ids}
+    assert [week.week_start for week in forecast.weeks] == [date(2045, 6, 1), date(2045, 6, 8), date(2045, 6, 15)]
+    assert sum(week.total for week in forecast.weeks) == forecast.total == sum(row.total for row in forecast.rentals)
+    assert forecast.vehicles[0].total == sum(row.total for row in forecast.rentals if row.vehicle_id == sample_vehicle.id)
+
+    generated: dict[str, list[RentPayment]] = {}
+    for offset in range(21):
+        created = await generate_weekly_charges(session, today=date(2045, 6, 1 + offset))
+        for payment in (await session.execute(select(RentPayment).where(RentPayment.id.in_(created)))).scalars():
+            if payment.rental_id in rental_ids:
+                generated.setdefault(payment.rental_id, []).append(payment)
+
+    assert set(forecast_rentals) == set(generated) == {"RENT-FC1", "RENT-FC2", "RENT-FC3"}
+    for rental_id, payments in generated.items():
+        row = forecast_rentals[rental_id]
+        assert row.charges == len(payments)
+        assert row.total == sum(payment.due_amount for payment in payments)
+        assert row.last_charge - row.first_charge == timedelta(days=7 * (len(payments) - 1))
+    assert forecast_rentals["RENT-FC2"].first_charge == date(2045, 6, 15)
+    assert forecast_rentals["RENT-FC3"].last_charge == date(2045, 6, 18)
+
+
+@pytest.mark.anyio
+async def test_late_fees_accrue_per_bucket(session, async_engine, sample_vehicle):
+    today = date(2050, 3, 20)
+    policy = LateFeePolicy(grace_days=2, fixed_fee=Decimal("10"), daily_pct=Decimal("1"), max_days=5)
+    session.add(
+        Rental(
+            id="RENT-LATE",
+            vehicle_id=sample_vehicle.id,
+            driver_id="DRV-TST",
+            start_date=date(2050, 1, 1),
+            weekly_rate=Decimal("500"),
+            billing_day=BillingDay.MON,
+        )
+    )
+    repo = RentPaymentRepository(session)
+    # period_end -> (paid, late_fee); due on period_end + 1, late after 2 grace days.
+    payments = {
+        date(2050, 3, 17): (Decimal("0"), Decimal("0")),  # within grace
+        date(2050, 3, 16): (Decimal("0"), Decimal("0")),  # 1 day late
+        date(2050, 3, 14): (Decimal("200"), Decimal("0")),  # 3 days late, 300 unpaid
+        date(2050, 3, 13): (Decimal("0"), Decimal("99")),  # 4 days late, fee set by hand
+        date(2050, 3, 1): (Decimal("0"), Decimal("0")),  # capped at 5 days
+        date(2050, 2, 20): (Decimal("500"), Decimal("0")),  # paid
+    }
+    ids = {}
+    for period_end, (paid, late_fee) in payments.items():
+        payment = await repo.create_payment(
+            {
+                "rental_id": "RENT-LATE",
+                "period_start": period_end - timedelta(days=6),
+                "period_end": period_end,
+                "weekly_rate": Decimal("500"),
+                "paid_amount": paid,
+                "late_fee": late_fee,
+            }
+        )
+        ids[period_end] = payment.id
+    await session.flush()
+    outstanding = select(SummaryCounter.value).where(SummaryCounter.metric == "rent_outstanding")
+    outstanding_before = await session.scalar(outstanding)
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        assert await apply_late_fees(session, today, policy) == 3
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+    assert len([sql for sql in statements if sql.startswith("UPDATE rent_payments")]) == 3
+
+    fees = dict(
+        (await session.execute(select(RentPayment.id, RentPayment.late_fee).where(RentPayment.id.in_(ids.values())))).all()
+    )
+    assert {period_end: fees[payment_id] for period_end, payment_id in ids.items()} == {
+        date(2050, 3, 17): Decimal("0"),
+        date(2050, 3, 16): Decimal("15.00"),
+        date(2050, 3, 14): Decimal("19.00"),
+        date(2050, 3, 13): Decimal("99.00"),
+        date(2050, 3, 1): Decimal("35.00"),
+        date(2050, 2, 20): Decimal("0"),
+    }
+    assert await session.scalar(outstanding) - outstanding_before == Decimal("69.00")
+    assert await apply_late_fees(session, today, policy) == 0
+
+    # A payment settled between the SELECT and the UPDATE must not drift the counters.
+    raced = {"id": ids[date(2050, 3, 16)], "done": False}
+
+    def _pay_before_update(state):  # type: ignore[no-untyped-def]
+        if not state.is_update or raced["done"]:
+            return
+        targets = [value for value in state.statement.compile().params.values() if isinstance(value, list)]
+        if any(raced["id"] in value for value in targets):
+            raced["done"] = True
+            state.session.connection().execute(
+                RentPayment.__table__.update()
+                .where(RentPayment.id == raced["id"])
+                .values(paid_amount=RentPayment.due_amount)
+            )
+
+    event.listen(session.sync_session, "do_orm_execute", _pay_before_update)
+    try:
+        await apply_late_fees(session, date(2050, 3, 22), policy)
+    finally:
+        event.remove(session.sync_session, "do_orm_execute", _pay_before_update)
+    assert raced["done"]
+    live_outstanding = await session.scalar(
+        select(func.sum(RentPayment.outstanding_amount)).where(RentPayment.outstanding_amount > 0)
+    )
+    assert await session.scalar(outstanding) == live_outstanding
+
+
+@pytest.mark.anyio
+async def test_search_index_follows_writes(session):
+    suffix = uuid.uuid4().hex[:6].upper()
+    vehicle = Vehicle(
+        id=f"CAR-{suffix}",
+        plate=f"Q{suffix[:2]}-{suffix[2:6]}",
+        renavam=f"REN{suffix}",
+        vin=f"9BW{suffix}ZZZ",
+        manufacture_year=2020,
+        model_year=2021,
+        make="Fiat",
+        model="Uno",
+        acquisition_date=date(2024, 1, 1),
+        acquisition_price=Decimal("20000"),
+    )
+    driver = Driver(
+        id=f"DRV-{suffix}",
+        name=f"João Conceição {suffix}",
+        cpf=f"{suffix[:3]}.987.654-21",
+        start_date=date(2024, 1, 1),
+        weekly_rate=Decimal("400"),
+        status=DriverStatus.ACTIVE,
+    )
+    session.add_all([vehicle, driver])
+    await session.flush()
+
+    assert search_terms("João-9 ABC") == ["joao", "9", "abc"]
+    plate_hits = await search(session, vehicle.plate.lower().replace("-", ""))
+    assert [(hit.entity_type, hit.entity_id) for hit in plate_hits] == [("vehicle", vehicle.id)]
+    assert plate_hits[0].label == f"{vehicle.plate} Fiat Uno"
+    assert [hit.entity_id for hit in await search(session, f"9bw{suffix}")] == [vehicle.id]
+    assert [hit.entity_id for hit in await search(session, f"conceicao {suffix}")] == [driver.id]
+    assert [hit.entity_id for hit in await search(session, f"{suffix[:3]}98765", ["driver"])] == [driver.id]
+    assert await search(session, f"{suffix} fiat", ["driver"]) == []
+
+    vehicle.plate = f"W{suffix[:2]}-{suffix[2:6]}"
+    await session.flush()
+    assert await search(session, f"q{suffix}") == []
+    assert [hit.entity_id for hit in await search(session, f"w{suffix}")] == [vehicle.id]
+
+    await session.delete(driver)
+    await session.flush()
+    assert await search(session, f"conceicao {suffix}") == []
+    written = await rebuild_search_index(session)
+    assert written == (await session.execute(select(func.count()).select_from(SearchEntry))).scalar_one()
+    assert [hit.entity_id for hit in await search(session, f"w{suffix}")] == [vehicle.id]
+
+
+@pytest.mark.anyio
+async def test_page_response_matches_read_schema(session):
+    repo = CashRepository(session)
+    category = f"Page {uuid.uuid4().hex[:8]}"
+    for amount in ("10.50", "0.10"):
+        await repo.create_txn(
+            {"date": date(2036, 1, 1), "type": CashTxnType.INFLOW, "category": category, "amount": Decimal(amount)}
+        )
+    await session.flush()
+    params = PaginationParams(page_size=1, order_by="amount")
+    result = await repo.list_txns(params, category=category)
+
+    body = json.loads(page_response(result, params, CashTxnRead).body)
+    assert {key: body[key] for key in ("total", "page", "page_size", "next_cursor", "has_more")} == {
+        "total": 2,
+        "page": 1,
+        "page_size": 1,
+        "next_cursor": None,
+        "has_more": True,
+    }
+    assert body["items"] == [CashTxnRead.model_validate(result.items[0]).model_dump(mode="json")]
+    assert body["items"][0]["amount"] == "0.10"